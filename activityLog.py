@@ -0,0 +1,106 @@
+"""Bounded, batched sink that moves queued monitor messages into the activity log widget."""
+from __future__ import annotations
+
+import os
+import queue
+import tkinter as tk
+from typing import TextIO
+
+DEFAULT_MAX_LINES = 2000
+MIN_MAX_LINES = 100
+MAX_BATCH_SIZE = 5000
+
+
+class ActivityLogSink:
+    """Drain a message queue into a Tk text widget, keeping at most ``max_lines`` lines.
+
+    Each call to :meth:`drain` takes everything currently queued (up to
+    ``MAX_BATCH_SIZE``), inserts it with a single widget call and trims the
+    oldest lines in one delete. When ``spill_path`` is set every message is
+    also appended to that file so the full history survives outside the widget.
+    """
+
+    def __init__(
+        self,
+        text_widget: tk.Text,
+        message_queue: "queue.Queue[str]",
+        max_lines: int = DEFAULT_MAX_LINES,
+        spill_path: str | None = None,
+    ) -> None:
+        self.text_widget = text_widget
+        self.message_queue = message_queue
+        self.max_lines = max(MIN_MAX_LINES, int(max_lines))
+        self._line_count = 0
+        self._spill_path: str | None = None
+        self._spill_handle: TextIO | None = None
+        self.set_spill_path(spill_path)
+
+    def set_max_lines(self, max_lines: int) -> None:
+        self.max_lines = max(MIN_MAX_LINES, int(max_lines))
+        self._trim()
+
+    def set_spill_path(self, spill_path: str | None) -> None:
+        if spill_path == self._spill_path:
+            return
+        self.close()
+        self._spill_path = spill_path
+        if spill_path:
+            try:
+                os.makedirs(os.path.dirname(spill_path), exist_ok=True)
+                self._spill_handle = open(spill_path, "a", encoding="utf-8")
+            except OSError:
+                self._spill_path = None
+                self._spill_handle = None
+
+    def drain(self) -> int:
+        """Move pending messages into the widget. Returns the number of messages handled."""
+        messages: list[str] = []
+        while len(messages) < MAX_BATCH_SIZE:
+            try:
+                messages.append(self.message_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        if not messages:
+            return 0
+
+        self._spill(messages)
+
+        visible = messages[-self.max_lines:]
+        self.text_widget.configure(state="normal")
+        self.text_widget.insert("end", "\n".join(visible) + "\n")
+        # Tracebacks and other multi-line messages take more than one line each.
+        self._line_count += sum(message.count("\n") + 1 for message in visible)
+        self._trim(already_editable=True)
+        self.text_widget.configure(state="disabled")
+        self.text_widget.yview_moveto(1.0)
+        return len(messages)
+
+    def close(self) -> None:
+        if self._spill_handle is not None:
+            try:
+                self._spill_handle.close()
+            except OSError:
+                pass
+            self._spill_handle = None
+
+    def _spill(self, messages: list[str]) -> None:
+        if self._spill_handle is None:
+            return
+        try:
+            self._spill_handle.write("\n".join(messages) + "\n")
+            self._spill_handle.flush()
+        except OSError:
+            self.close()
+            self._spill_path = None
+
+    def _trim(self, already_editable: bool = False) -> None:
+        overflow = self._line_count - self.max_lines
+        if overflow <= 0:
+            return
+        if not already_editable:
+            self.text_widget.configure(state="normal")
+        self.text_widget.delete("1.0", f"{overflow + 1}.0")
+        if not already_editable:
+            self.text_widget.configure(state="disabled")
+        self._line_count -= overflow
@@ -0,0 +1,87 @@
+"""Tk-free helpers for the Analytics tab's date range and chart.
+
+``daily_domain_counts`` also accepts the rollups of archived rows (see
+``analytics.fetch_rollups``) so charts cover the full history. The
+Analytics tab passes the per day and domain totals from
+``analytics.aggregate_insights`` in their place, which share that shape.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+DEFAULT_RANGE_DAYS = 10
+
+
+def _domain_of(record: dict[str, str]) -> str:
+    return (record.get("Domain") or "Unknown").strip() or "Unknown"
+
+
+def _parse_day(timestamp: str) -> date | None:
+    try:
+        return datetime.strptime(timestamp, TIMESTAMP_FORMAT).date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_rollup_day(value: object) -> date | None:
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _as_int(value: object) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def recent_date_range(first: date | None, last: date | None, today: date | None = None) -> tuple[date, date]:
+    """Return the last ``DEFAULT_RANGE_DAYS`` days up to ``last`` but not before ``first``.
+
+    ``first`` and ``last`` are the days of the oldest and newest data, for
+    example from ``analytics.summarize_insights``; without data the range ends today.
+    """
+    if first is None or last is None:
+        end_date = today or datetime.now().date()
+        return end_date - timedelta(days=DEFAULT_RANGE_DAYS - 1), end_date
+    return max(last - timedelta(days=DEFAULT_RANGE_DAYS - 1), first), last
+
+
+def daily_domain_counts(
+    records: Iterable[dict[str, str]],
+    start_date: date,
+    end_date: date,
+    rollups: Iterable[dict[str, object]] = (),
+) -> tuple[list[date], dict[date, dict[str, int]], list[str]]:
+    """Count downloads per day and domain between ``start_date`` and ``end_date`` inclusive."""
+    day_counts: dict[date, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    all_domains: set[str] = set()
+
+    for record in records:
+        day = _parse_day(record.get("Timestamp", ""))
+        if day is None or day < start_date or day > end_date:
+            continue
+        domain = _domain_of(record)
+        day_counts[day][domain] += 1
+        all_domains.add(domain)
+
+    for rollup in rollups:
+        day = _parse_rollup_day(rollup.get("Day"))
+        if day is None or day < start_date or day > end_date:
+            continue
+        domain = _domain_of(rollup)
+        day_counts[day][domain] += _as_int(rollup.get("Files"))
+        all_domains.add(domain)
+
+    days: list[date] = []
+    current_day = start_date
+    while current_day <= end_date:
+        days.append(current_day)
+        current_day += timedelta(days=1)
+
+    return days, day_counts, sorted(all_domains)
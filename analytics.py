@@ -1,14 +1,33 @@
 import csv
+import heapq
+import json
 import os
+import re
 import shutil
 import sqlite3
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import AbstractContextManager, ExitStack, closing
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Iterable, Iterator
+from urllib.parse import urlparse
 
+from dbpool import connect_readonly, get_pool
 from paths import get_analytics_dir
 
 LEGACY_INSIGHTS_FOLDER = "downloadinsights"
 DATABASE_FILE_NAME = "downloadInsightsAnalytics.db"
 LEGACY_CSV_FILE_NAME = "downloadInsightsAnalytics.csv"
+PARTITIONS_SUBDIR = "partitions"
+LEGACY_MIGRATION_BATCH_ROWS = 10_000
+LEGACY_MIGRATION_COMMIT_ROWS = 200_000
+IMPORT_CHUNK_ROWS = 20_000
+IMPORT_FORMATS = ("csv", "jsonl")
+IMPORTED_EVENT = "Imported"
+
+_PARTITION_FILE_PATTERN = re.compile(r"^insights-(\d{4}-\d{2})\.db$")
 
 EXPECTED_HEADER = [
     "Timestamp",
@@ -35,11 +54,228 @@ CREATE TABLE IF NOT EXISTS insights (
 )
 """
 
+# Per day/domain/type totals of rows that retention moved out of ``insights``,
+# so summaries and charts still count archived downloads.
+_CREATE_ROLLUP_STATEMENT = """
+CREATE TABLE IF NOT EXISTS insights_rollup (
+    day TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    file_type TEXT NOT NULL,
+    files INTEGER NOT NULL,
+    total_size INTEGER NOT NULL,
+    duplicates INTEGER NOT NULL,
+    PRIMARY KEY (day, domain, file_type)
+) WITHOUT ROWID
+"""
+
+_SEARCH_TABLE_STATEMENTS = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS insights_fts USING fts5(
+        file_path,
+        download_url,
+        domain,
+        content='insights',
+        content_rowid='id',
+        tokenize="unicode61 tokenchars '-_'"
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS insights_fts_insert AFTER INSERT ON insights BEGIN
+        INSERT INTO insights_fts(rowid, file_path, download_url, domain)
+        VALUES (new.id, new.file_path, new.download_url, new.domain);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS insights_fts_delete AFTER DELETE ON insights BEGIN
+        INSERT INTO insights_fts(insights_fts, rowid, file_path, download_url, domain)
+        VALUES ('delete', old.id, old.file_path, old.download_url, old.domain);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS insights_fts_update AFTER UPDATE ON insights BEGIN
+        INSERT INTO insights_fts(insights_fts, rowid, file_path, download_url, domain)
+        VALUES ('delete', old.id, old.file_path, old.download_url, old.domain);
+        INSERT INTO insights_fts(rowid, file_path, download_url, domain)
+        VALUES (new.id, new.file_path, new.download_url, new.domain);
+    END
+    """,
+)
+
+# Sortable Insights columns mapped to the SQL expression that orders them. Each
+# expression has a matching (expression, id) index so keyset pages are index scans.
+SORTABLE_COLUMNS = {
+    "Timestamp": "timestamp",
+    "Event": "event",
+    "Domain": "domain",
+    "File Size": "IFNULL(file_size, -1)",
+    "File Type": "IFNULL(file_type, '')",
+}
+
+_SORT_INDEX_STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS idx_insights_event_id ON insights(event, id)",
+    "CREATE INDEX IF NOT EXISTS idx_insights_domain_id ON insights(domain, id)",
+    "CREATE INDEX IF NOT EXISTS idx_insights_size_id ON insights(IFNULL(file_size, -1), id)",
+    "CREATE INDEX IF NOT EXISTS idx_insights_type_id ON insights(IFNULL(file_type, ''), id)",
+)
+
+# Covers every column the analytics aggregates read, so totals and group-bys
+# over a date range are answered from the index without touching the table.
+_ANALYTICS_INDEX_STATEMENT = (
+    "CREATE INDEX IF NOT EXISTS idx_insights_analytics "
+    "ON insights(timestamp, domain, file_type, file_size, is_duplicate)"
+)
+
+_INSERT_STATEMENT = """
+    INSERT INTO insights (
+        timestamp,
+        event,
+        file_path,
+        domain,
+        file_size,
+        file_type,
+        download_url,
+        is_duplicate
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Progress of the legacy CSV import; each commit stores how many rows are in.
+_CREATE_MIGRATION_STATEMENT = """
+CREATE TABLE IF NOT EXISTS legacy_migration (
+    source TEXT PRIMARY KEY,
+    rows_done INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID
+"""
+
+_SAVE_MIGRATION_STATEMENT = """
+    INSERT INTO legacy_migration (source, rows_done, completed) VALUES (?, ?, ?)
+    ON CONFLICT (source) DO UPDATE SET rows_done = excluded.rows_done, completed = excluded.completed
+"""
+
+_TRUE_VALUES = {"yes", "true", "1"}
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+_CANONICAL_TIMESTAMP_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$")
+
+# Import columns accept both the template's headers and snake_case keys.
+_IMPORT_FIELD_INDEX = {name.lower().replace(" ", "_"): index for index, name in enumerate(EXPECTED_HEADER)}
+
+# One row per (timestamp, file path, event): repeats within a file collapse here.
+_CREATE_STAGING_STATEMENT = """
+CREATE TEMP TABLE import_staging (
+    timestamp TEXT NOT NULL,
+    event TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    file_size INTEGER,
+    file_type TEXT,
+    download_url TEXT,
+    is_duplicate INTEGER NOT NULL,
+    PRIMARY KEY (timestamp, file_path, event)
+) WITHOUT ROWID
+"""
+
+_DELETE_RECORDED_STAGING_STATEMENT = """
+    DELETE FROM temp.import_staging
+    WHERE EXISTS (
+        SELECT 1 FROM {schema}.insights AS i
+        WHERE i.file_path = import_staging.file_path
+          AND i.timestamp = import_staging.timestamp
+          AND i.event = import_staging.event
+    )
+"""
+
+_SEARCH_TOKEN_PATTERN = re.compile(r"[^\s\"]+")
+
+_search_ready: dict[str, bool] = {}
+
 
 def _database_path(download_folder: str) -> str:
     return os.path.join(get_analytics_dir(download_folder), DATABASE_FILE_NAME)
 
 
+def _partitions_dir(download_folder: str) -> str:
+    return os.path.join(get_analytics_dir(download_folder), PARTITIONS_SUBDIR)
+
+
+def get_partition_path(download_folder: str, month: str) -> str:
+    """Return the file holding the sealed rows of ``month`` (``YYYY-MM``)."""
+    directory = _partitions_dir(download_folder)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"insights-{month}.db")
+
+
+def list_partitions(
+    download_folder: str,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[tuple[str, str]]:
+    """Return ``(month, path)`` of the sealed partitions overlapping ``start``..``end``, oldest first."""
+    try:
+        names = os.listdir(_partitions_dir(download_folder))
+    except OSError:
+        return []
+
+    first_month = start.strftime("%Y-%m") if start else None
+    last_month = end.strftime("%Y-%m") if end else None
+    partitions: list[tuple[str, str]] = []
+    for name in names:
+        match = _PARTITION_FILE_PATTERN.match(name)
+        if match is None:
+            continue
+        month = match.group(1)
+        if (first_month and month < first_month) or (last_month and month > last_month):
+            continue
+        partitions.append((month, os.path.join(_partitions_dir(download_folder), name)))
+    return sorted(partitions)
+
+
+def _read_sources(
+    download_folder: str,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[tuple[str, bool]]:
+    """Return ``(path, sealed)`` for every database that may hold rows in the range, oldest first."""
+    sources = [(path, True) for _month, path in list_partitions(download_folder, start, end)]
+    database_path = _database_path(download_folder)
+    if os.path.exists(database_path):
+        sources.append((database_path, False))
+    return sources
+
+
+def _read_connection(path: str, sealed: bool = False) -> AbstractContextManager[sqlite3.Connection]:
+    # The live database is read through its pool and written through the
+    # pool's writer. Sealed partitions are only written by maintenance and are
+    # read through a connection of their own, closed again after the query.
+    if sealed:
+        return closing(connect_readonly(path))
+    return get_pool(path).reader()
+
+
+def _range_clause(start: date | None, end: date | None) -> tuple[str, tuple[str, ...]]:
+    clauses: list[str] = []
+    parameters: list[str] = []
+    if start is not None:
+        clauses.append("timestamp >= ?")
+        parameters.append(start.isoformat())
+    if end is not None:
+        clauses.append("timestamp < ?")
+        parameters.append((end + timedelta(days=1)).isoformat())
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), tuple(parameters)
+
+
+def _day_range_clause(start: date | None, end: date | None) -> tuple[str, tuple[str, ...]]:
+    """Like :func:`_range_clause` for ``insights_rollup``, whose rows are whole days."""
+    clauses: list[str] = []
+    parameters: list[str] = []
+    if start is not None:
+        clauses.append("day >= ?")
+        parameters.append(start.isoformat())
+    if end is not None:
+        clauses.append("day <= ?")
+        parameters.append(end.isoformat())
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), tuple(parameters)
+
+
 def _ensure_directory(download_folder: str) -> str:
     insights_folder_path = get_analytics_dir(download_folder)
     _migrate_legacy_storage(download_folder, insights_folder_path)
@@ -78,49 +314,130 @@ def initialize_log_file(download_folder: str) -> None:
     insights_folder_path = _ensure_directory(download_folder)
     database_path = _database_path(download_folder)
 
-    with sqlite3.connect(database_path, timeout=5) as connection:
-        connection.execute(_CREATE_TABLE_STATEMENT)
-        connection.execute(
-            "CREATE INDEX IF NOT EXISTS idx_insights_timestamp ON insights(timestamp)"
-        )
-        connection.commit()
+    if not os.path.exists(database_path):
+        # Only takes effect before the first page is written, which switching
+        # to WAL already does; retention converts older databases.
+        with closing(sqlite3.connect(database_path, timeout=5)) as connection:
+            connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.execute(_CREATE_ROLLUP_STATEMENT)
+            connection.commit()
+
+    with get_pool(database_path).writer() as connection:
+        connection.execute(_CREATE_ROLLUP_STATEMENT)
+        create_insights_schema(connection, database_path)
 
     _migrate_legacy_csv(insights_folder_path, database_path)
 
 
+def create_insights_schema(connection: sqlite3.Connection, database_path: str) -> None:
+    """Create the ``insights`` table, its indexes and search index; shared by partitions."""
+    connection.execute(_CREATE_TABLE_STATEMENT)
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_insights_timestamp ON insights(timestamp)"
+    )
+    for statement in _SORT_INDEX_STATEMENTS:
+        connection.execute(statement)
+    connection.execute(_ANALYTICS_INDEX_STATEMENT)
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_insights_file_path ON insights(file_path)"
+    )
+    connection.commit()
+    _ensure_search_index(connection, database_path)
+
+
 def _migrate_legacy_csv(insights_folder_path: str, database_path: str) -> None:
+    """Stream the legacy CSV into an empty database, resuming an interrupted import."""
     legacy_csv = os.path.join(insights_folder_path, LEGACY_CSV_FILE_NAME)
     if not os.path.exists(legacy_csv):
         return
 
-    rows: list[list[str]] = []
     try:
-        with sqlite3.connect(database_path, timeout=5) as connection:
-            cursor = connection.execute("SELECT COUNT(*) FROM insights")
-            existing = cursor.fetchone()[0]
-            if existing:
+        with closing(sqlite3.connect(database_path, timeout=5)) as connection:
+            connection.execute(_CREATE_MIGRATION_STATEMENT)
+            connection.commit()
+            state = connection.execute(
+                "SELECT rows_done, completed FROM legacy_migration WHERE source = ?",
+                (LEGACY_CSV_FILE_NAME,),
+            ).fetchone()
+            if state is None:
+                if connection.execute("SELECT 1 FROM insights LIMIT 1").fetchone():
+                    return
+                rows_done = 0
+            elif state[1]:
                 return
-
-            with open(legacy_csv, newline="", encoding="utf-8") as csv_file:
-                reader = csv.reader(csv_file)
-                rows = list(reader)
-    except (OSError, sqlite3.DatabaseError):
+            else:
+                rows_done = state[0]
+            _stream_legacy_csv(connection, database_path, legacy_csv, rows_done)
+    except (OSError, csv.Error, sqlite3.DatabaseError):
         return
 
-    if not rows:
-        return
 
-    header, *data_rows = rows
-    header_map = {name: index for index, name in enumerate(header)}
+def _stream_legacy_csv(
+    connection: sqlite3.Connection,
+    database_path: str,
+    legacy_csv: str,
+    rows_done: int,
+) -> None:
+    """Insert the CSV in ``executemany`` batches, committing progress every few hundred thousand rows.
+
+    The file is read lazily and columns are picked through one precomputed
+    index tuple. The import runs in WAL mode with ``synchronous=NORMAL`` and
+    without the per-row search trigger; the search index is rebuilt once at
+    the end. A crash loses at most the rows since the last commit, which the
+    next start imports again.
+    """
+    journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+    synchronous = connection.execute("PRAGMA synchronous").fetchone()[0]
+    try:
+        connection.execute("PRAGMA journal_mode = WAL")
+    except sqlite3.OperationalError:
+        journal_mode = None
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.execute("PRAGMA cache_size = -65536")
+    connection.execute("DROP TRIGGER IF EXISTS insights_fts_insert")
+    _search_ready.pop(database_path, None)
+
+    try:
+        with open(legacy_csv, newline="", encoding="utf-8") as csv_file:
+            reader = csv.reader(csv_file)
+            header = next(reader, [])
+            header_map = {name: index for index, name in enumerate(header)}
+            indexes = tuple(header_map.get(column, -1) for column in EXPECTED_HEADER)
+            width = max(indexes) + 1
+            padding = [""] * width
+
+            for _row in islice(reader, rows_done):
+                pass
+
+            uncommitted = 0
+            while True:
+                batch = []
+                for row in islice(reader, LEGACY_MIGRATION_BATCH_ROWS):
+                    if len(row) < width:
+                        row = row + padding
+                    batch.append(_coerce_values(*(row[index] if index >= 0 else "" for index in indexes)))
+                if not batch:
+                    break
+                connection.executemany(_INSERT_STATEMENT, batch)
+                rows_done += len(batch)
+                uncommitted += len(batch)
+                if uncommitted >= LEGACY_MIGRATION_COMMIT_ROWS:
+                    connection.execute(_SAVE_MIGRATION_STATEMENT, (LEGACY_CSV_FILE_NAME, rows_done, 0))
+                    connection.commit()
+                    uncommitted = 0
 
-    with sqlite3.connect(database_path, timeout=5) as connection:
-        for row in data_rows:
-            record = {
-                column: row[header_map[column]] if column in header_map and header_map[column] < len(row) else ""
-                for column in EXPECTED_HEADER
-            }
-            _insert_record(connection, record)
+        connection.execute(_SAVE_MIGRATION_STATEMENT, (LEGACY_CSV_FILE_NAME, rows_done, 1))
         connection.commit()
+    finally:
+        connection.rollback()
+        _rebuild_search_index(connection, database_path)
+        connection.execute(f"PRAGMA synchronous = {int(synchronous)}")
+        if journal_mode is not None:
+            try:
+                connection.execute(f"PRAGMA journal_mode = {journal_mode}")
+            except sqlite3.OperationalError:
+                # Another connection is open; WAL stays on, which is harmless.
+                pass
 
 
 def log_event(
@@ -137,7 +454,7 @@ def log_event(
     file_size = os.path.getsize(file_path) if os.path.exists(file_path) else None
     file_type = os.path.splitext(file_path)[1]
 
-    with sqlite3.connect(database_path, timeout=5) as connection:
+    with get_pool(database_path).writer() as connection:
         _insert_record(
             connection,
             {
@@ -151,36 +468,134 @@ def log_event(
                 "Is Duplicate": "Yes" if is_duplicate else "No",
             },
         )
-        connection.commit()
 
 
-def _insert_record(connection: sqlite3.Connection, record: dict) -> None:
-    connection.execute(
-        """
-        INSERT INTO insights (
-            timestamp,
-            event,
-            file_path,
-            domain,
-            file_size,
-            file_type,
-            download_url,
-            is_duplicate
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            record.get("Timestamp", ""),
-            record.get("Event", ""),
-            record.get("File Path", ""),
-            record.get("Domain", ""),
-            _to_int_or_none(record.get("File Size")),
-            record.get("File Type", ""),
-            record.get("Download URL", ""),
-            1 if str(record.get("Is Duplicate", "No")).lower() in {"yes", "true", "1"} else 0,
-        ),
+def log_events(download_folder: str, records: Iterable[dict]) -> int:
+    """Insert many insight records in a single transaction and return how many were written."""
+    _ensure_directory(download_folder)
+    database_path = _database_path(download_folder)
+    values = [_record_values(record) for record in records]
+    if not values:
+        return 0
+
+    with get_pool(database_path).writer() as connection:
+        connection.executemany(_INSERT_STATEMENT, values)
+    return len(values)
+
+
+def reclassify_insight(
+    download_folder: str,
+    file_path: str,
+    new_path: str,
+    domain: str,
+    download_url: str,
+    event: str,
+    is_duplicate: bool = False,
+) -> bool:
+    """Point the latest row for ``file_path`` at its re-resolved location; False when there is none."""
+    database_path = _database_path(download_folder)
+    if not os.path.exists(database_path):
+        return False
+    with get_pool(database_path).writer() as connection:
+        updated = connection.execute(
+            """
+            UPDATE insights
+            SET file_path = ?, domain = ?, download_url = ?, event = ?, is_duplicate = ?
+            WHERE id = (SELECT MAX(id) FROM insights WHERE file_path = ?)
+            """,
+            (new_path, domain, download_url, event, 1 if is_duplicate else 0, file_path),
+        ).rowcount
+    return updated > 0
+
+
+def _record_values(record: dict) -> tuple:
+    return _coerce_values(*(record.get(column, "") for column in EXPECTED_HEADER))
+
+
+def _coerce_values(
+    timestamp: object,
+    event: object,
+    file_path: object,
+    domain: object,
+    file_size: object,
+    file_type: object,
+    download_url: object,
+    is_duplicate: object,
+) -> tuple:
+    """Map one record, in ``EXPECTED_HEADER`` order, to ``_INSERT_STATEMENT`` parameters."""
+    return (
+        timestamp,
+        event,
+        file_path,
+        domain,
+        _to_int_or_none(file_size),
+        file_type,
+        download_url,
+        1 if str(is_duplicate).lower() in _TRUE_VALUES else 0,
     )
 
 
+def _insert_record(connection: sqlite3.Connection, record: dict) -> None:
+    connection.execute(_INSERT_STATEMENT, _record_values(record))
+
+
+def _ensure_search_index(connection: sqlite3.Connection, database_path: str) -> bool:
+    """Create the FTS5 index and its sync triggers. Returns False when FTS5 is unavailable."""
+    cached = _search_ready.get(database_path)
+    if cached is not None:
+        return cached
+
+    try:
+        existed = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'insights_fts'"
+        ).fetchone()
+        for statement in _SEARCH_TABLE_STATEMENTS:
+            connection.execute(statement)
+        if not existed:
+            connection.execute("INSERT INTO insights_fts(insights_fts) VALUES ('rebuild')")
+        connection.commit()
+    except sqlite3.OperationalError:
+        connection.rollback()
+        _search_ready[database_path] = False
+        return False
+
+    _search_ready[database_path] = True
+    return True
+
+
+def _rebuild_search_index(connection: sqlite3.Connection, database_path: str) -> None:
+    """Restore the sync triggers after a bulk load and reindex every row."""
+    _search_ready.pop(database_path, None)
+    if _ensure_search_index(connection, database_path):
+        connection.execute("INSERT INTO insights_fts(insights_fts) VALUES ('rebuild')")
+        connection.commit()
+
+
+def _has_search_index(connection: sqlite3.Connection) -> bool:
+    return connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'insights_fts'"
+    ).fetchone() is not None
+
+
+def _build_match_expression(query: str) -> str:
+    tokens = _SEARCH_TOKEN_PATTERN.findall(query)
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _row_to_record(row: sqlite3.Row) -> dict[str, str]:
+    file_size = row["file_size"]
+    return {
+        "Timestamp": row["timestamp"],
+        "Event": row["event"],
+        "File Path": row["file_path"],
+        "Domain": row["domain"],
+        "File Size": str(file_size) if file_size is not None else "",
+        "File Type": row["file_type"] or "",
+        "Download URL": row["download_url"] or "",
+        "Is Duplicate": "Yes" if row["is_duplicate"] else "No",
+    }
+
+
 def _to_int_or_none(value: object) -> int | None:
     try:
         if value in ("", None):
@@ -190,38 +605,205 @@ def _to_int_or_none(value: object) -> int | None:
         return None
 
 
-def fetch_insights(download_folder: str) -> list[dict[str, str]]:
+def _timeline_key(row: sqlite3.Row) -> tuple[bool, str, int]:
+    # Matches ORDER BY datetime(timestamp), id, where SQLite sorts NULL first.
+    sort_time = row["sort_time"]
+    return sort_time is not None, sort_time or "", row["id"]
+
+
+def iter_insights(
+    download_folder: str,
+    start: date | None = None,
+    end: date | None = None,
+) -> Iterator[dict[str, str]]:
+    """Yield insights from ``start`` to ``end`` (inclusive dates, ``None`` for open) in time order.
+
+    Only the monthly partitions overlapping the range are opened. Each
+    source is read through its own cursor and the streams are merged, so
+    the full history is never held in memory.
+    """
+    _ensure_directory(download_folder)
+    where, parameters = _range_clause(start, end)
+    with ExitStack() as stack:
+        streams = []
+        for path, sealed in _read_sources(download_folder, start, end):
+            connection = stack.enter_context(_read_connection(path, sealed))
+            connection.row_factory = sqlite3.Row
+            cursor = connection.execute(
+                f"""
+                SELECT id, datetime(timestamp) AS sort_time, timestamp, event, file_path, domain,
+                       file_size, file_type, download_url, is_duplicate
+                FROM insights
+                {where}
+                ORDER BY datetime(timestamp) ASC, id ASC
+                """,
+                parameters,
+            )
+            # Finish the statement before the connection goes back to the pool.
+            stack.callback(cursor.close)
+            streams.append(cursor)
+        for row in heapq.merge(*streams, key=_timeline_key):
+            yield _row_to_record(row)
+
+
+def fetch_insights(
+    download_folder: str,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[dict[str, str]]:
+    return list(iter_insights(download_folder, start, end))
+
+
+def fetch_rollups(download_folder: str) -> list[dict[str, object]]:
+    """Return the per day, domain and file type totals of archived rows."""
     _ensure_directory(download_folder)
     database_path = _database_path(download_folder)
     if not os.path.exists(database_path):
         return []
 
-    with sqlite3.connect(database_path, timeout=5) as connection:
-        connection.row_factory = sqlite3.Row
-        rows = connection.execute(
-            """
-            SELECT timestamp, event, file_path, domain, file_size, file_type, download_url, is_duplicate
-            FROM insights
-            ORDER BY datetime(timestamp) ASC, id ASC
+    with _read_connection(database_path) as connection:
+        try:
+            rows = connection.execute(
+                "SELECT day, domain, file_type, files, total_size, duplicates FROM insights_rollup ORDER BY day"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return []
+
+    return [
+        {"Day": day, "Domain": domain, "File Type": file_type, "Files": files, "File Size": size, "Duplicates": dups}
+        for day, domain, file_type, files, size, dups in rows
+    ]
+
+
+def fetch_insights_page(
+    download_folder: str,
+    sort_column: str = "Timestamp",
+    descending: bool = False,
+    after: tuple[object, int] | None = None,
+    limit: int = 200,
+) -> tuple[list[dict[str, str]], tuple[object, int] | None]:
+    """Return one page of insights ordered by ``sort_column`` and the cursor for the next page.
+
+    ``after`` is the cursor returned by the previous call (the last row's sort
+    key and id); pass ``None`` for the first page. The next cursor is ``None``
+    once the last page has been reached.
+    """
+    expression = SORTABLE_COLUMNS.get(sort_column)
+    if expression is None:
+        raise ValueError(f"Insights cannot be sorted by {sort_column!r}")
+
+    _ensure_directory(download_folder)
+    direction = "DESC" if descending else "ASC"
+    comparison = "<" if descending else ">"
+    where = ""
+    parameters: tuple[object, ...] = ()
+    if after is not None:
+        # The leading range term lets SQLite seek into the index even for
+        # expression indexes, where the row-value comparison alone is a scan.
+        where = f"WHERE {expression} {comparison}= ? AND ({expression}, id) {comparison} (?, ?)"
+        parameters = (after[0], after[0], after[1])
+
+    # Ids are unique across partitions, so each source's next page can be
+    # merged on (sort key, id) without losing the keyset order.
+    rows: list[sqlite3.Row] = []
+    for path, sealed in _read_sources(download_folder):
+        with _read_connection(path, sealed) as connection:
+            connection.row_factory = sqlite3.Row
+            rows.extend(
+                connection.execute(
+                    f"""
+                    SELECT id, {expression} AS sort_key, timestamp, event, file_path, domain,
+                           file_size, file_type, download_url, is_duplicate
+                    FROM insights
+                    {where}
+                    ORDER BY {expression} {direction}, id {direction}
+                    LIMIT ?
+                    """,
+                    (*parameters, limit + 1),
+                ).fetchall()
+            )
+    rows.sort(key=lambda row: (row["sort_key"], row["id"]), reverse=descending)
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    cursor = (rows[-1]["sort_key"], rows[-1]["id"]) if has_more and rows else None
+    return [_row_to_record(row) for row in rows], cursor
+
+
+def search_insights(
+    download_folder: str,
+    query: str,
+    limit: int = 100,
+    offset: int = 0,
+) -> list[dict[str, str]]:
+    """Return insights whose file path, download URL or domain match ``query``.
+
+    Every whitespace-separated term must match, as a prefix, in any of the
+    three columns. Results are ranked by relevance (bm25) and returned one page
+    at a time. Falls back to a ``LIKE`` scan when SQLite lacks FTS5.
+    """
+    _ensure_directory(download_folder)
+    match_expression = _build_match_expression(query)
+    if not match_expression:
+        return []
+
+    rows: list[sqlite3.Row] = []
+    for path, sealed in _read_sources(download_folder):
+        if not sealed and path not in _search_ready:
+            # Creating the index writes, so it goes through the writer once per database.
+            with get_pool(path).writer() as connection:
+                _ensure_search_index(connection, path)
+        with _read_connection(path, sealed) as connection:
+            connection.row_factory = sqlite3.Row
+            use_index = _has_search_index(connection) if sealed else _search_ready[path]
+            rows.extend(_search_source(connection, query, match_expression, use_index, limit + offset))
+    rows.sort(key=lambda row: (row["rank"], -row["id"]))
+
+    return [_row_to_record(row) for row in rows[offset:offset + limit]]
+
+
+def _search_source(
+    connection: sqlite3.Connection,
+    query: str,
+    match_expression: str,
+    use_index: bool,
+    limit: int,
+) -> list[sqlite3.Row]:
+    if use_index:
+        return connection.execute(
             """
+            SELECT i.id, bm25(insights_fts) AS rank, i.timestamp, i.event, i.file_path, i.domain,
+                   i.file_size, i.file_type, i.download_url, i.is_duplicate
+            FROM insights_fts
+            JOIN insights AS i ON i.id = insights_fts.rowid
+            WHERE insights_fts MATCH ?
+            ORDER BY rank, i.id DESC
+            LIMIT ?
+            """,
+            (match_expression, limit),
         ).fetchall()
 
-    insights: list[dict[str, str]] = []
-    for row in rows:
-        file_size = row["file_size"]
-        insights.append(
-            {
-                "Timestamp": row["timestamp"],
-                "Event": row["event"],
-                "File Path": row["file_path"],
-                "Domain": row["domain"],
-                "File Size": str(file_size) if file_size is not None else "",
-                "File Type": row["file_type"] or "",
-                "Download URL": row["download_url"] or "",
-                "Is Duplicate": "Yes" if row["is_duplicate"] else "No",
-            }
+    clauses: list[str] = []
+    parameters: list[object] = []
+    for token in _SEARCH_TOKEN_PATTERN.findall(query):
+        clauses.append(
+            "(file_path LIKE ? ESCAPE '\\' OR download_url LIKE ? ESCAPE '\\' OR domain LIKE ? ESCAPE '\\')"
         )
-    return insights
+        # Match the token literally, as the FTS path does; % and _ are LIKE wildcards.
+        escaped = token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"%{escaped}%"
+        parameters.extend((pattern, pattern, pattern))
+    return connection.execute(
+        f"""
+        SELECT id, 0.0 AS rank, timestamp, event, file_path, domain,
+               file_size, file_type, download_url, is_duplicate
+        FROM insights
+        WHERE {" AND ".join(clauses)}
+        ORDER BY id DESC
+        LIMIT ?
+        """,
+        (*parameters, limit),
+    ).fetchall()
 
 
 def get_latest_entry_id(download_folder: str) -> int:
@@ -230,21 +812,441 @@ def get_latest_entry_id(download_folder: str) -> int:
     if not os.path.exists(database_path):
         return 0
 
-    with sqlite3.connect(database_path, timeout=5) as connection:
-        cursor = connection.execute("SELECT IFNULL(MAX(id), 0) FROM insights")
+    with _read_connection(database_path) as connection:
+        # Sealing moves rows out to partitions; the sequence keeps the high-water mark.
+        cursor = connection.execute(
+            """
+            SELECT MAX(
+                IFNULL((SELECT MAX(id) FROM insights), 0),
+                IFNULL((SELECT seq FROM sqlite_sequence WHERE name = 'insights'), 0)
+            )
+            """
+        )
         result = cursor.fetchone()
         return int(result[0]) if result and result[0] is not None else 0
 
 
-def export_insights_to_csv(download_folder: str, destination_path: str) -> None:
-    insights = fetch_insights(download_folder)
+def get_data_version(download_folder: str) -> int:
+    """A value that changes whenever the live database is written, including rows updated in place."""
+    database_path = _database_path(download_folder)
+    if not os.path.exists(database_path):
+        return 0
+    return get_pool(database_path).data_version()
+
+
+_SOURCE_TOTALS_QUERIES = (
+    """
+    SELECT COUNT(*), IFNULL(SUM(file_size), 0), IFNULL(SUM(is_duplicate), 0), MIN(timestamp), MAX(timestamp)
+    FROM insights
+    {where}
+    """,
+    """
+    SELECT IFNULL(SUM(files), 0), IFNULL(SUM(total_size), 0), IFNULL(SUM(duplicates), 0),
+           MIN(day) || ' 00:00:00', MAX(day) || ' 00:00:00'
+    FROM insights_rollup
+    {where}
+    """,
+)
+
+# Dimensions aggregates can be grouped by, mapped to their insights and rollup
+# expressions. The unary ``+`` keeps SQLite from walking the sort indexes to
+# avoid the GROUP BY sort, which would skip the date range and look up every
+# row; the covering analytics index is searched instead.
+AGGREGATE_DIMENSIONS = {
+    "Day": ("substr(timestamp, 1, 10)", "day"),
+    "Domain": ("+domain", "domain"),
+    "File Type": ("+IFNULL(file_type, '')", "file_type"),
+}
+
+
+def _source_queries(
+    insights_query: str,
+    rollup_query: str,
+    start: date | None,
+    end: date | None,
+) -> tuple[tuple[str, tuple[str, ...]], tuple[str, tuple[str, ...]]]:
+    where, parameters = _range_clause(start, end)
+    rollup_where, rollup_parameters = _day_range_clause(start, end)
+    return (
+        (insights_query.format(where=where), parameters),
+        (rollup_query.format(where=rollup_where), rollup_parameters),
+    )
+
+
+def _aggregate_rows(
+    download_folder: str,
+    queries: tuple[tuple[str, tuple[str, ...]], tuple[str, tuple[str, ...]]],
+    start: date | None,
+    end: date | None,
+) -> Iterator[tuple]:
+    """Run the insights query in every source the range touches, and the rollup query in the live one."""
+    for path, sealed in _read_sources(download_folder, start, end):
+        # Partitions carry no rollup table; it lives with the live rows.
+        with _read_connection(path, sealed) as connection:
+            try:
+                rows = [
+                    row
+                    for query, parameters in queries[: 1 if sealed else 2]
+                    for row in connection.execute(query, parameters)
+                ]
+            except sqlite3.OperationalError:
+                continue
+        yield from rows
+
+
+def summarize_insights(
+    download_folder: str,
+    top_domains: int = 10,
+    start: date | None = None,
+    end: date | None = None,
+) -> dict[str, object]:
+    """Return totals and the busiest domains between ``start`` and ``end``, computed inside SQLite."""
+    _ensure_directory(download_folder)
+    summary: dict[str, object] = {
+        "total_files": 0,
+        "total_size": 0,
+        "duplicates": 0,
+        "first_timestamp": None,
+        "last_timestamp": None,
+        "domains": [],
+    }
+    totals = [0, 0, 0]
+    first_timestamp: str | None = None
+    last_timestamp: str | None = None
+
+    queries = _source_queries(*_SOURCE_TOTALS_QUERIES, start, end)
+    for files, size, duplicates, first, last in _aggregate_rows(download_folder, queries, start, end):
+        totals[0] += files
+        totals[1] += size
+        totals[2] += duplicates
+        if first is not None and (first_timestamp is None or first < first_timestamp):
+            first_timestamp = first
+        if last is not None and (last_timestamp is None or last > last_timestamp):
+            last_timestamp = last
+
+    busiest = aggregate_insights(download_folder, ("Domain",), start, end)[:top_domains] if top_domains > 0 else []
+    summary.update(
+        total_files=totals[0],
+        total_size=totals[1],
+        duplicates=totals[2],
+        first_timestamp=first_timestamp,
+        last_timestamp=last_timestamp,
+        domains=[
+            {"domain": entry["Domain"], "files": entry["Files"], "size": entry["File Size"], "duplicates": entry["Duplicates"]}
+            for entry in busiest
+        ],
+    )
+    return summary
+
+
+def aggregate_insights(
+    download_folder: str,
+    group_by: Iterable[str] = (),
+    start: date | None = None,
+    end: date | None = None,
+) -> list[dict[str, object]]:
+    """Return files, bytes and duplicates per combination of ``group_by`` dimensions, busiest first.
+
+    ``COUNT``/``SUM``/``GROUP BY`` run inside SQLite, answered from the
+    covering analytics index, in every partition the date range touches and
+    in the live database together with the rollup of archived rows. Only
+    the per-source groups are merged here. Rows use the Insights column
+    names (``Day``, ``Domain``, ``File Type``, ``Files``, ``File Size``,
+    ``Duplicates``), the same shape :func:`fetch_rollups` returns.
+    """
+    dimensions = tuple(group_by)
+    for dimension in dimensions:
+        if dimension not in AGGREGATE_DIMENSIONS:
+            raise ValueError(f"Insights cannot be grouped by {dimension!r}")
+
+    _ensure_directory(download_folder)
+    insights_keys = "".join(f"{AGGREGATE_DIMENSIONS[dimension][0]}, " for dimension in dimensions)
+    rollup_keys = "".join(f"{AGGREGATE_DIMENSIONS[dimension][1]}, " for dimension in dimensions)
+    group = f"GROUP BY {', '.join(str(position) for position in range(1, len(dimensions) + 1))}" if dimensions else ""
+    queries = _source_queries(
+        f"""
+        SELECT {insights_keys}COUNT(*), IFNULL(SUM(file_size), 0), IFNULL(SUM(is_duplicate), 0)
+        FROM insights
+        {{where}}
+        {group}
+        """,
+        f"""
+        SELECT {rollup_keys}IFNULL(SUM(files), 0), IFNULL(SUM(total_size), 0), IFNULL(SUM(duplicates), 0)
+        FROM insights_rollup
+        {{where}}
+        {group}
+        """,
+        start,
+        end,
+    )
+
+    groups: dict[tuple, list[int]] = {}
+    width = len(dimensions)
+    for row in _aggregate_rows(download_folder, queries, start, end):
+        entry = groups.setdefault(tuple(row[:width]), [0, 0, 0])
+        entry[0] += row[width]
+        entry[1] += row[width + 1]
+        entry[2] += row[width + 2]
+
+    return [
+        {**dict(zip(dimensions, key)), "Files": files, "File Size": size, "Duplicates": duplicates}
+        for key, (files, size, duplicates) in sorted(groups.items(), key=lambda item: (-item[1][0], item[0]))
+    ]
+
+
+def export_insights_to_csv(
+    download_folder: str,
+    destination_path: str,
+    start: date | None = None,
+    end: date | None = None,
+) -> None:
     with open(destination_path, "w", newline="", encoding="utf-8") as csv_file:
         writer = csv.writer(csv_file)
         writer.writerow(EXPECTED_HEADER)
-        for record in insights:
+        for record in iter_insights(download_folder, start, end):
             writer.writerow([record.get(column, "") for column in EXPECTED_HEADER])
 
 
+@dataclass
+class ImportResult:
+    read: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+
+
+def detect_import_format(source_path: str) -> str:
+    extension = os.path.splitext(source_path)[1].lower()
+    return "jsonl" if extension in {".jsonl", ".ndjson", ".json"} else "csv"
+
+
+def _normalize_timestamp(value: object) -> str | None:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Epoch seconds, or milliseconds as many logging tools write them.
+        seconds = value / 1000 if value > 1e11 else value
+        try:
+            return datetime.fromtimestamp(seconds).strftime(_TIMESTAMP_FORMAT)
+        except (OverflowError, OSError, ValueError):
+            return None
+
+    text = str(value or "").strip()
+    if _CANONICAL_TIMESTAMP_PATTERN.match(text):
+        return text
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            return _normalize_timestamp(float(text))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        # Insights are recorded in local time.
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.strftime(_TIMESTAMP_FORMAT)
+
+
+def _normalize_size(value: object) -> int | None:
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        size = int(value)
+    else:
+        text = str(value).strip().replace(",", "")
+        try:
+            size = int(text)
+        except ValueError:
+            try:
+                size = int(float(text))
+            except (ValueError, OverflowError):
+                return None
+    return size if size >= 0 else None
+
+
+def _domain_from_url(url: str) -> str:
+    # Same rule as FileHandler.extract_domain_from_url.
+    hostname = urlparse(url).hostname
+    if not hostname:
+        return "unknown_domain"
+    return hostname.replace("www.", "").split(".")[0]
+
+
+def _normalize_import_values(
+    timestamp: object,
+    event: object,
+    file_path: object,
+    domain: object,
+    file_size: object,
+    file_type: object,
+    download_url: object,
+    is_duplicate: object,
+) -> tuple | None:
+    """Coerce one imported record to ``_INSERT_STATEMENT`` parameters, or ``None`` to reject it."""
+    timestamp = _normalize_timestamp(timestamp)
+    file_path = str(file_path or "").strip()
+    if timestamp is None or not file_path:
+        return None
+    download_url = str(download_url or "").strip()
+    if isinstance(is_duplicate, bool):
+        duplicate = int(is_duplicate)
+    else:
+        duplicate = 1 if str(is_duplicate).strip().lower() in _TRUE_VALUES else 0
+    return (
+        timestamp,
+        str(event or "").strip() or IMPORTED_EVENT,
+        file_path,
+        str(domain or "").strip() or _domain_from_url(download_url),
+        _normalize_size(file_size),
+        str(file_type or "").strip() or os.path.splitext(file_path)[1],
+        download_url,
+        duplicate,
+    )
+
+
+def _normalize_import_chunk(file_format: str, indexes: tuple[int, ...], chunk: list) -> tuple[list[tuple], int]:
+    """Parse and coerce one chunk; runs in worker processes, so it only takes plain data."""
+    values: list[tuple] = []
+    rejected = 0
+    for item in chunk:
+        if file_format == "jsonl":
+            try:
+                document = json.loads(item)
+            except ValueError:
+                rejected += 1
+                continue
+            if not isinstance(document, dict):
+                rejected += 1
+                continue
+            fields: list[object] = [None] * len(EXPECTED_HEADER)
+            for key, value in document.items():
+                index = _IMPORT_FIELD_INDEX.get(str(key).strip().lower().replace(" ", "_"))
+                if index is not None:
+                    fields[index] = value
+        else:
+            fields = [item[index] if 0 <= index < len(item) else None for index in indexes]
+        normalized = _normalize_import_values(*fields)
+        if normalized is None:
+            rejected += 1
+        else:
+            values.append(normalized)
+    return values, rejected
+
+
+def _read_import_chunks(handle, file_format: str, chunk_rows: int) -> tuple[tuple[int, ...], Iterator[list]]:
+    if file_format == "jsonl":
+        lines = (line for line in handle if line.strip())
+        return (), iter(lambda: list(islice(lines, chunk_rows)), [])
+
+    reader = csv.reader(handle)
+    header = next(reader, [])
+    positions = {name.strip().lower().replace(" ", "_"): index for index, name in enumerate(header)}
+    indexes = tuple(positions.get(name, -1) for name in _IMPORT_FIELD_INDEX)
+    rows = (row for row in reader if row)
+    return indexes, iter(lambda: list(islice(rows, chunk_rows)), [])
+
+
+def import_insights(
+    download_folder: str,
+    source_path: str,
+    file_format: str | None = None,
+    workers: int = 1,
+    chunk_rows: int = IMPORT_CHUNK_ROWS,
+) -> ImportResult:
+    """Bulk import a CSV (template column layout) or JSON lines file into ``download_folder``'s insights.
+
+    The file is parsed ``chunk_rows`` at a time, on a pool of ``workers``
+    processes when more than one is requested, and staged with
+    ``executemany`` into a temporary table. Rows that repeat within the file
+    or match an existing insight, live or sealed, on timestamp, file path
+    and event are dropped. The rest are inserted in one transaction.
+    Timestamps become local ``YYYY-MM-DD HH:MM:SS`` and records without a
+    valid timestamp or file path are rejected.
+    """
+    file_format = file_format or detect_import_format(source_path)
+    if file_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format {file_format!r}")
+
+    initialize_log_file(download_folder)
+    database_path = _database_path(download_folder)
+    result = ImportResult()
+    chunk_rows = max(1, chunk_rows)
+
+    with closing(sqlite3.connect(database_path, timeout=30)) as connection:
+        connection.execute(_CREATE_STAGING_STATEMENT)
+        staging_insert = f"INSERT OR IGNORE INTO temp.import_staging VALUES ({', '.join('?' for _ in EXPECTED_HEADER)})"
+
+        def _stage(values: list[tuple], rejected: int) -> None:
+            result.read += len(values) + rejected
+            result.rejected += rejected
+            connection.executemany(staging_insert, values)
+
+        encoding = "utf-8" if file_format == "jsonl" else "utf-8-sig"
+        with open(source_path, newline="", encoding=encoding) as handle:
+            indexes, chunks = _read_import_chunks(handle, file_format, chunk_rows)
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    # Keep a bounded number of chunks in flight so memory stays flat.
+                    pending: deque = deque()
+                    for chunk in chunks:
+                        pending.append(pool.submit(_normalize_import_chunk, file_format, indexes, chunk))
+                        if len(pending) >= workers * 2:
+                            _stage(*pending.popleft().result())
+                    while pending:
+                        _stage(*pending.popleft().result())
+            else:
+                for chunk in chunks:
+                    _stage(*_normalize_import_chunk(file_format, indexes, chunk))
+        connection.commit()
+
+        first_day, last_day = connection.execute(
+            "SELECT MIN(substr(timestamp, 1, 10)), MAX(substr(timestamp, 1, 10)) FROM temp.import_staging"
+        ).fetchone()
+        if first_day is None:
+            result.duplicates = result.read - result.rejected
+            return result
+
+        for _month, path in list_partitions(
+            download_folder, date.fromisoformat(first_day), date.fromisoformat(last_day)
+        ):
+            connection.execute("ATTACH DATABASE ? AS sealed", (path,))
+            try:
+                connection.execute(_DELETE_RECORDED_STAGING_STATEMENT.format(schema="sealed"))
+                connection.commit()
+            finally:
+                connection.execute("DETACH DATABASE sealed")
+
+        defer_search = False
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(_DELETE_RECORDED_STAGING_STATEMENT.format(schema="main"))
+            staged = connection.execute("SELECT COUNT(*) FROM temp.import_staging").fetchone()[0]
+            existing = connection.execute("SELECT COUNT(*) FROM insights").fetchone()[0]
+            # Reindexing everything once beats the per-row trigger when the import is large.
+            defer_search = staged > existing // 4
+            if defer_search:
+                connection.execute("DROP TRIGGER IF EXISTS insights_fts_insert")
+            connection.execute(
+                """
+                INSERT INTO insights (
+                    timestamp, event, file_path, domain, file_size, file_type, download_url, is_duplicate
+                )
+                SELECT timestamp, event, file_path, domain, file_size, file_type, download_url, is_duplicate
+                FROM temp.import_staging
+                ORDER BY timestamp
+                """
+            )
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            if defer_search:
+                _rebuild_search_index(connection, database_path)
+
+    result.imported = staged
+    result.duplicates = result.read - result.rejected - staged
+    return result
+
+
 def get_database_path(download_folder: str) -> str:
     _ensure_directory(download_folder)
     return _database_path(download_folder)
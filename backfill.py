@@ -0,0 +1,138 @@
+"""Organize files that finished downloading while the monitor was not running."""
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable
+
+from analytics import log_event
+from fileHandler import PROGRESS_STEP_PERCENT, organize_event
+
+PARTIAL_SUFFIXES = (".tmp", ".crdownload", ".partial", ".part")
+DEFAULT_WORKERS = 4
+
+
+@dataclass
+class BackfillResult:
+    scanned: int = 0
+    skipped: int = 0
+    moved: int = 0
+    unknown: int = 0
+    failed: int = 0
+    cancelled: bool = False
+
+
+def _finished_files(download_folder: str) -> list[str]:
+    files: list[str] = []
+    try:
+        with os.scandir(download_folder) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or entry.name.lower().endswith(PARTIAL_SUFFIXES):
+                    continue
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        files.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        return []
+    return files
+
+
+def progress_reporter(emit: Callable[[str], None], download_folder: str) -> Callable[[int, int], None]:
+    """Return a ``progress`` callback that reports every ``PROGRESS_STEP_PERCENT`` through ``emit``."""
+    reported = [0]
+
+    def _progress(done: int, total: int) -> None:
+        percent = done * 100 // total if total else 100
+        if percent >= reported[0] + PROGRESS_STEP_PERCENT and percent < 100:
+            reported[0] = percent - percent % PROGRESS_STEP_PERCENT
+            emit(f"Backfill of {download_folder}: {done}/{total} files ({reported[0]}%)")
+
+    return _progress
+
+
+def run_backfill(
+    handler,
+    download_folder: str,
+    stop_event: threading.Event | None = None,
+    progress: Callable[[int, int], None] | None = None,
+    max_workers: int = DEFAULT_WORKERS,
+) -> BackfillResult:
+    """Classify, move and log every stale file in ``download_folder``.
+
+    Domains are resolved with one bulk History lookup through ``handler``
+    (a :class:`fileHandler.FileHandler`). Moves run on a small thread pool;
+    the handler plans and reserves each destination under its own lock, so
+    same-named files get distinct names here and against the live observer.
+    Setting ``stop_event`` cancels the remaining work.
+
+    Insights record where files were organized to, not where they were
+    downloaded, so every finished file in the folder is a candidate. In move
+    mode organized files have left the folder already; in link mode the
+    handler recognises an original whose copy is in place and reports it as
+    ``existing``, which counts as skipped.
+    """
+    result = BackfillResult()
+    candidates = _finished_files(download_folder)
+    result.scanned = total = len(candidates)
+    if not candidates:
+        return result
+
+    handler._emit(f"Backfill: checking {total} file(s) found in {download_folder}")
+    urls = handler.lookup_urls(candidates)
+
+    counters_guard = threading.Lock()
+    done = 0
+
+    def _organize(file_path: str) -> str:
+        if stop_event is not None and stop_event.is_set():
+            return "cancelled"
+        if not os.path.exists(file_path):
+            return "failed"
+        website = urls.get(file_path, "unknown_domain")
+        domain = handler.extract_domain_from_url(website)
+        final_path, is_duplicate, method = handler.organize_to_website_folder(file_path, domain, download_folder)
+        if method == "existing":
+            return "existing"
+        log_event(
+            organize_event(method, is_duplicate, "backfill"),
+            final_path,
+            domain,
+            download_folder,
+            website,
+            is_duplicate=is_duplicate,
+        )
+        return "unknown" if domain == "unknown_domain" else "moved"
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="backfill") as pool:
+        futures = [pool.submit(_organize, path) for path in candidates]
+        for future in as_completed(futures):
+            try:
+                outcome = future.result()
+            except Exception:
+                outcome = "failed"
+            with counters_guard:
+                if outcome == "cancelled":
+                    result.cancelled = True
+                elif outcome == "existing":
+                    result.skipped += 1
+                elif outcome == "failed":
+                    result.failed += 1
+                else:
+                    result.moved += 1
+                    if outcome == "unknown":
+                        result.unknown += 1
+                done += 1
+                current = done
+            if progress is not None:
+                progress(current, total)
+
+    handler._emit(
+        f"Backfill finished: {result.moved} organized ({result.unknown} unknown domain), "
+        f"{result.failed} failed, {result.skipped} already organized"
+        + (" (cancelled)" if result.cancelled else "")
+    )
+    return result
@@ -0,0 +1 @@
+"""Benchmarks for the Download Insights hot paths. Run from the repository root, e.g. ``python -m benchmarks.bench_ingest``."""
@@ -0,0 +1,215 @@
+"""Analytics and UI-data benchmark across insights databases of increasing size.
+
+For every scale an insights database is generated and the analytics API plus
+the date-ranged SQL aggregation behind the Analytics tab are timed. Each operation is
+run once untraced for wall time and once under ``tracemalloc`` for its peak
+Python allocation. Everything happens in a temporary directory with ``HOME``
+redirected, so the user's analytics are never touched.
+
+    python -m benchmarks.bench_analytics --scales 10000,100000,1000000 --output analytics.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Callable
+
+from benchmarks.edge_history import EXTENSIONS, SITES
+
+DEFAULT_SCALES = "10000,100000,1000000"
+
+
+def _generate_rows(count: int, seed: int, folder: str):
+    rng = random.Random(seed)
+    domains = [site.replace("www.", "").split(".")[0] for site in SITES] + ["unknown_domain"]
+    end = datetime.now()
+    span_seconds = 2 * 365 * 24 * 3600
+    for index in range(count):
+        moment = end - timedelta(seconds=rng.random() * span_seconds)
+        extension = rng.choice(EXTENSIONS)
+        domain = rng.choice(domains)
+        duplicate = rng.random() < 0.05
+        yield (
+            moment.strftime("%Y-%m-%d %H:%M:%S"),
+            "Moved (duplicate)" if duplicate else "Moved",
+            os.path.join(folder, "DownloadInsights", domain, f"file_{index}{extension}"),
+            domain,
+            rng.randint(1_000, 200_000_000),
+            extension,
+            f"https://{domain}.example.com/downloads/file_{index}{extension}",
+            1 if duplicate else 0,
+        )
+
+
+def build_database(download_folder: str, rows: int, seed: int) -> float:
+    from analytics import get_database_path, initialize_log_file
+
+    started = time.perf_counter()
+    initialize_log_file(download_folder)
+    with sqlite3.connect(get_database_path(download_folder)) as connection:
+        connection.executemany(
+            """
+            INSERT INTO insights (
+                timestamp, event, file_path, domain, file_size, file_type, download_url, is_duplicate
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            _generate_rows(rows, seed, download_folder),
+        )
+        connection.commit()
+    return time.perf_counter() - started
+
+
+def measure(operation: Callable[[], object], trace_memory: bool) -> dict[str, float]:
+    started = time.perf_counter()
+    operation()
+    result = {"seconds": time.perf_counter() - started}
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            operation()
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["peak_mib"] = peak / (1024 * 1024)
+    return result
+
+
+def run_scale(workspace: str, rows: int, args: argparse.Namespace) -> dict[str, object]:
+    import analytics
+    from aggregation import daily_domain_counts, recent_date_range
+    from paths import get_analytics_dir
+
+    download_folder = os.path.join(workspace, f"Downloads_{rows}")
+    os.makedirs(download_folder)
+    build_seconds = build_database(download_folder, rows, args.seed)
+    database_path = analytics.get_database_path(download_folder)
+
+    operations: dict[str, dict[str, float]] = {}
+    trace = not args.skip_memory
+
+    operations["fetch_insights"] = measure(lambda: analytics.fetch_insights(download_folder), trace)
+    operations["get_latest_entry_id"] = measure(lambda: analytics.get_latest_entry_id(download_folder), trace)
+    operations["fetch_insights_page"] = measure(
+        lambda: analytics.fetch_insights_page(download_folder, "Domain", limit=200), trace
+    )
+    operations["summarize_insights"] = measure(lambda: analytics.summarize_insights(download_folder), trace)
+
+    export_path = os.path.join(workspace, f"export_{rows}.csv")
+    operations["export_insights_to_csv"] = measure(
+        lambda: analytics.export_insights_to_csv(download_folder, export_path), trace
+    )
+
+    # The Analytics tab: overall totals, the default chart range, then the
+    # range totals, the breakdown table and the per day chart series.
+    summary = analytics.summarize_insights(download_folder, top_domains=0)
+    first, last = summary["first_timestamp"], summary["last_timestamp"]
+    start_date, end_date = recent_date_range(
+        date.fromisoformat(first[:10]) if first else None,
+        date.fromisoformat(last[:10]) if last else None,
+    )
+    operations["summarize_insights_range"] = measure(
+        lambda: analytics.summarize_insights(download_folder, top_domains=0, start=start_date, end=end_date), trace
+    )
+    operations["aggregate_domain_range"] = measure(
+        lambda: analytics.aggregate_insights(download_folder, ("Domain",), start_date, end_date), trace
+    )
+    operations["aggregate_chart"] = measure(
+        lambda: daily_domain_counts(
+            (),
+            start_date,
+            end_date,
+            rollups=analytics.aggregate_insights(download_folder, ("Day", "Domain"), start_date, end_date),
+        ),
+        trace,
+    )
+
+    migration_folder = os.path.join(workspace, f"Legacy_{rows}")
+    os.makedirs(migration_folder)
+    analytics.initialize_log_file(migration_folder)
+    migration_dir = get_analytics_dir(migration_folder)
+    migration_db = analytics.get_database_path(migration_folder)
+    shutil.copyfile(export_path, os.path.join(migration_dir, analytics.LEGACY_CSV_FILE_NAME))
+
+    def migrate() -> None:
+        with sqlite3.connect(migration_db) as connection:
+            connection.execute("DELETE FROM insights")
+            connection.execute("DROP TABLE IF EXISTS legacy_migration")
+            connection.commit()
+        analytics._migrate_legacy_csv(migration_dir, migration_db)
+
+    operations["migrate_legacy_csv"] = measure(migrate, trace)
+
+    return {
+        "rows": rows,
+        "build_seconds": build_seconds,
+        "database_bytes": os.path.getsize(database_path),
+        "csv_bytes": os.path.getsize(export_path),
+        "operations": operations,
+    }
+
+
+def run(args: argparse.Namespace) -> dict[str, object]:
+    workspace = tempfile.mkdtemp(prefix="download_insights_bench_")
+    os.environ["HOME"] = workspace
+    os.environ["USERPROFILE"] = workspace
+    scales = [int(value) for value in args.scales.split(",") if value.strip()]
+
+    try:
+        results = []
+        for rows in scales:
+            print(f"Benchmarking {rows} rows...", file=sys.stderr, flush=True)
+            results.append(run_scale(workspace, rows, args))
+        return {
+            "benchmark": "analytics",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "environment": {
+                "python": sys.version.split()[0],
+                "sqlite": sqlite3.sqlite_version,
+                "platform": platform.platform(),
+            },
+            "config": {"scales": scales, "seed": args.seed, "memory": not args.skip_memory},
+            "results": results,
+        }
+    finally:
+        if not args.keep:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scales",
+        default=DEFAULT_SCALES,
+        help="Comma separated row counts to benchmark, e.g. 10000,100000,1000000,10000000.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-memory", action="store_true", help="Skip the tracemalloc pass.")
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout.")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary workspace for inspection.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = run(args)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""End-to-end ingest benchmark: synthetic Edge History plus bursts of finished downloads.
+
+Each burst creates ``.crdownload`` files, appends the matching rows to a
+synthetic ``History`` database, renames the files to their final names and
+feeds the rename events through :class:`fileHandler.FileHandler`, which
+resolves the domain, moves the file and logs it. Everything happens in a
+temporary directory with ``HOME`` redirected, so the user's settings and
+analytics are never touched.
+
+    python -m benchmarks.bench_ingest --history-rows 100000 --bursts 5 --burst-size 50 --output ingest.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.edge_history import (
+    EXTENSIONS,
+    append_downloads,
+    describe,
+    make_download_row,
+    populate_history,
+)
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(args: argparse.Namespace) -> dict[str, object]:
+    workspace = tempfile.mkdtemp(prefix="download_insights_bench_")
+    os.environ["HOME"] = workspace
+    os.environ["USERPROFILE"] = workspace
+
+    # Imported after HOME is redirected so the app's storage lands in the workspace.
+    from watchdog.events import FileMovedEvent
+
+    from analytics import get_latest_entry_id, initialize_log_file
+    from fileHandler import FileHandler
+    from metrics import PipelineMetrics
+
+    try:
+        download_folder = os.path.join(workspace, "Downloads")
+        os.makedirs(download_folder)
+        history_path = os.path.join(workspace, "History")
+
+        started = time.perf_counter()
+        populate_history(
+            history_path,
+            args.history_rows,
+            download_folder,
+            seed=args.seed,
+            journal_mode=args.journal_mode,
+        )
+        history_seconds = time.perf_counter() - started
+
+        initialize_log_file(download_folder)
+        metrics = PipelineMetrics()
+        handler = FileHandler(
+            download_folder,
+            message_callback=(print if args.verbose else lambda _message: None),
+            metrics=metrics,
+            edge_history_path=history_path,
+            stabilize_seconds=args.stabilize,
+        )
+
+        rng = random.Random(args.seed)
+        payload = os.urandom(args.file_size)
+        latencies: list[float] = []
+        processed = 0
+        wall_started = time.perf_counter()
+
+        for burst in range(args.bursts):
+            final_paths: list[str] = []
+            rows: list[tuple] = []
+            for index in range(args.burst_size):
+                extension = rng.choice(EXTENSIONS)
+                final_path = os.path.join(download_folder, f"burst{burst}_file{index}{extension}")
+                partial_path = f"{final_path}.crdownload"
+                with open(partial_path, "wb") as handle:
+                    handle.write(payload)
+                final_paths.append(final_path)
+                rows.append(make_download_row(final_path, rng))
+
+            append_downloads(history_path, rows)
+
+            for final_path in final_paths:
+                os.rename(f"{final_path}.crdownload", final_path)
+
+            for final_path in final_paths:
+                event = FileMovedEvent(f"{final_path}.crdownload", final_path)
+                event_started = time.perf_counter()
+                handler.on_moved(event)
+                latencies.append(time.perf_counter() - event_started)
+                processed += 1
+
+        wall_seconds = time.perf_counter() - wall_started
+        handler.close()
+        logged = get_latest_entry_id(download_folder)
+        ordered = sorted(latencies)
+
+        return {
+            "benchmark": "ingest",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "environment": {
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+            },
+            "config": {
+                "history_rows": args.history_rows,
+                "bursts": args.bursts,
+                "burst_size": args.burst_size,
+                "file_size": args.file_size,
+                "stabilize_seconds": args.stabilize,
+                "journal_mode": args.journal_mode,
+                "seed": args.seed,
+            },
+            "history": {**describe(history_path), "build_seconds": history_seconds},
+            "results": {
+                "files": processed,
+                "logged": logged,
+                "wall_seconds": wall_seconds,
+                "files_per_second": processed / wall_seconds if wall_seconds else 0.0,
+                "latency_ms": {
+                    "p50": _percentile(ordered, 0.50) * 1000,
+                    "p95": _percentile(ordered, 0.95) * 1000,
+                    "p99": _percentile(ordered, 0.99) * 1000,
+                    "max": (ordered[-1] * 1000) if ordered else 0.0,
+                },
+                # Stabilization is a fixed sleep; this is the time spent in the pipeline itself.
+                "pipeline_ms_per_file": (
+                    (sum(latencies) - processed * args.stabilize) / processed * 1000 if processed else 0.0
+                ),
+            },
+            "stages": metrics.snapshot()["stages"],
+            "counters": metrics.snapshot()["counters"],
+        }
+    finally:
+        if not args.keep:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history-rows", type=int, default=10_000, help="Rows pre-loaded into the synthetic History.")
+    parser.add_argument("--bursts", type=int, default=5, help="Number of download bursts.")
+    parser.add_argument("--burst-size", type=int, default=20, help="Files per burst.")
+    parser.add_argument("--file-size", type=int, default=64 * 1024, help="Bytes written per downloaded file.")
+    parser.add_argument(
+        "--stabilize",
+        type=float,
+        default=0.0,
+        help="Seconds FileHandler waits to confirm a file stopped growing (the app uses 2).",
+    )
+    parser.add_argument("--journal-mode", default="DELETE", help="SQLite journal mode of the synthetic History.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout.")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary workspace for inspection.")
+    parser.add_argument("--verbose", action="store_true", help="Print FileHandler messages.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = run(args)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""Generate synthetic Microsoft Edge ``History`` databases for benchmarks."""
+from __future__ import annotations
+
+import os
+import random
+import sqlite3
+import time
+import uuid
+from datetime import datetime, timezone
+
+_WEBKIT_EPOCH_OFFSET_SECONDS = 11644473600
+
+_DOWNLOADS_TABLE = """
+CREATE TABLE IF NOT EXISTS downloads (
+    id INTEGER PRIMARY KEY,
+    guid VARCHAR NOT NULL,
+    current_path LONGVARCHAR NOT NULL,
+    target_path LONGVARCHAR NOT NULL,
+    start_time INTEGER NOT NULL,
+    received_bytes INTEGER NOT NULL,
+    total_bytes INTEGER NOT NULL,
+    state INTEGER NOT NULL,
+    danger_type INTEGER NOT NULL,
+    interrupt_reason INTEGER NOT NULL,
+    hash BLOB NOT NULL,
+    end_time INTEGER NOT NULL,
+    opened INTEGER NOT NULL,
+    last_access_time INTEGER NOT NULL,
+    transient INTEGER NOT NULL,
+    referrer VARCHAR NOT NULL,
+    site_url VARCHAR NOT NULL,
+    embedder_download_data VARCHAR NOT NULL,
+    tab_url VARCHAR NOT NULL,
+    tab_referrer_url VARCHAR NOT NULL,
+    http_method VARCHAR NOT NULL,
+    by_ext_id VARCHAR NOT NULL,
+    by_ext_name VARCHAR NOT NULL,
+    by_web_app_id VARCHAR NOT NULL,
+    etag VARCHAR NOT NULL,
+    last_modified VARCHAR NOT NULL,
+    mime_type VARCHAR(255) NOT NULL,
+    original_mime_type VARCHAR(255) NOT NULL
+)
+"""
+
+_URL_CHAINS_TABLE = """
+CREATE TABLE IF NOT EXISTS downloads_url_chains (
+    id INTEGER NOT NULL,
+    chain_index INTEGER NOT NULL,
+    url LONGVARCHAR NOT NULL,
+    PRIMARY KEY (id, chain_index)
+)
+"""
+
+SITES = (
+    "github.com",
+    "www.python.org",
+    "download.microsoft.com",
+    "www.dropbox.com",
+    "drive.google.com",
+    "www.mozilla.org",
+    "files.pythonhosted.org",
+    "www.nvidia.com",
+    "cdn.example.org",
+    "releases.ubuntu.com",
+)
+EXTENSIONS = (".zip", ".pdf", ".exe", ".msi", ".png", ".csv", ".tar.gz", ".docx")
+
+
+def to_webkit_time(moment: float) -> int:
+    """Convert a Unix timestamp to Chromium's microseconds-since-1601 format."""
+    return int((moment + _WEBKIT_EPOCH_OFFSET_SECONDS) * 1_000_000)
+
+
+def create_history_database(path: str, journal_mode: str = "DELETE") -> None:
+    with sqlite3.connect(path) as connection:
+        connection.execute(f"PRAGMA journal_mode = {journal_mode}")
+        connection.execute(_DOWNLOADS_TABLE)
+        connection.execute(_URL_CHAINS_TABLE)
+        connection.commit()
+
+
+def make_download_row(target_path: str, rng: random.Random, moment: float | None = None) -> tuple:
+    moment = time.time() if moment is None else moment
+    site = rng.choice(SITES)
+    size = rng.randint(1_000, 50_000_000)
+    file_name = os.path.basename(target_path)
+    site_url = f"https://{site}/"
+    tab_url = f"https://{site}/downloads/{file_name}"
+    return (
+        str(uuid.UUID(int=rng.getrandbits(128))),
+        target_path,
+        target_path,
+        to_webkit_time(moment - 5),
+        size,
+        size,
+        1,
+        0,
+        0,
+        b"",
+        to_webkit_time(moment),
+        0,
+        0,
+        0,
+        site_url,
+        site_url,
+        "",
+        tab_url,
+        site_url,
+        "",
+        "",
+        "",
+        "",
+        "",
+        "",
+        "application/octet-stream",
+        "application/octet-stream",
+    )
+
+
+_INSERT_DOWNLOAD = """
+INSERT INTO downloads (
+    guid, current_path, target_path, start_time, received_bytes, total_bytes, state,
+    danger_type, interrupt_reason, hash, end_time, opened, last_access_time, transient,
+    referrer, site_url, embedder_download_data, tab_url, tab_referrer_url, http_method,
+    by_ext_id, by_ext_name, by_web_app_id, etag, last_modified, mime_type, original_mime_type
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def append_downloads(path: str, rows: list[tuple]) -> None:
+    """Append downloads rows and their URL chains, as Edge does when a download finishes."""
+    with sqlite3.connect(path, timeout=5) as connection:
+        for row in rows:
+            cursor = connection.execute(_INSERT_DOWNLOAD, row)
+            connection.execute(
+                "INSERT INTO downloads_url_chains (id, chain_index, url) VALUES (?, 0, ?)",
+                (cursor.lastrowid, row[17]),
+            )
+        connection.commit()
+
+
+def populate_history(
+    path: str,
+    rows: int,
+    folder: str,
+    seed: int = 0,
+    batch_size: int = 10_000,
+    journal_mode: str = "DELETE",
+) -> None:
+    """Fill ``path`` with ``rows`` historical downloads whose targets live under ``folder``."""
+    rng = random.Random(seed)
+    create_history_database(path, journal_mode)
+    now = time.time()
+    span = 3 * 365 * 24 * 3600
+    batch: list[tuple] = []
+    for index in range(rows):
+        extension = rng.choice(EXTENSIONS)
+        target = os.path.join(folder, "history", f"archive_{index}{extension}")
+        batch.append(make_download_row(target, rng, now - rng.random() * span))
+        if len(batch) >= batch_size:
+            append_downloads(path, batch)
+            batch = []
+    if batch:
+        append_downloads(path, batch)
+
+
+def describe(path: str) -> dict[str, object]:
+    with sqlite3.connect(path) as connection:
+        count = connection.execute("SELECT COUNT(*) FROM downloads").fetchone()[0]
+    return {
+        "path": path,
+        "rows": count,
+        "size_bytes": os.path.getsize(path),
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
@@ -0,0 +1,250 @@
+"""Incremental Tk canvas renderer for the Download Insights stacked bar chart."""
+from __future__ import annotations
+
+import tkinter as tk
+from dataclasses import dataclass, field
+from datetime import date
+from tkinter import ttk
+from typing import Callable
+
+RENDER_DEBOUNCE_MS = 16
+
+_AXIS_COLOR = "#2e3148"
+_TOTAL_COLOR = "#f4f6fb"
+_LABEL_COLOR = "#cbd5f5"
+_MARGIN_LEFT = 60
+_MARGIN_RIGHT = 24
+_MARGIN_TOP = 24
+_MARGIN_BOTTOM = 48
+
+
+@dataclass
+class ChartFrame:
+    """Everything needed to draw one frame of the chart."""
+
+    days: list[date] = field(default_factory=list)
+    day_counts: dict[date, dict[str, int]] = field(default_factory=dict)
+    domains: list[str] = field(default_factory=list)
+    message: str | None = None
+
+
+class StackedBarChart:
+    """Draw a per-day stacked bar chart while reusing canvas items between frames.
+
+    Refresh and resize requests are coalesced into a single render on the next
+    tick. Canvas items are keyed by ``(day, domain)`` and legend widgets by
+    domain so a redraw only moves or recolors what already exists and creates
+    or deletes the difference.
+    """
+
+    def __init__(
+        self,
+        canvas: tk.Canvas,
+        legend_frame: ttk.Frame,
+        frame_source: Callable[[], ChartFrame],
+        color_for_domain: Callable[[str], str],
+        delay_ms: int = RENDER_DEBOUNCE_MS,
+    ) -> None:
+        self.canvas = canvas
+        self.legend_frame = legend_frame
+        self.frame_source = frame_source
+        self.color_for_domain = color_for_domain
+        self.delay_ms = delay_ms
+
+        self._job: str | None = None
+        self._axis_id: int | None = None
+        self._message_id: int | None = None
+        self._bar_ids: dict[tuple[date, str], int] = {}
+        self._total_ids: dict[date, int] = {}
+        self._label_ids: dict[date, int] = {}
+        self._legend_items: dict[str, ttk.Frame] = {}
+        self._legend_order: list[str] = []
+
+    def schedule(self) -> None:
+        """Request a redraw; bursts of requests collapse into one frame."""
+        if self._job is not None:
+            return
+        try:
+            self._job = self.canvas.after(self.delay_ms, self._render)
+        except tk.TclError:
+            self._job = None
+
+    def cancel(self) -> None:
+        if self._job is not None:
+            try:
+                self.canvas.after_cancel(self._job)
+            except tk.TclError:
+                pass
+            self._job = None
+
+    def render_now(self) -> None:
+        self.cancel()
+        self._render()
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+    def _render(self) -> None:
+        self._job = None
+        try:
+            frame = self.frame_source()
+        except tk.TclError:
+            return
+
+        if frame.message is not None:
+            self._clear_bars()
+            self._show_message(frame.message)
+            self._update_legend(frame.domains)
+            return
+
+        self._hide_message()
+        self._draw_bars(frame)
+        self._update_legend(frame.domains)
+
+    def _draw_bars(self, frame: ChartFrame) -> None:
+        canvas = self.canvas
+        days = frame.days
+        width = max(canvas.winfo_width(), 1)
+        height = max(canvas.winfo_height(), 1)
+
+        chart_width = max(width - _MARGIN_LEFT - _MARGIN_RIGHT, 1)
+        chart_height = max(height - _MARGIN_TOP - _MARGIN_BOTTOM, 1)
+        bar_slot = chart_width / max(len(days), 1)
+        bar_width = min(bar_slot * 0.6, 80)
+        baseline = height - _MARGIN_BOTTOM
+
+        totals = [sum(frame.day_counts.get(day, {}).values()) for day in days]
+        max_total = max(totals) if totals else 0
+        max_total = max(max_total, 1)
+
+        axis = (_MARGIN_LEFT, baseline, width - _MARGIN_RIGHT, baseline)
+        if self._axis_id is None:
+            self._axis_id = canvas.create_line(*axis, fill=_AXIS_COLOR)
+        else:
+            canvas.coords(self._axis_id, *axis)
+
+        live_bars: set[tuple[date, str]] = set()
+        live_days: set[date] = set(days)
+
+        for index, day in enumerate(days):
+            counts = frame.day_counts.get(day, {})
+            total_for_day = totals[index]
+            x_center = _MARGIN_LEFT + bar_slot * index + bar_slot / 2
+            x0 = x_center - bar_width / 2
+            x1 = x_center + bar_width / 2
+            cumulative_height = 0.0
+
+            for domain in frame.domains:
+                count = counts.get(domain, 0)
+                if count <= 0:
+                    continue
+                bar_height = count / max_total * chart_height
+                y1 = baseline - cumulative_height
+                y0 = y1 - bar_height
+                color = self.color_for_domain(domain)
+                key = (day, domain)
+                item = self._bar_ids.get(key)
+                if item is None:
+                    self._bar_ids[key] = canvas.create_rectangle(x0, y0, x1, y1, fill=color, outline="")
+                else:
+                    canvas.coords(item, x0, y0, x1, y1)
+                    canvas.itemconfigure(item, fill=color)
+                live_bars.add(key)
+                cumulative_height += bar_height
+
+            total_item = self._total_ids.get(day)
+            if total_for_day > 0:
+                position = (x_center, baseline - cumulative_height - 12)
+                if total_item is None:
+                    self._total_ids[day] = canvas.create_text(
+                        *position,
+                        text=str(total_for_day),
+                        fill=_TOTAL_COLOR,
+                        font=("Segoe UI", 10, "bold"),
+                    )
+                else:
+                    canvas.coords(total_item, *position)
+                    canvas.itemconfigure(total_item, text=str(total_for_day))
+            elif total_item is not None:
+                canvas.delete(total_item)
+                del self._total_ids[day]
+
+            label_position = (x_center, height - _MARGIN_BOTTOM / 2)
+            label_item = self._label_ids.get(day)
+            if label_item is None:
+                self._label_ids[day] = canvas.create_text(
+                    *label_position,
+                    text=day.strftime("%b %d"),
+                    fill=_LABEL_COLOR,
+                    font=("Segoe UI", 9),
+                )
+            else:
+                canvas.coords(label_item, *label_position)
+
+        for key in [key for key in self._bar_ids if key not in live_bars]:
+            canvas.delete(self._bar_ids.pop(key))
+        for day in [day for day in self._total_ids if day not in live_days]:
+            canvas.delete(self._total_ids.pop(day))
+        for day in [day for day in self._label_ids if day not in live_days]:
+            canvas.delete(self._label_ids.pop(day))
+
+    def _clear_bars(self) -> None:
+        for item in self._bar_ids.values():
+            self.canvas.delete(item)
+        for item in self._total_ids.values():
+            self.canvas.delete(item)
+        for item in self._label_ids.values():
+            self.canvas.delete(item)
+        self._bar_ids.clear()
+        self._total_ids.clear()
+        self._label_ids.clear()
+        if self._axis_id is not None:
+            self.canvas.delete(self._axis_id)
+            self._axis_id = None
+
+    def _show_message(self, message: str) -> None:
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        if self._message_id is None:
+            self._message_id = self.canvas.create_text(
+                width / 2,
+                height / 2,
+                text=message,
+                fill=_LABEL_COLOR,
+                font=("Segoe UI", 12),
+            )
+        else:
+            self.canvas.coords(self._message_id, width / 2, height / 2)
+            self.canvas.itemconfigure(self._message_id, text=message)
+
+    def _hide_message(self) -> None:
+        if self._message_id is not None:
+            self.canvas.delete(self._message_id)
+            self._message_id = None
+
+    # ------------------------------------------------------------------
+    # Legend
+    # ------------------------------------------------------------------
+    def _update_legend(self, domains: list[str]) -> None:
+        for domain in domains:
+            if domain not in self._legend_items:
+                self._legend_items[domain] = self._create_legend_item(domain)
+
+        if domains == self._legend_order:
+            return
+
+        for domain in self._legend_order:
+            item = self._legend_items.get(domain)
+            if item is not None:
+                item.pack_forget()
+        for domain in domains:
+            self._legend_items[domain].pack(side="left", padx=(0, 18))
+        self._legend_order = list(domains)
+
+    def _create_legend_item(self, domain: str) -> ttk.Frame:
+        item = ttk.Frame(self.legend_frame, style="Card.TFrame")
+        swatch = tk.Label(item, background=self.color_for_domain(domain), width=2, height=1)
+        swatch.pack(side="left", padx=(0, 6))
+        label = ttk.Label(item, text=domain, style="TLabel")
+        label.pack(side="left")
+        return item
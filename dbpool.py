@@ -0,0 +1,182 @@
+"""Long-lived SQLite connections for the insights databases.
+
+Each database file gets one writer connection, serialized by a lock, and a
+few read-only connections that any thread can borrow and hand back. The
+connections stay open, so their page cache, memory map and prepared
+statements survive between calls. The writer puts the database in WAL mode,
+so readers work from a snapshot and never block it.
+
+Pools are kept for the live database of each download folder until they are
+closed explicitly. Sealed partitions are read through short-lived
+connections from :func:`connect_readonly` instead: there can be any number of
+them, and a pool per partition would push the live pools out of any bound.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+from urllib.request import pathname2url
+
+BUSY_TIMEOUT_SECONDS = 5
+MAX_IDLE_READERS = 4
+CACHE_SIZE_KIB = 16 * 1024
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+
+
+class ConnectionPool:
+    """One writer and up to ``max_idle_readers`` idle read-only connections for ``path``."""
+
+    def __init__(self, path: str, max_idle_readers: int = MAX_IDLE_READERS) -> None:
+        self.path = path
+        self.max_idle_readers = max_idle_readers
+        self._lock = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._writer: sqlite3.Connection | None = None
+        self._idle: deque[sqlite3.Connection] = deque()
+        self._borrowed = 0
+        self._watcher: sqlite3.Connection | None = None
+        self._closed = False
+
+    def _configure(self, connection: sqlite3.Connection) -> None:
+        connection.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+        connection.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+
+    def _open_writer(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+        self._configure(connection)
+        try:
+            connection.execute("PRAGMA journal_mode = WAL")
+        except sqlite3.OperationalError:
+            # Another process holds the database; the mode is persistent, so
+            # whichever writer opens next switches it.
+            pass
+        connection.execute("PRAGMA synchronous = NORMAL")
+        return connection
+
+    def _open_reader(self) -> sqlite3.Connection:
+        connection = connect_readonly(self.path)
+        self._configure(connection)
+        return connection
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Yield the writer connection; commits when the block succeeds and rolls back otherwise."""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._open_writer()
+            connection = self._writer
+            connection.row_factory = None
+            try:
+                yield connection
+                connection.commit()
+            except BaseException:
+                connection.rollback()
+                raise
+            finally:
+                if self._closed:
+                    connection.close()
+                    self._writer = None
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection, opening one when none is idle."""
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+            self._borrowed += 1
+        try:
+            if connection is None:
+                connection = self._open_reader()
+            connection.row_factory = None
+            yield connection
+        finally:
+            if connection is not None and connection.in_transaction:
+                connection.rollback()
+            with self._lock:
+                keep = connection is not None and not self._closed and len(self._idle) < self.max_idle_readers
+                if keep:
+                    # The most recently used connection is handed out next, with the warmest cache.
+                    self._idle.append(connection)
+            if not keep and connection is not None:
+                connection.close()
+            with self._lock:
+                self._borrowed -= 1
+                self._lock.notify_all()
+
+    def data_version(self) -> int:
+        """``PRAGMA data_version`` of a connection kept for polling; it changes whenever anything commits."""
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = self._open_reader()
+            return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self, wait_seconds: float = 0) -> bool:
+        """Close idle connections now and borrowed ones as they are returned.
+
+        Waits up to ``wait_seconds`` for borrowed readers and the writer to be
+        handed back. Returns True when no connection to the file is left open.
+        """
+        deadline = time.monotonic() + wait_seconds
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            if self._watcher is not None:
+                idle.append(self._watcher)
+                self._watcher = None
+        for connection in idle:
+            connection.close()
+
+        writer_closed = False
+        if self._write_lock.acquire(timeout=max(0, deadline - time.monotonic())):
+            try:
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+                writer_closed = True
+            finally:
+                self._write_lock.release()
+        with self._lock:
+            # A borrowed reader closes itself on return, once the pool is closed.
+            self._lock.wait_for(lambda: self._borrowed == 0, max(0, deadline - time.monotonic()))
+            return writer_closed and self._borrowed == 0
+
+
+def connect_readonly(path: str) -> sqlite3.Connection:
+    """Open a read-only connection to ``path`` that any thread may use."""
+    return sqlite3.connect(
+        f"file:{pathname2url(path)}?mode=ro",
+        uri=True,
+        timeout=BUSY_TIMEOUT_SECONDS,
+        check_same_thread=False,
+    )
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def get_pool(path: str) -> ConnectionPool:
+    """Return the shared pool for the live database at ``path``."""
+    key = _pool_key(path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(path)
+        return pool
+
+
+def close_all_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -4,26 +4,62 @@ import tempfile
 import time
 import shutil as su
 import sqlite3 as s3
-from contextlib import closing
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing, contextmanager
 from typing import Iterable
 
+# Needed at import for the base class; watchdog.observers is imported when monitoring starts.
 from watchdog.events import FileSystemEventHandler
 from urllib.parse import urlparse
+from urllib.request import pathname2url
 
-from analytics import log_event
+from analytics import log_event, reclassify_insight
+from metrics import PIPELINE_METRICS, PipelineMetrics
+from mover import LINK_METHODS, MoveEngine, same_device
 from paths import get_config_file_path, get_domain_root
+from resolver import DeferredResolver
 
-_CONFIG_FILE = get_config_file_path()
-_CONFIG_DIR = os.path.dirname(_CONFIG_FILE)
+_config_file_path: str | None = None
 _EDGE_HISTORY_KEY = "edge_history_path"
 _DOWNLOAD_FOLDER_KEY = "download_folder"
+_ADDITIONAL_FOLDERS_KEY = "additional_download_folders"
 _AUTO_START_KEY = "auto_start_monitoring"
 _REFRESH_INTERVAL_KEY = "refresh_interval_seconds"
+_LOG_MAX_LINES_KEY = "log_max_lines"
+_LOG_SPILL_KEY = "log_spill_to_file"
+_METRICS_ENABLED_KEY = "metrics_enabled"
+_BACKFILL_KEY = "backfill_on_start"
+_ORGANIZE_MODE_KEY = "organize_mode"
+_RETENTION_DAYS_KEY = "retention_days"
+_RETENTION_MAX_ROWS_KEY = "retention_max_rows"
+ORGANIZE_MODES = ("move", "link")
+STABILIZE_SECONDS = 2
+LOOKUP_CHUNK_SIZE = 500
+MAX_PROFILE_WORKERS = 8
+PROGRESS_STEP_PERCENT = 25
+# History is copied into memory this many pages per backup step; Edge's lock
+# is only held for the duration of a step.
+SNAPSHOT_STEP_PAGES = 256
+SNAPSHOT_STEP_SLEEP_SECONDS = 0.005
+# Longest an in-place backup may take (kept busy or restarted by Edge) before the file is copied instead.
+SNAPSHOT_TIMEOUT_SECONDS = 5
+
+_discovery_lock = threading.Lock()
+_discovery_cache: tuple[tuple, list[str]] | None = None
+
+
+def _config_file() -> str:
+    """Resolve the config path on first use so importing this module has no side effects."""
+    global _config_file_path
+    if _config_file_path is None:
+        _config_file_path = get_config_file_path()
+    return _config_file_path
 
 
 def _load_settings() -> dict:
     try:
-        with open(_CONFIG_FILE, "r", encoding="utf-8") as handle:
+        with open(_config_file(), "r", encoding="utf-8") as handle:
             data = json.load(handle)
             if isinstance(data, dict):
                 return data
@@ -35,8 +71,9 @@ def _load_settings() -> dict:
 
 
 def _save_settings(settings: dict) -> None:
-    os.makedirs(_CONFIG_DIR, exist_ok=True)
-    with open(_CONFIG_FILE, "w", encoding="utf-8") as handle:
+    config_file = _config_file()
+    os.makedirs(os.path.dirname(config_file), exist_ok=True)
+    with open(config_file, "w", encoding="utf-8") as handle:
         json.dump(settings, handle, indent=2)
 
 
@@ -94,6 +131,41 @@ def set_saved_download_folder(path: str | None) -> None:
     _save_settings(settings)
 
 
+def get_saved_additional_folders() -> list[str]:
+    settings = _load_settings()
+    value = settings.get(_ADDITIONAL_FOLDERS_KEY)
+    if not isinstance(value, list):
+        return []
+    folders: list[str] = []
+    for path in value:
+        if isinstance(path, str) and path.strip():
+            folders.append(os.path.abspath(os.path.expanduser(path)))
+    return unique_folders(folders)
+
+
+def set_saved_additional_folders(paths: Iterable[str]) -> None:
+    settings = _load_settings()
+    folders = unique_folders(os.path.abspath(os.path.expanduser(path)) for path in paths if path)
+    if folders:
+        settings[_ADDITIONAL_FOLDERS_KEY] = folders
+    else:
+        settings.pop(_ADDITIONAL_FOLDERS_KEY, None)
+    _save_settings(settings)
+
+
+def unique_folders(folders: Iterable[str]) -> list[str]:
+    """Drop duplicate folders (compared case-insensitively where the OS is), keeping order."""
+    seen: set[str] = set()
+    result: list[str] = []
+    for folder in folders:
+        key = os.path.normcase(os.path.abspath(folder))
+        if key in seen:
+            continue
+        seen.add(key)
+        result.append(folder)
+    return result
+
+
 def get_auto_start_monitoring() -> bool:
     settings = _load_settings()
     value = settings.get(_AUTO_START_KEY)
@@ -132,6 +204,135 @@ def set_refresh_interval_seconds(seconds: int) -> None:
     _save_settings(settings)
 
 
+def get_log_max_lines(default: int = 2000) -> int:
+    settings = _load_settings()
+    value = settings.get(_LOG_MAX_LINES_KEY, default)
+    try:
+        lines = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(100, lines)
+
+
+def set_log_max_lines(lines: int) -> None:
+    settings = _load_settings()
+    settings[_LOG_MAX_LINES_KEY] = max(100, int(lines))
+    _save_settings(settings)
+
+
+def get_log_spill_enabled() -> bool:
+    settings = _load_settings()
+    value = settings.get(_LOG_SPILL_KEY)
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.strip().lower() in {"true", "1", "yes", "on"}
+    if isinstance(value, (int, float)):
+        return bool(value)
+    return False
+
+
+def set_log_spill_enabled(enabled: bool) -> None:
+    settings = _load_settings()
+    settings[_LOG_SPILL_KEY] = bool(enabled)
+    _save_settings(settings)
+
+
+def get_backfill_on_start() -> bool:
+    settings = _load_settings()
+    value = settings.get(_BACKFILL_KEY)
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.strip().lower() in {"true", "1", "yes", "on"}
+    if isinstance(value, (int, float)):
+        return bool(value)
+    return False
+
+
+def set_backfill_on_start(enabled: bool) -> None:
+    settings = _load_settings()
+    settings[_BACKFILL_KEY] = bool(enabled)
+    _save_settings(settings)
+
+
+def get_retention_days(default: int = 0) -> int:
+    settings = _load_settings()
+    value = settings.get(_RETENTION_DAYS_KEY, default)
+    try:
+        days = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(0, days)
+
+
+def set_retention_days(days: int) -> None:
+    settings = _load_settings()
+    settings[_RETENTION_DAYS_KEY] = max(0, int(days))
+    _save_settings(settings)
+
+
+def get_retention_max_rows(default: int = 0) -> int:
+    settings = _load_settings()
+    value = settings.get(_RETENTION_MAX_ROWS_KEY, default)
+    try:
+        rows = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(0, rows)
+
+
+def set_retention_max_rows(rows: int) -> None:
+    settings = _load_settings()
+    settings[_RETENTION_MAX_ROWS_KEY] = max(0, int(rows))
+    _save_settings(settings)
+
+
+def get_organize_mode() -> str:
+    settings = _load_settings()
+    value = settings.get(_ORGANIZE_MODE_KEY)
+    if isinstance(value, str) and value.strip().lower() in ORGANIZE_MODES:
+        return value.strip().lower()
+    return "move"
+
+
+def set_organize_mode(mode: str) -> None:
+    if mode not in ORGANIZE_MODES:
+        raise ValueError(f"Unknown organize mode: {mode}")
+    settings = _load_settings()
+    settings[_ORGANIZE_MODE_KEY] = mode
+    _save_settings(settings)
+
+
+def organize_event(method: str, is_duplicate: bool = False, source: str | None = None) -> str:
+    """Event name recorded for an organized file, e.g. ``Moved (duplicate)`` or ``Linked (backfill, reflink)``."""
+    details = [source] if source else []
+    if method in LINK_METHODS:
+        details.append(method)
+    if is_duplicate:
+        details.append("duplicate")
+    verb = "Linked" if method in LINK_METHODS else "Moved"
+    return f"{verb} ({', '.join(details)})" if details else verb
+
+
+def get_metrics_enabled() -> bool:
+    settings = _load_settings()
+    value = settings.get(_METRICS_ENABLED_KEY, True)
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.strip().lower() not in {"false", "0", "no", "off"}
+    if isinstance(value, (int, float)):
+        return bool(value)
+    return True
+
+
+def set_metrics_enabled(enabled: bool) -> None:
+    settings = _load_settings()
+    settings[_METRICS_ENABLED_KEY] = bool(enabled)
+    _save_settings(settings)
+
+
 def _profiles_from_local_state(local_state_path: str) -> list[str]:
     profiles: list[str] = []
     try:
@@ -186,8 +387,51 @@ def _candidate_user_data_dirs() -> Iterable[str]:
             yield normalized
 
 
-def auto_detect_edge_history_path() -> str | None:
-    for user_data_dir in _candidate_user_data_dirs():
+def _mtime_ns(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _discovery_signature(user_data_dirs: list[str]) -> tuple:
+    # Adding or removing a profile touches the User Data directory and Edge
+    # rewrites Local State whenever the profile list changes.
+    return tuple(
+        (user_data_dir, _mtime_ns(user_data_dir), _mtime_ns(os.path.join(user_data_dir, "Local State")))
+        for user_data_dir in user_data_dirs
+    )
+
+
+def list_edge_history_paths(refresh: bool = False) -> list[str]:
+    """Return the History database of every Edge profile, most relevant first.
+
+    The result is cached and only rediscovered when a User Data directory or
+    its Local State changes, a cached History file disappears, or ``refresh``
+    is set.
+    """
+    global _discovery_cache
+    user_data_dirs = list(_candidate_user_data_dirs())
+    signature = _discovery_signature(user_data_dirs)
+    with _discovery_lock:
+        cached = _discovery_cache
+    if (
+        not refresh
+        and cached is not None
+        and cached[0] == signature
+        and all(os.path.isfile(path) for path in cached[1])
+    ):
+        return list(cached[1])
+
+    history_paths = _discover_history_paths(user_data_dirs)
+    with _discovery_lock:
+        _discovery_cache = (signature, history_paths)
+    return list(history_paths)
+
+
+def _discover_history_paths(user_data_dirs: list[str]) -> list[str]:
+    history_paths: list[str] = []
+    for user_data_dir in user_data_dirs:
         local_state_path = os.path.join(user_data_dir, "Local State")
         profiles = _profiles_from_local_state(local_state_path)
 
@@ -210,9 +454,27 @@ def auto_detect_edge_history_path() -> str | None:
                 continue
             seen.add(profile)
             history_path = os.path.join(user_data_dir, profile, "History")
-            if os.path.isfile(history_path):
-                return history_path
-    return None
+            if os.path.isfile(history_path) and history_path not in history_paths:
+                history_paths.append(history_path)
+    return history_paths
+
+
+def auto_detect_edge_history_path(refresh: bool = False) -> str | None:
+    history_paths = list_edge_history_paths(refresh)
+    return history_paths[0] if history_paths else None
+
+
+def _history_signature(history_path: str) -> tuple:
+    """Size and mtime of a History database and its WAL, used to tell when a snapshot is stale."""
+    signature = []
+    for path in (history_path, f"{history_path}-wal"):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
 
 
 def get_edge_history_path() -> str:
@@ -228,6 +490,13 @@ def get_edge_history_path() -> str:
 
     raise FileNotFoundError("Unable to locate the Microsoft Edge history database.")
 
+def _is_duplicate_name(candidate_name, name, extension):
+    """True for ``name(N)extension``, the names duplicate renaming gives out."""
+    if not (candidate_name.startswith(name + "(") and candidate_name.endswith(")" + extension)):
+        return False
+    counter = candidate_name[len(name) + 1:len(candidate_name) - len(extension) - 1]
+    return counter.isdigit()
+
 def getWebsiteFolder(domain, download_folder):  # i now pass in download folder
     domain_root = get_domain_root(download_folder)
     target_folder = os.path.join(domain_root, domain)
@@ -235,10 +504,45 @@ def getWebsiteFolder(domain, download_folder):  # i now pass in download folder
     return target_folder
     
 class FileHandler(FileSystemEventHandler):
-    def __init__(self, download_folder, message_callback=None):
+    def __init__(
+        self,
+        download_folder,
+        message_callback=None,
+        metrics: PipelineMetrics | None = None,
+        edge_history_path: str | None = None,
+        stabilize_seconds: float = STABILIZE_SECONDS,
+        additional_folders: Iterable[str] = (),
+        organize_mode: str | None = None,
+    ):
         super().__init__()
         self.download_folder = download_folder
+        # One handler serves every watched folder; each event is attributed to the folder it arrived in.
+        self.download_folders = unique_folders([download_folder, *additional_folders])
+        self._folder_keys = {
+            os.path.normcase(os.path.abspath(folder)): folder for folder in self.download_folders
+        }
         self.message_callback = message_callback
+        self.metrics = metrics if metrics is not None else PIPELINE_METRICS
+        # An explicit History path bypasses the saved/auto-detected one (used by benchmarks).
+        self.edge_history_path = edge_history_path
+        self.stabilize_seconds = stabilize_seconds
+        # History path -> (signature, in-memory snapshot); an idle profile's
+        # copy is reused until its database or WAL changes.
+        self._profile_snapshots: dict[str, tuple[tuple, s3.Connection]] = {}
+        self._snapshot_lock = threading.Lock()
+        # Shared by every lookup; created on the first one that spans several profiles.
+        self._profile_executor: ThreadPoolExecutor | None = None
+        self.mover = MoveEngine()
+        # Picking a free destination name and reserving it happen under one
+        # lock, so the pipeline, backfill and the resolver never pick the same one.
+        self._plan_lock = threading.Lock()
+        self.organize_mode = organize_mode or get_organize_mode()
+        # Downloads History did not know yet are organized as unknown and looked up again later.
+        self.resolver = DeferredResolver(self)
+
+    def folder_for(self, file_path):
+        parent = os.path.normcase(os.path.abspath(os.path.dirname(file_path)))
+        return self._folder_keys.get(parent, self.download_folder)
 
     def _emit(self, message):
         if self.message_callback:
@@ -257,149 +561,515 @@ class FileHandler(FileSystemEventHandler):
             self.handle_renamed_file(event.dest_path)
 
     def handle_renamed_file(self, file_path):
+        metrics = self.metrics
+        started = time.perf_counter()
         try:
             while True:
                 if not os.path.exists(file_path):
                     return
                 initial_size = os.path.getsize(file_path)
-                time.sleep(2)
+                time.sleep(self.stabilize_seconds)
                 current_size = os.path.getsize(file_path)
 
                 if initial_size == current_size:
                     if not file_path.endswith((".tmp", ".crdownload")):
+                        metrics.record("stabilize", time.perf_counter() - started)
+                        download_folder = self.folder_for(file_path)
                         website = self.get_file_domain(file_path)
                         domain = self.extract_domain_from_url(website)
-                        final_path, is_duplicate = self.move_to_website_folder(file_path, domain)
-                        event_name = "Moved (duplicate)" if is_duplicate else "Moved"
-                        log_event(
-                            event_name,
-                            final_path,
-                            domain,
-                            self.download_folder,
-                            website,
-                            is_duplicate=is_duplicate,
-                        )
+                        if domain == "unknown_domain":
+                            metrics.increment("unknown_domain")
+                        # Only a failed lookup is retried; History may know the URL but not its host.
+                        deferred = website == "unknown_domain"
+                        target_folder = getWebsiteFolder(domain, download_folder)
+                        if not same_device(file_path, target_folder):
+                            self._move_in_background(file_path, domain, download_folder, website, started, deferred)
+                            return
+                        with metrics.timer("move"):
+                            final_path, is_duplicate, method = self.organize_to_website_folder(
+                                file_path, domain, download_folder
+                            )
+                        if method == "existing":
+                            return
+                        event_name = organize_event(method, is_duplicate)
+                        with metrics.timer("log"):
+                            log_event(
+                                event_name,
+                                final_path,
+                                domain,
+                                download_folder,
+                                website,
+                                is_duplicate=is_duplicate,
+                            )
+                        if deferred:
+                            self._defer(file_path, final_path, download_folder, method)
+                        metrics.increment("files")
+                        metrics.record("total", time.perf_counter() - started)
                     return
         except FileNotFoundError:
+            metrics.increment("errors")
             self._emit(f"File {file_path} not found")
         except Exception as e:
+            metrics.increment("errors")
             self._emit(f"Error with {file_path}: {e}")
     
-    def get_file_domain(self, file_path):
-        retries = 5
-        delay = 1  #seconds
-        for attempt in range(retries):
-            temp_db = None
+    def _move_in_background(self, file_path, domain, download_folder, website, started, deferred=False):
+        """Hand a cross-device move to the I/O worker and log it once the copy is durable."""
+        metrics = self.metrics
+        with self._plan_lock:
+            destination_path, is_duplicate = self._plan_destination(file_path, domain, download_folder)
+            self.mover.reserve(destination_path)
+        size = os.path.getsize(file_path)
+        self._emit(f"Copying {file_path} to {destination_path} ({size} bytes) across devices")
+        reported = [0]
+
+        def _progress(copied, total):
+            percent = copied * 100 // total if total else 100
+            if percent >= reported[0] + PROGRESS_STEP_PERCENT and percent < 100:
+                reported[0] = percent - percent % PROGRESS_STEP_PERCENT
+                self._emit(f"Copying {os.path.basename(file_path)}: {reported[0]}%")
+
+        move_started = time.perf_counter()
+
+        def _done(future):
             try:
-                temp_db = self.copy_edge_db_to_temp()
-                domain = self.query_url_from_db(temp_db, file_path)
-                if domain:
-                    return domain
-            except FileNotFoundError:
-                return "unknown_domain"
-            except s3.OperationalError as e:
-                if "database locked" in str(e):
-                    self._emit(f"Database is locked, retrying in {delay} seconds")
-                    time.sleep(delay)
-                    delay *= 2
-                else:
-                    self._emit(f"Error getting domain from Edge: {e}")
-                    return "unknown_domain"
+                future.result()
             except Exception as e:
-                self._emit(f"Error getting domain from Edge: {e}")
-                return "unknown_domain"
-            finally:
-                if temp_db and os.path.exists(temp_db):
-                    try:
-                        _remove_file_safely(temp_db)
-                    except PermissionError as error:
-                        self._emit(
-                            f"Failed to clean up temporary database {temp_db}: {error}"
-                        )
-        self._emit("Failed to get domain from Edge")
+                metrics.increment("errors")
+                self._emit(f"Failed to move {file_path}: {e}")
+                return
+            metrics.record("move", time.perf_counter() - move_started)
+            self._emit(f"Moved {file_path} to {destination_path}")
+            if is_duplicate:
+                self._emit("Duplicate detected. Adjusted filename to avoid overwrite.")
+            try:
+                with metrics.timer("log"):
+                    log_event(
+                        organize_event("copy", is_duplicate),
+                        destination_path,
+                        domain,
+                        download_folder,
+                        website,
+                        is_duplicate=is_duplicate,
+                    )
+            except Exception as e:
+                metrics.increment("errors")
+                self._emit(f"Error with {destination_path}: {e}")
+                return
+            if deferred:
+                self._defer(file_path, destination_path, download_folder, "copy")
+            metrics.increment("files")
+            metrics.record("total", time.perf_counter() - started)
+
+        try:
+            future = self.mover.submit(file_path, destination_path, _progress)
+        finally:
+            # submit holds its own reservation until the copy finishes.
+            self.mover.release(destination_path)
+        future.add_done_callback(_done)
+
+    def get_file_domain(self, file_path):
+        """Return the URL Edge recorded for ``file_path``, or ``unknown_domain`` without waiting.
+
+        A path missing from History, or a History that cannot be read right
+        now, is not retried here; :meth:`_defer` hands the organized file to
+        the resolver, which looks it up again once History has changed.
+        """
+        if self.resolver.is_known_missing(file_path):
+            return "unknown_domain"
+        state = self.history_state()
+        try:
+            url = self.resolve_url(file_path)
+        except FileNotFoundError:
+            return "unknown_domain"
+        except Exception as e:
+            self._emit(f"Error getting domain from Edge: {e}")
+            return "unknown_domain"
+        if url:
+            return url
+        self._emit(f"No entry found for: {file_path}")
+        self.resolver.remember_missing(file_path, state)
         return "unknown_domain"
 
-    def copy_edge_db_to_temp(self):
+    def history_state(self):
+        """Signatures of every profile's History and WAL; a lookup can only change when this does."""
+        try:
+            paths = [self.edge_history_path] if self.edge_history_path else [
+                get_edge_history_path(),
+                *list_edge_history_paths(),
+            ]
+        except FileNotFoundError:
+            return ()
+        return tuple(_history_signature(path) for path in dict.fromkeys(paths))
+
+    def _defer(self, file_path, placed_path, download_folder, method):
+        self.metrics.increment("deferred")
+        self.resolver.defer(file_path, placed_path, download_folder, method)
+
+    def reclassify(self, download, url):
+        """Move a deferred download out of ``unknown_domain`` and correct its insights row."""
+        domain = self.extract_domain_from_url(url)
+        if domain == "unknown_domain":
+            return
+        if not os.path.exists(download.placed_path):
+            self._emit(f"{download.placed_path} was moved away before its domain was found")
+            return
+        final_path, is_duplicate = self.move_to_website_folder(
+            download.placed_path, domain, download.download_folder
+        )
+        event_name = organize_event(download.method, is_duplicate, "resolved")
+        if not reclassify_insight(
+            download.download_folder, download.placed_path, final_path, domain, url, event_name, is_duplicate
+        ):
+            log_event(event_name, final_path, domain, download.download_folder, url, is_duplicate=is_duplicate)
+        self.metrics.increment("resolved")
+        self._emit(f"Resolved {os.path.basename(final_path)} to {domain}")
+
+    def history_paths(self):
+        """The configured History database first, then every other Edge profile's."""
+        if self.edge_history_path:
+            return [self.edge_history_path]
         try:
-            edge_downloads_db = get_edge_history_path()
+            primary = get_edge_history_path()
         except FileNotFoundError:
             self._emit(
                 "Edge history database not found. Configure the path from the Download Insights app settings."
             )
             raise
+        return [primary, *(path for path in list_edge_history_paths() if path != primary)]
+
+    def resolve_url(self, file_path):
+        """Look ``file_path`` up in every profile's History concurrently; the first hit wins.
+
+        Returns ``None`` when no profile knows the path. Errors only surface
+        when every profile failed, so one unreadable profile cannot hide a hit
+        in another.
+        """
+        history_paths = self.history_paths()
+        if len(history_paths) == 1:
+            return self._query_profile(history_paths[0], file_path)
+
+        errors = []
+        pool = self._profile_pool()
+        futures = [pool.submit(self._query_profile, path, file_path) for path in history_paths]
+        for future in as_completed(futures):
+            try:
+                url = future.result()
+            except (OSError, s3.Error) as e:
+                errors.append(e)
+                continue
+            if url:
+                # Slower profiles finish in the background and only refresh their cached snapshot.
+                for pending in futures:
+                    pending.cancel()
+                return url
+        if len(errors) == len(history_paths):
+            raise errors[0]
+        return None
 
-        fd, temp_db = tempfile.mkstemp(prefix="download_insights_edge_", suffix=".db")
-        os.close(fd)
-
-        try:
-            su.copy2(edge_downloads_db, temp_db)
-        except FileNotFoundError:
-            if os.path.exists(temp_db):
-                os.remove(temp_db)
+    def _profile_pool(self):
+        with self._snapshot_lock:
+            if self._profile_executor is None:
+                self._profile_executor = ThreadPoolExecutor(
+                    max_workers=MAX_PROFILE_WORKERS,
+                    thread_name_prefix="edge-profile",
+                )
+            return self._profile_executor
+
+    def _query_profile(self, history_path, file_path):
+        snapshot = self._profile_snapshot(history_path)
+        with self.metrics.timer("query"):
+            return self._query_url(snapshot, file_path)
+
+    def _profile_snapshot(self, history_path):
+        signature = _history_signature(history_path)
+        with self._snapshot_lock:
+            cached = self._profile_snapshots.get(history_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        with self.metrics.timer("snapshot"):
+            snapshot = self.snapshot_edge_db(history_path)
+        # A replaced snapshot is freed once the last lookup still using it returns.
+        with self._snapshot_lock:
+            self._profile_snapshots[history_path] = (signature, snapshot)
+        return snapshot
+
+    def close(self):
+        """Stop re-resolving, finish queued moves and release the per-profile History snapshots."""
+        self.resolver.close()
+        self.mover.shutdown(wait=True)
+        with self._snapshot_lock:
+            executor, self._profile_executor = self._profile_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        with self._snapshot_lock:
+            snapshots = [snapshot for _signature, snapshot in self._profile_snapshots.values()]
+            self._profile_snapshots.clear()
+        for snapshot in snapshots:
+            snapshot.close()
+
+    def _require_history_path(self, edge_downloads_db=None):
+        if edge_downloads_db is None:
+            try:
+                edge_downloads_db = self.edge_history_path or get_edge_history_path()
+            except FileNotFoundError:
+                self._emit(
+                    "Edge history database not found. Configure the path from the Download Insights app settings."
+                )
+                raise
+        if not os.path.isfile(edge_downloads_db):
             self._emit(
                 f"Edge history database is missing at {edge_downloads_db}. Update the path in settings to continue."
             )
-            raise
-        except Exception:
-            if os.path.exists(temp_db):
-                os.remove(temp_db)
-            raise
+            raise FileNotFoundError(edge_downloads_db)
+        return edge_downloads_db
+
+    def snapshot_edge_db(self, edge_downloads_db=None):
+        """Return a consistent in-memory copy of History, including rows still in its WAL.
+
+        History is opened read-only and copied with SQLite's online backup,
+        ``SNAPSHOT_STEP_PAGES`` pages per step, so Edge is never locked out
+        for long; a write by Edge mid-copy restarts the backup. When History
+        cannot be read in place, e.g. while Edge holds it exclusively, the
+        file and its WAL are copied and backed up from the copy instead.
+        """
+        edge_downloads_db = self._require_history_path(edge_downloads_db)
+        snapshot = s3.connect(":memory:", check_same_thread=False)
+        try:
+            deadline = time.monotonic() + SNAPSHOT_TIMEOUT_SECONDS
 
-        return temp_db
+            def _progress(_status, _remaining, _total):
+                # sqlite3 retries a busy step forever; give up so the copy fallback runs.
+                if time.monotonic() > deadline:
+                    raise s3.OperationalError("Edge history stayed locked during the snapshot")
 
-    def query_url_from_db(self, temp_db, file_path):
-        with closing(s3.connect(temp_db)) as conn:
-            cursor = conn.cursor()
             try:
-                cursor.execute("PRAGMA busy_timeout = 3000")
-                cursor.execute(
-                    """
-                    SELECT site_url, tab_url, tab_referrer_url
-                    FROM downloads
-                    WHERE target_path = ?
-                    """,
-                    (file_path,),
-                )
-                result = cursor.fetchone()
-                if result:
-                    for url in result:
-                        if url:
-                            return url
-            finally:
-                cursor.close()
+                with closing(
+                    s3.connect(f"file:{pathname2url(edge_downloads_db)}?mode=ro", uri=True, timeout=0.5)
+                ) as source:
+                    # Fails fast, within the busy timeout, while Edge holds an exclusive lock.
+                    source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                    source.backup(
+                        snapshot,
+                        pages=SNAPSHOT_STEP_PAGES,
+                        progress=_progress,
+                        sleep=SNAPSHOT_STEP_SLEEP_SECONDS,
+                    )
+            except s3.OperationalError:
+                self._snapshot_from_copy(edge_downloads_db, snapshot)
+        except BaseException:
+            snapshot.close()
+            raise
+        return snapshot
+
+    def _snapshot_from_copy(self, edge_downloads_db, snapshot):
+        temp_dir = tempfile.mkdtemp(prefix="download_insights_edge_")
+        copies = []
+        try:
+            # Opening the copy replays its WAL, so the snapshot still sees recent downloads.
+            for suffix in ("", "-wal"):
+                source = f"{edge_downloads_db}{suffix}"
+                if suffix and not os.path.exists(source):
+                    continue
+                copy = os.path.join(temp_dir, f"History{suffix}")
+                su.copy2(source, copy)
+                copies.append(copy)
+            with closing(s3.connect(copies[0])) as source:
+                source.backup(snapshot)
+        finally:
+            for path in (*copies, os.path.join(temp_dir, "History-shm")):
+                try:
+                    _remove_file_safely(path)
+                except PermissionError as error:
+                    self._emit(f"Failed to clean up temporary database {path}: {error}")
+            try:
+                os.rmdir(temp_dir)
+            except OSError:
+                pass
+
+    @contextmanager
+    def history_snapshot(self, edge_downloads_db=None):
+        """Yield an in-memory History snapshot and close it afterwards."""
+        with self.metrics.timer("snapshot"):
+            snapshot = self.snapshot_edge_db(edge_downloads_db)
+        try:
+            yield snapshot
+        finally:
+            snapshot.close()
+
+    def query_url_from_db(self, snapshot, file_path):
+        url = self._query_url(snapshot, file_path)
+        if url:
+            return url
         self._emit(f"No entry found for: {file_path}")
         return "unknown_domain"
 
+    def _query_url(self, snapshot, file_path):
+        cursor = snapshot.cursor()
+        try:
+            cursor.execute(
+                """
+                SELECT site_url, tab_url, tab_referrer_url
+                FROM downloads
+                WHERE target_path = ?
+                """,
+                (file_path,),
+            )
+            result = cursor.fetchone()
+            if result:
+                for url in result:
+                    if url:
+                        return url
+        finally:
+            cursor.close()
+        return None
+
+    def lookup_urls(self, file_paths):
+        """Resolve many target paths against a single History snapshot.
+
+        Returns a mapping of file path to download URL for the paths Edge knows
+        about; the newest downloads row wins when a path was downloaded twice,
+        and earlier profiles in :meth:`history_paths` win over later ones.
+        """
+        urls = {}
+        file_paths = list(file_paths)
+        if not file_paths:
+            return urls
+
+        try:
+            history_paths = self.history_paths()
+        except FileNotFoundError:
+            return urls
+        for history_path in history_paths:
+            pending = [path for path in file_paths if path not in urls]
+            if not pending:
+                break
+            self._lookup_profile_urls(history_path, pending, urls)
+        return urls
+
+    def _lookup_profile_urls(self, history_path, file_paths, urls):
+        try:
+            with self.history_snapshot(history_path) as conn:
+                with self.metrics.timer("query"):
+                    for start in range(0, len(file_paths), LOOKUP_CHUNK_SIZE):
+                        chunk = file_paths[start:start + LOOKUP_CHUNK_SIZE]
+                        placeholders = ", ".join("?" for _ in chunk)
+                        rows = conn.execute(
+                            f"""
+                            SELECT target_path, site_url, tab_url, tab_referrer_url
+                            FROM downloads
+                            WHERE target_path IN ({placeholders})
+                            ORDER BY id DESC
+                            """,
+                            chunk,
+                        )
+                        for target_path, *candidates in rows:
+                            url = next((candidate for candidate in candidates if candidate), None)
+                            if url:
+                                urls.setdefault(target_path, url)
+        except FileNotFoundError:
+            pass
+        except s3.Error as e:
+            self._emit(f"Error getting domains from Edge: {e}")
+
     def extract_domain_from_url(self, url):
         parsed_url = urlparse(url)
         if not parsed_url.hostname:
             return "unknown_domain"
         return parsed_url.hostname.replace('www.', '').split('.')[0]
 
-    def move_to_website_folder(self, file_path, domain):
+    def _plan_destination(self, file_path, domain, download_folder):
+        target_folder = getWebsiteFolder(domain, download_folder or self.download_folder) #requires download folder
+        original_name = os.path.basename(file_path)
+        destination_path = os.path.join(target_folder, original_name)
+
+        if os.path.abspath(file_path) == os.path.abspath(destination_path):
+            return destination_path, False
+
+        name, extension = os.path.splitext(original_name)
+        counter = 1
+        duplicate = False
+
+        # Queued cross-device moves count as taken even before their file exists.
+        while os.path.exists(destination_path) or self.mover.is_reserved(destination_path):
+            duplicate = True
+            candidate_name = f"{name}({counter}){extension}"
+            destination_path = os.path.join(target_folder, candidate_name)
+            counter += 1
+        return destination_path, duplicate
+
+    def _placed_copy(self, file_path, domain, download_folder):
+        """In link mode, the domain-folder entry that already holds this exact file, if any.
+
+        Besides the plain name, every ``name(N).ext`` that duplicate renaming
+        could have produced is checked, so a link placed under an adjusted
+        name is found again on the next backfill or reconcile.
+        """
+        target_folder = getWebsiteFolder(domain, download_folder or self.download_folder)
         try:
-            target_folder = getWebsiteFolder(domain, self.download_folder) #requires download folder
-            original_name = os.path.basename(file_path)
-            destination_path = os.path.join(target_folder, original_name)
+            source = os.stat(file_path)
+        except OSError:
+            return None
+        original_name = os.path.basename(file_path)
+        name, extension = os.path.splitext(original_name)
+        candidates = [original_name]
+        try:
+            with os.scandir(target_folder) as entries:
+                for entry in entries:
+                    if _is_duplicate_name(entry.name, name, extension):
+                        candidates.append(entry.name)
+        except OSError:
+            pass
+        for candidate_name in candidates:
+            candidate = os.path.join(target_folder, candidate_name)
+            try:
+                placed = os.stat(candidate)
+            except OSError:
+                continue
+            if (placed.st_dev, placed.st_ino) == (source.st_dev, source.st_ino):
+                return candidate
+            # Reflink clones are separate inodes; they keep the source's size and mtime.
+            if source.st_size == placed.st_size and source.st_mtime_ns == placed.st_mtime_ns:
+                return candidate
+        return None
 
-            if os.path.abspath(file_path) == os.path.abspath(destination_path):
-                return destination_path, False
+    def move_to_website_folder(self, file_path, domain, download_folder=None):
+        final_path, duplicate, _method = self._organize(file_path, domain, download_folder, "move")
+        return final_path, duplicate
 
-            name, extension = os.path.splitext(original_name)
-            counter = 1
-            duplicate = False
+    def organize_to_website_folder(self, file_path, domain, download_folder=None):
+        """Place a file according to ``organize_mode``.
 
-            while os.path.exists(destination_path):
-                duplicate = True
-                candidate_name = f"{name}({counter}){extension}"
-                destination_path = os.path.join(target_folder, candidate_name)
-                counter += 1
+        Returns ``(final_path, is_duplicate, method)`` where method is one of
+        ``rename``, ``copy``, ``hardlink``, ``reflink`` or ``existing`` when
+        the file was already organized and nothing was done.
+        """
+        return self._organize(file_path, domain, download_folder, self.organize_mode)
 
-            su.move(file_path, destination_path)
-            self._emit(f"Moved {file_path} to {destination_path}")
+    def _organize(self, file_path, domain, download_folder, mode):
+        try:
+            if mode == "link":
+                placed = self._placed_copy(file_path, domain, download_folder)
+                if placed:
+                    return placed, False, "existing"
+
+            with self._plan_lock:
+                destination_path, duplicate = self._plan_destination(file_path, domain, download_folder)
+                if os.path.abspath(file_path) == os.path.abspath(destination_path):
+                    return destination_path, False, "existing"
+                self.mover.reserve(destination_path)
+            try:
+                method = self.mover.place(file_path, destination_path, mode)
+            finally:
+                self.mover.release(destination_path)
+            if method in LINK_METHODS:
+                self._emit(f"Linked {file_path} to {destination_path} ({method})")
+            else:
+                self._emit(f"Moved {file_path} to {destination_path}")
             if duplicate:
                 self._emit("Duplicate detected. Adjusted filename to avoid overwrite.")
-            return destination_path, duplicate
+            return destination_path, duplicate, method
         except Exception as e:
             self._emit(f"Failed to move {file_path}: {e}")
             raise
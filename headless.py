@@ -0,0 +1,480 @@
+"""Command line entry point that runs Download Insights without the Tk interface.
+
+Usage::
+
+    python -m headless monitor [--folder PATH ...] [--backfill]
+    python -m headless status [--folder PATH]
+    python -m headless export DESTINATION [--folder PATH] [--start DATE] [--end DATE]
+    python -m headless stats [--folder PATH] [--json]
+    python -m headless reconcile [--folder PATH] [--batch-size N]
+    python -m headless maintain [--folder PATH] [--compact]
+    python -m headless backup DESTINATION [--folder PATH]
+    python -m headless import SOURCE [--folder PATH] [--format csv|jsonl] [--workers N]
+    python -m headless analysis DESTINATION [--folder PATH] [--xlsx]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from datetime import date, datetime
+
+from analytics import (
+    IMPORT_FORMATS,
+    export_insights_to_csv,
+    get_database_path,
+    get_latest_entry_id,
+    import_insights,
+    initialize_log_file,
+    list_partitions,
+    summarize_insights,
+)
+from dbpool import close_all_pools
+from fileHandler import (
+    get_backfill_on_start,
+    get_metrics_enabled,
+    get_retention_days,
+    get_retention_max_rows,
+    get_saved_additional_folders,
+    get_saved_download_folder,
+    get_saved_edge_history_path,
+    unique_folders,
+)
+from metrics import PIPELINE_METRICS
+from partitions import backup_insights
+from paths import get_analytics_dir
+from reconcile import RECONCILE_BATCH_SIZE, reconcile_history
+from report import export_download_analysis, export_download_analysis_xlsx
+from retention import IdleMaintenance, optimize_database, run_maintenance
+
+DEFAULT_DOWNLOAD_FOLDER = os.path.join(os.path.expanduser("~"), "Downloads")
+STATUS_FILE_NAME = "monitor_status.json"
+HEARTBEAT_INTERVAL_SECONDS = 15
+
+
+def _emit(message: str) -> None:
+    timestamp = time.strftime("%H:%M:%S")
+    print(f"[{timestamp}] {message}", flush=True)
+
+
+def _resolve_folder(folder: str | None) -> str:
+    if folder:
+        return os.path.abspath(os.path.expanduser(folder))
+    return get_saved_download_folder() or DEFAULT_DOWNLOAD_FOLDER
+
+
+def _status_file(folder: str) -> str:
+    return os.path.join(get_analytics_dir(folder), STATUS_FILE_NAME)
+
+
+def _write_status(folder: str, started_at: str, state: str) -> None:
+    payload = {
+        "pid": os.getpid(),
+        "folder": folder,
+        "state": state,
+        "started_at": started_at,
+        "heartbeat": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "metrics": PIPELINE_METRICS.snapshot(),
+    }
+    path = _status_file(folder)
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+def _read_status(folder: str) -> dict | None:
+    try:
+        with open(_status_file(folder), "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def run_monitor(folders: list[str], backfill: bool = False) -> int:
+    """Watch ``folders`` until SIGINT/SIGTERM, organizing and logging downloads.
+
+    All folders share one observer and one :class:`FileHandler`; the status
+    file is kept next to the first folder's analytics. With ``backfill`` the
+    files already sitting in the folders are organized in the background.
+    """
+    from watchdog.observers import Observer
+
+    from backfill import progress_reporter, run_backfill
+    from fileHandler import FileHandler
+
+    existing = []
+    for folder in folders:
+        if os.path.isdir(folder):
+            existing.append(folder)
+        else:
+            _emit(f"The folder '{folder}' does not exist or is not accessible.")
+    if not existing:
+        return 2
+    folder = existing[0]
+
+    for monitored in existing:
+        initialize_log_file(monitored)
+    PIPELINE_METRICS.enabled = get_metrics_enabled()
+
+    stop_event = threading.Event()
+
+    def _request_stop(signum, _frame) -> None:
+        _emit(f"Received signal {signum}, stopping download monitor...")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+    if hasattr(signal, "SIGBREAK"):
+        signal.signal(signal.SIGBREAK, _request_stop)
+
+    started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    observer = Observer()
+    handler = FileHandler(folder, _emit, additional_folders=existing[1:])
+    try:
+        for monitored in existing:
+            observer.schedule(handler, monitored, recursive=False)
+        observer.start()
+        for monitored in existing:
+            _emit(f"Started monitoring {monitored}")
+        _write_status(folder, started_at, "running")
+        if backfill:
+            def _backfill() -> None:
+                for monitored in existing:
+                    if stop_event.is_set():
+                        return
+                    run_backfill(
+                        handler,
+                        monitored,
+                        stop_event=stop_event,
+                        progress=progress_reporter(_emit, monitored),
+                    )
+
+            threading.Thread(target=_backfill, name="backfill", daemon=True).start()
+
+        maintenance = IdleMaintenance()
+        latest_ids = [get_latest_entry_id(monitored) for monitored in existing]
+
+        def _maintain() -> None:
+            try:
+                for monitored in existing:
+                    if stop_event.is_set():
+                        return
+                    result = run_maintenance(monitored, get_retention_days(), get_retention_max_rows())
+                    if result.sealed:
+                        _emit(f"Sealed {result.sealed} insights into monthly partitions")
+                    if result.archived:
+                        _emit(f"Archived {result.archived} insights to {result.archive_path}")
+            except (OSError, sqlite3.Error) as exc:
+                _emit(f"Database maintenance failed: {exc}")
+            finally:
+                maintenance.finish()
+
+        while not stop_event.wait(HEARTBEAT_INTERVAL_SECONDS):
+            if not observer.is_alive():
+                _emit("Monitoring stopped unexpectedly: the file observer exited.")
+                return 1
+            _write_status(folder, started_at, "running")
+            current_ids = [get_latest_entry_id(monitored) for monitored in existing]
+            if current_ids != latest_ids:
+                latest_ids = current_ids
+                maintenance.touch()
+            elif maintenance.begin():
+                threading.Thread(target=_maintain, name="maintenance", daemon=True).start()
+    finally:
+        observer.stop()
+        observer.join()
+        handler.close()
+        close_all_pools()
+        _write_status(folder, started_at, "stopped")
+        _emit("Monitoring stopped.")
+    return 0
+
+
+def show_status(folder: str) -> int:
+    database_path = get_database_path(folder)
+    edge_history = get_saved_edge_history_path()
+    if edge_history is None:
+        from fileHandler import auto_detect_edge_history_path
+
+        detected = auto_detect_edge_history_path()
+        edge_history = f"{detected} (auto-detected)" if detected else "Not found"
+
+    print(f"Download folder: {folder}")
+    print(f"Insights database: {database_path}")
+    print(f"Edge history database: {edge_history}")
+    print(f"Recorded insights: {get_latest_entry_id(folder)}")
+    print(f"Sealed monthly partitions: {len(list_partitions(folder))}")
+
+    status = _read_status(folder)
+    if status is None:
+        print("Monitor: never started headless")
+        return 0
+
+    state = status.get("state", "unknown")
+    heartbeat = status.get("heartbeat")
+    if state == "running" and heartbeat:
+        try:
+            age = (datetime.now() - datetime.strptime(heartbeat, "%Y-%m-%d %H:%M:%S")).total_seconds()
+        except ValueError:
+            age = None
+        if age is None or age > HEARTBEAT_INTERVAL_SECONDS * 3:
+            state = "stale (no recent heartbeat)"
+    print(f"Monitor: {state} (pid {status.get('pid')}, started {status.get('started_at')}, last heartbeat {heartbeat})")
+
+    metrics = status.get("metrics")
+    if isinstance(metrics, dict) and metrics.get("enabled"):
+        counters = metrics.get("counters", {})
+        total = metrics.get("stages", {}).get("total", {})
+        print(
+            f"Pipeline: {counters.get('files', 0)} files, "
+            f"{counters.get('unknown_domain', 0)} unknown domain, "
+            f"{counters.get('deferred', 0)} deferred ({counters.get('resolved', 0)} resolved later), "
+            f"p50 {total.get('p50_ms', 0):.0f} ms, p95 {total.get('p95_ms', 0):.0f} ms"
+        )
+    return 0
+
+
+def show_stats(folder: str, as_json: bool) -> int:
+    summary = summarize_insights(folder)
+    if as_json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    print(f"Total files: {summary['total_files']}")
+    print(f"Total size: {summary['total_size']} bytes")
+    print(f"Duplicates: {summary['duplicates']}")
+    print(f"First download: {summary['first_timestamp'] or '-'}")
+    print(f"Last download: {summary['last_timestamp'] or '-'}")
+    domains = summary["domains"]
+    if domains:
+        print("Top domains:")
+        for entry in domains:
+            print(f"  {entry['domain']:<30} {entry['files']:>8} files {entry['size']:>14} bytes")
+    return 0
+
+
+def run_reconcile(folder: str, batch_size: int) -> int:
+    from fileHandler import FileHandler
+
+    if not os.path.isdir(folder):
+        _emit(f"The folder '{folder}' does not exist or is not accessible.")
+        return 2
+
+    stop_event = threading.Event()
+
+    def _request_stop(signum, _frame) -> None:
+        _emit(f"Received signal {signum}, stopping after the current batch...")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+
+    def _progress(result) -> None:
+        _emit(f"Batch {result.batches}: {result.moved} moved, {result.examined} examined")
+
+    handler = FileHandler(folder, _emit)
+    try:
+        result = reconcile_history(handler, folder, stop_event=stop_event, progress=_progress, batch_size=batch_size)
+    finally:
+        handler.close()
+        close_all_pools()
+    return 1 if result.failed else 0
+
+
+def run_maintain(folder: str, compact: bool) -> int:
+    if not os.path.exists(get_database_path(folder)):
+        _emit(f"No insights database found for '{folder}'.")
+        return 2
+    result = run_maintenance(folder, get_retention_days(), get_retention_max_rows())
+    if compact:
+        result.reclaimed_pages += optimize_database(folder, compact=True)
+    if result.sealed:
+        _emit(f"Sealed {result.sealed} insights into monthly partitions")
+    if result.archived:
+        _emit(f"Archived {result.archived} insights to {result.archive_path}")
+    _emit(f"Maintenance finished: {result.reclaimed_pages} pages reclaimed")
+    return 0
+
+
+def export_csv(folder: str, destination: str, start: date | None = None, end: date | None = None) -> int:
+    destination = os.path.abspath(os.path.expanduser(destination))
+    export_insights_to_csv(folder, destination, start, end)
+    print(f"Insights exported to {destination}")
+    return 0
+
+
+def export_analysis(folder: str, destination: str, as_xlsx: bool) -> int:
+    destination = os.path.abspath(os.path.expanduser(destination))
+    if as_xlsx:
+        rows = export_download_analysis_xlsx(folder, destination)
+        print(f"Download analysis and {rows} data rows written to {destination}")
+    else:
+        for path in export_download_analysis(folder, destination):
+            print(f"Download analysis written to {path}")
+    return 0
+
+
+def run_backup(folder: str, destination: str) -> int:
+    destination = os.path.abspath(os.path.expanduser(destination))
+    if not os.path.exists(get_database_path(folder)):
+        _emit(f"No insights database found for '{folder}'.")
+        return 2
+    result = backup_insights(folder, destination)
+    print(f"Backed up {len(result.copied)} file(s) to {destination}, {result.unchanged} partition(s) unchanged")
+    return 0
+
+
+def run_import(folder: str, source: str, file_format: str | None, workers: int) -> int:
+    source = os.path.abspath(os.path.expanduser(source))
+    if not os.path.isfile(source):
+        _emit(f"The file '{source}' does not exist or is not accessible.")
+        return 2
+    started = time.perf_counter()
+    result = import_insights(folder, source, file_format, workers=workers)
+    _emit(
+        f"Imported {result.imported} of {result.read} records in {time.perf_counter() - started:.1f}s "
+        f"({result.duplicates} duplicates, {result.rejected} rejected)"
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="download-insights",
+        description="Run and inspect Download Insights without the graphical interface.",
+    )
+    folder_parent = argparse.ArgumentParser(add_help=False)
+    folder_parent.add_argument(
+        "--folder",
+        help="Download folder to use (defaults to the folder saved in the app settings).",
+    )
+
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    monitor_parser = subcommands.add_parser("monitor", help="Organize downloads until interrupted.")
+    monitor_parser.add_argument(
+        "--folder",
+        action="append",
+        help="Folder to watch; repeat for several (defaults to the folders saved in the app settings).",
+    )
+    monitor_parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Organize files that arrived while the monitor was off (also enabled by the app setting).",
+    )
+    subcommands.add_parser("status", parents=[folder_parent], help="Show configuration and monitor state.")
+
+    export_parser = subcommands.add_parser("export", parents=[folder_parent], help="Export insights to CSV.")
+    export_parser.add_argument("destination", help="Path of the CSV file to write.")
+    export_parser.add_argument("--start", type=date.fromisoformat, help="First day to export (YYYY-MM-DD).")
+    export_parser.add_argument("--end", type=date.fromisoformat, help="Last day to export (YYYY-MM-DD).")
+
+    stats_parser = subcommands.add_parser("stats", parents=[folder_parent], help="Print summary statistics.")
+    stats_parser.add_argument("--json", action="store_true", help="Print the statistics as JSON.")
+
+    reconcile_parser = subcommands.add_parser(
+        "reconcile",
+        parents=[folder_parent],
+        help="Organize every file in Edge's download history that is not yet recorded.",
+    )
+    reconcile_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=RECONCILE_BATCH_SIZE,
+        help="Files moved and logged per database transaction.",
+    )
+
+    maintain_parser = subcommands.add_parser(
+        "maintain",
+        parents=[folder_parent],
+        help="Archive insights past the retention limits and optimize the database.",
+    )
+    maintain_parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Rebuild the whole database file instead of releasing free pages incrementally.",
+    )
+
+    analysis_parser = subcommands.add_parser(
+        "analysis",
+        parents=[folder_parent],
+        help="Export the precomputed Download Analysis for the Excel workbook.",
+    )
+    analysis_parser.add_argument(
+        "destination",
+        help="Directory for the summary, domain and extension CSV files, or the .xlsx file with --xlsx.",
+    )
+    analysis_parser.add_argument(
+        "--xlsx",
+        action="store_true",
+        help="Write one workbook with the Data and Download Analysis sheets instead.",
+    )
+
+    backup_parser = subcommands.add_parser(
+        "backup",
+        parents=[folder_parent],
+        help="Back up the insights database, copying only partitions that changed.",
+    )
+    backup_parser.add_argument("destination", help="Directory that receives the backup.")
+
+    import_parser = subcommands.add_parser(
+        "import",
+        parents=[folder_parent],
+        help="Bulk import download events from a CSV (template layout) or JSON lines file.",
+    )
+    import_parser.add_argument("source", help="File to import.")
+    import_parser.add_argument(
+        "--format",
+        choices=IMPORT_FORMATS,
+        help="File format (defaults to the file extension: .jsonl/.ndjson/.json or CSV).",
+    )
+    import_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes that parse the file in parallel.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command == "monitor":
+        if args.folder:
+            folders = [_resolve_folder(folder) for folder in args.folder]
+        else:
+            folders = [_resolve_folder(None), *get_saved_additional_folders()]
+        return run_monitor(unique_folders(folders), backfill=args.backfill or get_backfill_on_start())
+
+    folder = _resolve_folder(args.folder)
+    if args.command == "status":
+        return show_status(folder)
+    if args.command == "export":
+        return export_csv(folder, args.destination, args.start, args.end)
+    if args.command == "stats":
+        return show_stats(folder, args.json)
+    if args.command == "reconcile":
+        return run_reconcile(folder, args.batch_size)
+    if args.command == "maintain":
+        return run_maintain(folder, args.compact)
+    if args.command == "analysis":
+        return export_analysis(folder, args.destination, args.xlsx)
+    if args.command == "backup":
+        return run_backup(folder, args.destination)
+    if args.command == "import":
+        return run_import(folder, args.source, args.format, args.workers)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
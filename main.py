@@ -1,43 +1,106 @@
+import time
+_PROCESS_START = time.perf_counter()
+
 import os
 import queue
 import threading
-import time
 import tkinter as tk
 import sqlite3
-from collections import defaultdict
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 from tkinter import filedialog, messagebox, scrolledtext, ttk
+from typing import TYPE_CHECKING
 
-from watchdog.observers import Observer
-
+from activityLog import DEFAULT_MAX_LINES, ActivityLogSink
+from aggregation import daily_domain_counts, recent_date_range
 from analytics import (
     EXPECTED_HEADER,
+    SORTABLE_COLUMNS,
+    aggregate_insights,
     export_insights_to_csv,
-    fetch_insights,
+    fetch_insights_page,
+    get_data_version,
     get_database_path,
     get_latest_entry_id,
     initialize_log_file,
+    search_insights,
+    summarize_insights,
 )
+from backfill import progress_reporter, run_backfill
+from chart import ChartFrame, StackedBarChart
+from dbpool import close_all_pools
 from fileHandler import (
     FileHandler,
     auto_detect_edge_history_path,
     get_auto_start_monitoring,
+    get_backfill_on_start,
+    get_log_max_lines,
+    get_log_spill_enabled,
+    get_metrics_enabled,
+    get_organize_mode,
     get_refresh_interval_seconds,
+    get_retention_days,
+    get_retention_max_rows,
+    get_saved_additional_folders,
     get_saved_download_folder,
     get_saved_edge_history_path,
     set_auto_start_monitoring,
+    set_backfill_on_start,
+    set_log_max_lines,
+    set_log_spill_enabled,
+    set_metrics_enabled,
+    set_organize_mode,
     set_refresh_interval_seconds,
+    set_retention_days,
+    set_retention_max_rows,
+    set_saved_additional_folders,
     set_saved_download_folder,
     set_saved_edge_history_path,
 )
+from metrics import PIPELINE_METRICS, STAGES
+from paths import get_activity_log_path
+from report import export_download_analysis_xlsx
+from retention import IdleMaintenance, run_maintenance
+
+if TYPE_CHECKING:
+    from watchdog.observers import Observer
 
 DEFAULT_DOWNLOAD_FOLDER = os.path.join(os.path.expanduser("~"), "Downloads")
 DEFAULT_REFRESH_INTERVAL_SECONDS = 4
 LOG_POLL_INTERVAL_MS = 250
+SEARCH_PAGE_SIZE = 100
+INSIGHTS_PAGE_SIZE = 200
+
+
+class StartupReport:
+    """Record how long each startup stage took, measured from process start.
+
+    The first stage includes ``watchdog.events``, which fileHandler imports
+    for its handler base class; only ``watchdog.observers`` waits until
+    monitoring starts.
+    """
+
+    def __init__(self, origin: float) -> None:
+        self.origin = origin
+        self._last = origin
+        self.stages: list[tuple[str, float]] = []
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stages.append((stage, (now - self._last) * 1000))
+        self._last = now
+
+    def total_ms(self) -> float:
+        return (self._last - self.origin) * 1000
+
+    def summary(self) -> str:
+        parts = ", ".join(f"{stage} {elapsed:.0f} ms" for stage, elapsed in self.stages)
+        return f"Started in {self.total_ms():.0f} ms ({parts})"
 
 
 class DownloadInsightsApp:
     def __init__(self, root: tk.Tk) -> None:
+        self.startup_report = StartupReport(_PROCESS_START)
+        self.startup_report.mark("imports and Tk init")
         self.root = root
         self.root.title("Download Insights")
         self.root.minsize(960, 640)
@@ -45,6 +108,7 @@ class DownloadInsightsApp:
 
         self.style = ttk.Style()
         self._setup_styles()
+        self.startup_report.mark("styles")
 
         self.path_var = tk.StringVar()
         saved_download_folder = get_saved_download_folder()
@@ -53,24 +117,39 @@ class DownloadInsightsApp:
         elif os.path.isdir(DEFAULT_DOWNLOAD_FOLDER):
             self.path_var.set(DEFAULT_DOWNLOAD_FOLDER)
 
+        self.additional_folders: list[str] = get_saved_additional_folders()
+
         self.log_queue: "queue.Queue[str]" = queue.Queue()
         self.monitor_thread: threading.Thread | None = None
-        self.observer: Observer | None = None
+        self.observer: "Observer | None" = None
         self.stop_event = threading.Event()
         self.monitoring = False
         self.last_entry_id: int = 0
+        self.last_data_version: int = 0
         self.tree_columns: list[str] = []
         self.canvas: tk.Canvas | None = None
         self.canvas_window: int | None = None
+        self.chart: StackedBarChart | None = None
 
         self.auto_start_var = tk.BooleanVar(value=get_auto_start_monitoring())
         self.refresh_interval_ms = max(
             1000, get_refresh_interval_seconds(DEFAULT_REFRESH_INTERVAL_SECONDS) * 1000
         )
         self.refresh_job: str | None = None
+        self.log_max_lines = get_log_max_lines(DEFAULT_MAX_LINES)
+        self.log_spill_enabled = get_log_spill_enabled()
+        self.backfill_on_start = get_backfill_on_start()
+        self.organize_mode = get_organize_mode()
+        self.retention_days = get_retention_days()
+        self.retention_max_rows = get_retention_max_rows()
+        self.maintenance = IdleMaintenance()
+        self.log_sink: ActivityLogSink | None = None
         self.settings_window: tk.Toplevel | None = None
 
-        self.insights_data: list[dict[str, str]] = []
+        self.data_first_timestamp: str | None = None
+        self.data_last_timestamp: str | None = None
+        self._chart_totals_key: tuple[object, ...] | None = None
+        self._chart_totals: list[dict[str, object]] = []
         self.domain_colors: dict[str, str] = {}
         self.custom_date_range = False
         self._color_palette = [
@@ -92,9 +171,21 @@ class DownloadInsightsApp:
         self.total_files_var = tk.StringVar(value="0")
         self.total_size_var = tk.StringVar(value="0 B")
         self.total_duplicates_var = tk.StringVar(value="0")
+        self.breakdown_var = tk.StringVar(value="Domain")
         self.start_date_var = tk.StringVar()
         self.end_date_var = tk.StringVar()
         self.range_error_var = tk.StringVar(value="")
+        self.search_var = tk.StringVar()
+        self.page_status_var = tk.StringVar(value="")
+        self.search_query = ""
+        self.search_page = 0
+        self.sort_column = "Timestamp"
+        self.sort_descending = True
+        self.page_cursors: list[tuple[object, int] | None] = [None]
+        self.next_page_cursor: tuple[object, int] | None = None
+        PIPELINE_METRICS.enabled = get_metrics_enabled()
+        self.metrics_enabled_var = tk.BooleanVar(value=PIPELINE_METRICS.enabled)
+        self.metrics_summary_var = tk.StringVar(value="")
 
         self.edge_history_var = tk.StringVar()
         self.edge_history_auto = tk.BooleanVar(value=False)
@@ -103,10 +194,9 @@ class DownloadInsightsApp:
             self.edge_history_var.set(saved_edge_history)
             self.edge_history_auto.set(False)
         else:
-            detected_edge_history = auto_detect_edge_history_path()
-            if detected_edge_history:
-                self.edge_history_var.set(detected_edge_history)
+            # Scanning Edge profiles can be slow; do it off the UI thread so the window appears at once.
             self.edge_history_auto.set(True)
+            threading.Thread(target=self._detect_edge_history_in_background, daemon=True).start()
 
         self.path_summary_var = tk.StringVar()
         self.edge_summary_var = tk.StringVar()
@@ -118,9 +208,11 @@ class DownloadInsightsApp:
         self.edge_history_auto.trace_add("write", lambda *_: self._refresh_settings_summary())
 
         self._refresh_settings_summary()
+        self.startup_report.mark("settings")
 
         self._build_layout()
-        self._update_data_source(self.path_var.get())
+        self.startup_report.mark("layout")
+        self.root.after(0, self._finish_startup)
 
         self.root.after(LOG_POLL_INTERVAL_MS, self._process_log_queue)
         self._schedule_refresh()
@@ -128,6 +220,27 @@ class DownloadInsightsApp:
 
         self.root.after(300, self._auto_start_if_enabled)
 
+    def _finish_startup(self) -> None:
+        self.root.update_idletasks()
+        self.startup_report.mark("first paint")
+        self._update_data_source(self.path_var.get())
+        self.startup_report.mark("insights load")
+        self._queue_message(self.startup_report.summary())
+
+    def _detect_edge_history_in_background(self) -> None:
+        started = time.perf_counter()
+        detected = auto_detect_edge_history_path()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        try:
+            self.root.after(0, lambda: self._on_edge_history_detected(detected, elapsed_ms))
+        except (RuntimeError, tk.TclError):
+            pass
+
+    def _on_edge_history_detected(self, detected: str | None, elapsed_ms: float) -> None:
+        if detected and self.edge_history_auto.get() and not (self.edge_history_var.get() or "").strip():
+            self.edge_history_var.set(detected)
+        self._queue_message(f"Edge history detection finished in {elapsed_ms:.0f} ms (background)")
+
     # ------------------------------------------------------------------
     # UI construction & styling
     # ------------------------------------------------------------------
@@ -261,12 +374,15 @@ class DownloadInsightsApp:
 
         insights_tab = ttk.Frame(self.notebook, style="Card.TFrame", padding=24)
         analytics_tab = ttk.Frame(self.notebook, style="Card.TFrame", padding=24)
+        diagnostics_tab = ttk.Frame(self.notebook, style="Card.TFrame", padding=24)
 
         self.notebook.add(insights_tab, text="Insights")
         self.notebook.add(analytics_tab, text="Analytics")
+        self.notebook.add(diagnostics_tab, text="Diagnostics")
 
         self._build_insights_tab(insights_tab)
         self._build_analytics_tab(analytics_tab)
+        self._build_diagnostics_tab(diagnostics_tab)
 
         log_card = ttk.Frame(content, style="Card.TFrame", padding=24)
         log_card.pack(fill="both", expand=True, pady=(24, 0))
@@ -282,9 +398,18 @@ class DownloadInsightsApp:
         self.log_text.configure(background="#151624", foreground="#e2e8f0", insertbackground="#f8fafc", borderwidth=0, highlightthickness=0)
         self.log_text.configure(state="disabled")
 
+        self.log_sink = ActivityLogSink(
+            self.log_text,
+            self.log_queue,
+            max_lines=self.log_max_lines,
+            spill_path=get_activity_log_path() if self.log_spill_enabled else None,
+        )
+
     def _refresh_settings_summary(self) -> None:
         folder = (self.path_var.get() or "").strip()
-        if folder:
+        if folder and self.additional_folders:
+            self.path_summary_var.set(f"{folder} (+{len(self.additional_folders)} more)")
+        elif folder:
             self.path_summary_var.set(folder)
         else:
             self.path_summary_var.set("Not configured")
@@ -353,6 +478,14 @@ class DownloadInsightsApp:
         )
         export_button.pack(side="right")
 
+        workbook_button = ttk.Button(
+            header_row,
+            text="Download Excel",
+            command=self._export_download_analysis,
+            style="TButton",
+        )
+        workbook_button.pack(side="right", padx=(0, 8))
+
         insights_subheader = ttk.Label(
             parent,
             text="Review captured download events without leaving the application.",
@@ -360,6 +493,38 @@ class DownloadInsightsApp:
         )
         insights_subheader.pack(anchor="w", pady=(4, 12))
 
+        search_row = ttk.Frame(parent, style="Card.TFrame")
+        search_row.pack(fill="x", pady=(0, 12))
+
+        search_entry = ttk.Entry(search_row, textvariable=self.search_var, style="Modern.TEntry")
+        search_entry.pack(side="left", fill="x", expand=True)
+        search_entry.bind("<Return>", lambda event: self._run_search())
+
+        search_button = ttk.Button(search_row, text="Search", command=self._run_search)
+        search_button.pack(side="left", padx=(12, 0))
+
+        clear_button = ttk.Button(search_row, text="Clear", command=self._clear_search)
+        clear_button.pack(side="left", padx=(12, 0))
+
+        self.next_page_button = ttk.Button(
+            search_row,
+            text="Next",
+            command=lambda: self._change_page(1),
+            state="disabled",
+        )
+        self.next_page_button.pack(side="right")
+
+        self.prev_page_button = ttk.Button(
+            search_row,
+            text="Previous",
+            command=lambda: self._change_page(-1),
+            state="disabled",
+        )
+        self.prev_page_button.pack(side="right", padx=(12, 12))
+
+        search_status = ttk.Label(search_row, textvariable=self.page_status_var, style="Status.TLabel")
+        search_status.pack(side="right", padx=(12, 0))
+
         tree_frame = ttk.Frame(parent, style="Card.TFrame")
         tree_frame.pack(fill="both", expand=True)
 
@@ -415,8 +580,24 @@ class DownloadInsightsApp:
         domain_frame = ttk.Frame(parent, style="Card.TFrame")
         domain_frame.pack(fill="both", expand=True, pady=(24, 0))
 
-        domain_header = ttk.Label(domain_frame, text="Per domain details", style="Subheading.TLabel")
-        domain_header.pack(anchor="w")
+        domain_header_row = ttk.Frame(domain_frame, style="Card.TFrame")
+        domain_header_row.pack(fill="x")
+
+        domain_header = ttk.Label(domain_header_row, text="Per domain details", style="Subheading.TLabel")
+        domain_header.pack(side="left")
+
+        breakdown_box = ttk.Combobox(
+            domain_header_row,
+            textvariable=self.breakdown_var,
+            values=("Domain", "File Type"),
+            state="readonly",
+            width=12,
+        )
+        breakdown_box.pack(side="right")
+        breakdown_box.bind("<<ComboboxSelected>>", lambda event: self._on_breakdown_changed(domain_header))
+
+        breakdown_label = ttk.Label(domain_header_row, text="Group by", style="TLabel")
+        breakdown_label.pack(side="right", padx=(0, 6))
 
         domain_tree_container = ttk.Frame(domain_frame, style="Card.TFrame")
         domain_tree_container.pack(fill="both", expand=True, pady=(6, 0))
@@ -486,6 +667,117 @@ class DownloadInsightsApp:
         self.legend_frame = ttk.Frame(parent, style="Card.TFrame")
         self.legend_frame.pack(fill="x", pady=(12, 0))
 
+        self.chart = StackedBarChart(
+            self.chart_canvas,
+            self.legend_frame,
+            frame_source=self._build_chart_frame,
+            color_for_domain=self._get_color_for_domain,
+        )
+
+    def _build_diagnostics_tab(self, parent: ttk.Frame) -> None:
+        header_row = ttk.Frame(parent, style="Card.TFrame")
+        header_row.pack(fill="x")
+
+        diagnostics_header = ttk.Label(header_row, text="Pipeline diagnostics", style="Heading.TLabel")
+        diagnostics_header.pack(side="left")
+
+        reset_button = ttk.Button(header_row, text="Reset", command=self._reset_metrics)
+        reset_button.pack(side="right")
+
+        export_button = ttk.Button(header_row, text="Export JSON", command=self._export_metrics)
+        export_button.pack(side="right", padx=(0, 12))
+
+        diagnostics_subheader = ttk.Label(
+            parent,
+            text="Latency of each download pipeline stage since the last reset.",
+            style="Subheading.TLabel",
+        )
+        diagnostics_subheader.pack(anchor="w", pady=(4, 12))
+
+        metrics_toggle = ttk.Checkbutton(
+            parent,
+            text="Collect pipeline metrics",
+            variable=self.metrics_enabled_var,
+            command=self._on_metrics_toggled,
+        )
+        metrics_toggle.pack(anchor="w", pady=(0, 12))
+
+        columns = ("Stage", "Count", "p50", "p95", "p99", "Max")
+        self.metrics_tree = ttk.Treeview(
+            parent,
+            columns=columns,
+            show="headings",
+            style="Insights.Treeview",
+            height=len(STAGES),
+        )
+        self.metrics_tree.pack(fill="x")
+        for column in columns:
+            anchor = "w" if column == "Stage" else "center"
+            self.metrics_tree.heading(column, text=column, anchor=anchor)
+            self.metrics_tree.column(column, width=120, anchor=anchor, stretch=True)
+
+        counters_label = ttk.Label(parent, textvariable=self.metrics_summary_var, style="Status.TLabel")
+        counters_label.pack(anchor="w", pady=(12, 0))
+
+    def _refresh_diagnostics(self) -> None:
+        snapshot = PIPELINE_METRICS.snapshot()
+        stages: dict[str, dict[str, float]] = snapshot["stages"]  # type: ignore[assignment]
+        for stage in (*STAGES, *sorted(set(stages) - set(STAGES))):
+            summary = stages.get(stage)
+            if summary is None:
+                values = (stage, 0, "-", "-", "-", "-")
+            else:
+                values = (
+                    stage,
+                    int(summary["count"]),
+                    f"{summary['p50_ms']:.1f} ms",
+                    f"{summary['p95_ms']:.1f} ms",
+                    f"{summary['p99_ms']:.1f} ms",
+                    f"{summary['max_ms']:.1f} ms",
+                )
+            if self.metrics_tree.exists(stage):
+                self.metrics_tree.item(stage, values=values)
+            else:
+                self.metrics_tree.insert("", "end", iid=stage, values=values)
+
+        counters: dict[str, int] = snapshot["counters"]  # type: ignore[assignment]
+        if not PIPELINE_METRICS.enabled:
+            self.metrics_summary_var.set("Metrics collection is off.")
+            return
+        self.metrics_summary_var.set(
+            f"Files: {counters.get('files', 0)}   "
+            f"Unknown domain: {counters.get('unknown_domain', 0)}   "
+            f"Deferred: {counters.get('deferred', 0)}   "
+            f"Resolved later: {counters.get('resolved', 0)}   "
+            f"Errors: {counters.get('errors', 0)}   "
+            f"Throughput: {snapshot['files_per_minute']:.2f} files/min"
+        )
+
+    def _on_metrics_toggled(self) -> None:
+        enabled = self.metrics_enabled_var.get()
+        PIPELINE_METRICS.enabled = enabled
+        set_metrics_enabled(enabled)
+        self._refresh_diagnostics()
+
+    def _reset_metrics(self) -> None:
+        PIPELINE_METRICS.reset()
+        self._refresh_diagnostics()
+
+    def _export_metrics(self) -> None:
+        destination = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=(("JSON files", "*.json"), ("All files", "*.*")),
+            title="Save pipeline metrics as JSON",
+        )
+        if not destination:
+            return
+        try:
+            PIPELINE_METRICS.export_json(destination)
+        except OSError as exc:
+            messagebox.showerror("Download Insights", f"Unable to export metrics.\n{exc}")
+            return
+        messagebox.showinfo("Download Insights", f"Metrics exported to:\n{destination}")
+
     def _on_content_configure(self, event: tk.Event) -> None:
         if self.canvas is not None:
             self.canvas.configure(scrollregion=self.canvas.bbox("all"))
@@ -524,6 +816,13 @@ class DownloadInsightsApp:
         use_auto_edge_history: bool,
         auto_start_monitoring: bool,
         refresh_interval_seconds: int,
+        log_max_lines: int | None = None,
+        log_spill_to_file: bool | None = None,
+        additional_folders: list[str] | None = None,
+        backfill_on_start: bool | None = None,
+        organize_mode: str | None = None,
+        retention_days: int | None = None,
+        retention_max_rows: int | None = None,
     ) -> None:
         normalized_folder = os.path.abspath(os.path.expanduser(download_folder))
         previous_folder = (self.path_var.get() or "").strip()
@@ -535,6 +834,19 @@ class DownloadInsightsApp:
             self._queue_message(f"Download folder set to {normalized_folder}")
         self._update_data_source(normalized_folder)
 
+        if additional_folders is not None:
+            normalized_extras = [
+                os.path.abspath(os.path.expanduser(path))
+                for path in additional_folders
+                if os.path.normcase(os.path.abspath(os.path.expanduser(path))) != os.path.normcase(normalized_folder)
+            ]
+            if normalized_extras != self.additional_folders:
+                self.additional_folders = normalized_extras
+                set_saved_additional_folders(normalized_extras)
+                self._refresh_settings_summary()
+                if self.monitoring:
+                    self._queue_message("Additional folders will be watched after monitoring restarts.")
+
         if use_auto_edge_history:
             set_saved_edge_history_path(None)
             self.edge_history_auto.set(True)
@@ -575,6 +887,38 @@ class DownloadInsightsApp:
         set_refresh_interval_seconds(refresh_interval_seconds)
         self._set_refresh_interval(refresh_interval_seconds)
 
+        if log_max_lines is not None:
+            self.log_max_lines = max(100, int(log_max_lines))
+            set_log_max_lines(self.log_max_lines)
+            if self.log_sink is not None:
+                self.log_sink.set_max_lines(self.log_max_lines)
+
+        if retention_days is not None and retention_days != self.retention_days:
+            self.retention_days = max(0, retention_days)
+            set_retention_days(self.retention_days)
+
+        if retention_max_rows is not None and retention_max_rows != self.retention_max_rows:
+            self.retention_max_rows = max(0, retention_max_rows)
+            set_retention_max_rows(self.retention_max_rows)
+
+        if organize_mode is not None and organize_mode != self.organize_mode:
+            self.organize_mode = organize_mode
+            set_organize_mode(organize_mode)
+            if self.monitoring:
+                self._queue_message("The new organize mode applies after monitoring restarts.")
+
+        if backfill_on_start is not None and backfill_on_start != self.backfill_on_start:
+            self.backfill_on_start = backfill_on_start
+            set_backfill_on_start(backfill_on_start)
+
+        if log_spill_to_file is not None and log_spill_to_file != self.log_spill_enabled:
+            self.log_spill_enabled = log_spill_to_file
+            set_log_spill_enabled(log_spill_to_file)
+            if self.log_sink is not None:
+                self.log_sink.set_spill_path(get_activity_log_path() if log_spill_to_file else None)
+            if log_spill_to_file:
+                self._queue_message(f"Writing the activity log to {get_activity_log_path()}")
+
         if auto_start_monitoring:
             self._auto_start_if_enabled()
 
@@ -619,8 +963,16 @@ class DownloadInsightsApp:
                 if detected:
                     self.edge_history_var.set(detected)
 
+        folders = [folder]
+        for extra in self.additional_folders:
+            if os.path.isdir(extra):
+                folders.append(extra)
+            else:
+                self._queue_message(f"Skipping missing folder {extra}")
+
         try:
-            initialize_log_file(folder)
+            for monitored in folders:
+                initialize_log_file(monitored)
         except OSError as exc:
             messagebox.showerror("Download Insights", f"Unable to prepare the insights database.\n{exc}")
             return
@@ -628,21 +980,39 @@ class DownloadInsightsApp:
         self._update_data_source(folder)
         self.stop_event = threading.Event()
         self.monitoring = True
-        self.status_label.configure(text=f"Monitoring {folder}")
+        if len(folders) > 1:
+            self.status_label.configure(text=f"Monitoring {folder} and {len(folders) - 1} more")
+        else:
+            self.status_label.configure(text=f"Monitoring {folder}")
         self.start_button.configure(state="disabled")
         self.stop_button.configure(state="normal")
-        self._queue_message(f"Started monitoring {folder}")
+        for monitored in folders:
+            self._queue_message(f"Started monitoring {monitored}")
 
-        self.monitor_thread = threading.Thread(target=self._monitor_downloads, args=(folder,), daemon=True)
+        self.monitor_thread = threading.Thread(target=self._monitor_downloads, args=(folders,), daemon=True)
         self.monitor_thread.start()
 
-    def _monitor_downloads(self, folder: str) -> None:
+    def _monitor_downloads(self, folders: list[str]) -> None:
+        from watchdog.observers import Observer
+
+        # A single observer and handler serve every folder, so extra folders
+        # add a watch rather than another thread pool and pipeline.
         observer = Observer()
-        handler = FileHandler(folder, self._queue_message)
+        handler = FileHandler(
+            folders[0],
+            self._queue_message,
+            additional_folders=folders[1:],
+            organize_mode=self.organize_mode,
+        )
         try:
-            observer.schedule(handler, folder, recursive=False)
+            for folder in folders:
+                observer.schedule(handler, folder, recursive=False)
             observer.start()
             self.observer = observer
+            if self.backfill_on_start:
+                # Live events are already being handled; the backfill only
+                # touches files that were sitting in the folders beforehand.
+                threading.Thread(target=self._backfill_folders, args=(handler, folders), daemon=True).start()
             while not self.stop_event.is_set():
                 time.sleep(0.5)
         except Exception as exc:
@@ -652,11 +1022,26 @@ class DownloadInsightsApp:
         finally:
             observer.stop()
             observer.join()
+            handler.close()
             self.observer = None
             self.stop_event.set()
             self._queue_message("Monitoring stopped.")
             self.root.after(0, self._on_monitoring_stopped)
 
+    def _backfill_folders(self, handler: FileHandler, folders: list[str]) -> None:
+        for folder in folders:
+            if self.stop_event.is_set():
+                return
+            try:
+                run_backfill(
+                    handler,
+                    folder,
+                    stop_event=self.stop_event,
+                    progress=progress_reporter(self._queue_message, folder),
+                )
+            except Exception as exc:
+                self._queue_message(f"Backfill of {folder} failed: {exc}")
+
     def stop_monitoring(self) -> None:
         if not self.monitoring:
             return
@@ -685,35 +1070,164 @@ class DownloadInsightsApp:
 
         folder = (self.path_var.get() or "").strip()
         if not folder or not os.path.isdir(folder):
-            self.insights_data = []
-            self._update_analytics_summary()
             self.last_entry_id = 0
+            self._update_analytics_summary()
             self._show_empty_state("Select a download folder to view insights.")
             return
 
         try:
-            records = fetch_insights(folder)
             self.last_entry_id = get_latest_entry_id(folder)
+            self.last_data_version = get_data_version(folder)
         except (OSError, sqlite3.DatabaseError) as exc:
             self._queue_message(f"Unable to read insights data: {exc}")
-            self.insights_data = []
-            self._update_analytics_summary()
             self.last_entry_id = 0
+            self._update_analytics_summary()
             self._show_empty_state("Unable to read insights data.")
             return
 
         self._setup_tree_columns(EXPECTED_HEADER)
 
-        self.insights_data = records
         self._update_analytics_summary()
 
+        if self.search_query:
+            self._show_search_page()
+            return
+
+        self._show_insights_page()
+
+    def _show_insights_page(self) -> None:
+        self._hide_empty_state()
+        folder = (self.path_var.get() or "").strip()
+        if not folder or not os.path.isdir(folder):
+            self._populate_tree([])
+            self._show_empty_state("Select a download folder to view insights.")
+            return
+
+        page_index = len(self.page_cursors) - 1
+        try:
+            records, self.next_page_cursor = fetch_insights_page(
+                folder,
+                sort_column=self.sort_column,
+                descending=self.sort_descending,
+                after=self.page_cursors[-1],
+                limit=INSIGHTS_PAGE_SIZE,
+            )
+        except (OSError, sqlite3.DatabaseError) as exc:
+            self._queue_message(f"Unable to read insights data: {exc}")
+            records, self.next_page_cursor = [], None
+
+        if not records and page_index > 0:
+            # The page we were on no longer exists (e.g. rows were removed); go back to the first page.
+            self.page_cursors = [None]
+            self._show_insights_page()
+            return
+
+        self._setup_tree_columns(EXPECTED_HEADER)
+        self._populate_tree(records)
+
+        first = page_index * INSIGHTS_PAGE_SIZE + 1
+        if records:
+            self.page_status_var.set(f"Rows {first}-{first + len(records) - 1}")
+        else:
+            self.page_status_var.set("")
+            self._show_empty_state("No insights recorded yet.")
+        self.prev_page_button.configure(state="normal" if page_index > 0 else "disabled")
+        self.next_page_button.configure(state="normal" if self.next_page_cursor is not None else "disabled")
+
+    def _sort_by_column(self, column: str) -> None:
+        if column not in SORTABLE_COLUMNS:
+            return
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = column in {"Timestamp", "File Size"}
+        self._update_sort_headings()
+        self.page_cursors = [None]
+        if self.search_query:
+            self.search_var.set("")
+            self.search_query = ""
+            self.search_page = 0
+        self._show_insights_page()
+
+    def _update_sort_headings(self) -> None:
+        for column in self.tree_columns:
+            text = column
+            if column == self.sort_column:
+                arrow = "\u25bc" if self.sort_descending else "\u25b2"
+                text = f"{column} {arrow}"
+            self.tree.heading(column, text=text)
+
+    def _populate_tree(self, records: list[dict[str, str]]) -> None:
+        for item in self.tree.get_children():
+            self.tree.delete(item)
         for index, record in enumerate(records):
             values = [record.get(column, "") for column in EXPECTED_HEADER]
             tag = "even" if index % 2 == 0 else "odd"
             self.tree.insert("", "end", values=values, tags=(tag,))
 
-        if not records:
-            self._show_empty_state("No insights recorded yet.")
+    def _run_search(self) -> None:
+        query = (self.search_var.get() or "").strip()
+        if not query:
+            self._clear_search()
+            return
+        self.search_query = query
+        self.search_page = 0
+        self._show_search_page()
+
+    def _clear_search(self) -> None:
+        self.search_var.set("")
+        if not self.search_query:
+            return
+        self.search_query = ""
+        self.search_page = 0
+        self._show_insights_page()
+
+    def _change_page(self, step: int) -> None:
+        if self.search_query:
+            self.search_page = max(0, self.search_page + step)
+            self._show_search_page()
+            return
+        if step > 0 and self.next_page_cursor is not None:
+            self.page_cursors.append(self.next_page_cursor)
+        elif step < 0 and len(self.page_cursors) > 1:
+            self.page_cursors.pop()
+        else:
+            return
+        self._show_insights_page()
+
+    def _show_search_page(self) -> None:
+        self._hide_empty_state()
+        folder = (self.path_var.get() or "").strip()
+        if not folder or not os.path.isdir(folder):
+            self._populate_tree([])
+            self._show_empty_state("Select a download folder to view insights.")
+            return
+
+        try:
+            results = search_insights(
+                folder,
+                self.search_query,
+                limit=SEARCH_PAGE_SIZE + 1,
+                offset=self.search_page * SEARCH_PAGE_SIZE,
+            )
+        except (OSError, sqlite3.DatabaseError) as exc:
+            self._queue_message(f"Unable to search insights data: {exc}")
+            results = []
+
+        has_next = len(results) > SEARCH_PAGE_SIZE
+        results = results[:SEARCH_PAGE_SIZE]
+        self._setup_tree_columns(EXPECTED_HEADER)
+        self._populate_tree(results)
+
+        first = self.search_page * SEARCH_PAGE_SIZE + 1
+        if results:
+            self.page_status_var.set(f"Results {first}-{first + len(results) - 1}")
+        else:
+            self.page_status_var.set("No matches")
+            self._show_empty_state(f"No insights match '{self.search_query}'.")
+        self.prev_page_button.configure(state="normal" if self.search_page > 0 else "disabled")
+        self.next_page_button.configure(state="normal" if has_next else "disabled")
 
     def _export_insights_to_csv(self) -> None:
         folder = (self.path_var.get() or "").strip()
@@ -746,12 +1260,51 @@ class DownloadInsightsApp:
             f"Insights exported to:\n{destination}",
         )
 
+    def _export_download_analysis(self) -> None:
+        folder = (self.path_var.get() or "").strip()
+        if not folder or not os.path.isdir(folder):
+            messagebox.showerror(
+                "Download Insights",
+                "Select a valid download folder before exporting your insights.",
+            )
+            return
+
+        destination = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=(("Excel workbooks", "*.xlsx"), ("All files", "*.*")),
+            title="Save download analysis as Excel workbook",
+        )
+        if not destination:
+            return
+
+        try:
+            export_download_analysis_xlsx(folder, destination)
+        except (OSError, sqlite3.DatabaseError) as exc:
+            messagebox.showerror(
+                "Download Insights",
+                f"Unable to export the download analysis.\n{exc}",
+            )
+            return
+
+        messagebox.showinfo(
+            "Download Insights",
+            f"Download analysis exported to:\n{destination}",
+        )
+
     def _setup_tree_columns(self, header: list[str]) -> None:
         if header != self.tree_columns:
             self.tree_columns = header
             self.tree.configure(columns=header)
             for column in header:
-                self.tree.heading(column, text=column, anchor="w")
+                if column in SORTABLE_COLUMNS:
+                    self.tree.heading(
+                        column,
+                        text=column,
+                        anchor="w",
+                        command=lambda name=column: self._sort_by_column(name),
+                    )
+                else:
+                    self.tree.heading(column, text=column, anchor="w")
                 width = 160
                 if column in {"File Path", "Download URL"}:
                     width = 280
@@ -760,38 +1313,34 @@ class DownloadInsightsApp:
                 elif column == "Event":
                     width = 120
                 self.tree.column(column, width=width, anchor="w", stretch=True)
+            self._update_sort_headings()
 
     # ------------------------------------------------------------------
     # Analytics helpers
     # ------------------------------------------------------------------
+    def _analytics_folder(self) -> str | None:
+        folder = (self.path_var.get() or "").strip()
+        return folder if folder and os.path.isdir(folder) else None
+
     def _update_analytics_summary(self) -> None:
-        domain_totals: dict[str, dict[str, int]] = defaultdict(lambda: {"count": 0, "size": 0, "duplicates": 0})
-        total_files = 0
-        total_size = 0
-        total_duplicates = 0
-
-        for record in self.insights_data:
-            domain = (record.get("Domain") or "Unknown").strip() or "Unknown"
-            size_value = record.get("File Size", "")
+        # Totals, the breakdown and the chart are aggregated inside SQLite;
+        # no insight rows are loaded for the Analytics tab.
+        folder = self._analytics_folder()
+        summary: dict[str, object] = {}
+        if folder is not None:
             try:
-                size = int(size_value)
-            except (TypeError, ValueError):
-                size = 0
-            duplicate_value = (record.get("Is Duplicate") or "No").strip().lower()
-            is_duplicate = duplicate_value in {"yes", "true", "1"}
-
-            domain_totals[domain]["count"] += 1
-            domain_totals[domain]["size"] += size
-            if is_duplicate:
-                domain_totals[domain]["duplicates"] += 1
-
-            total_files += 1
-            total_size += size
-            if is_duplicate:
-                total_duplicates += 1
+                summary = summarize_insights(folder, top_domains=0)
+            except (OSError, sqlite3.DatabaseError) as exc:
+                self._queue_message(f"Unable to summarize insights data: {exc}")
 
-        self._set_total_summary(total_files, total_size, total_duplicates)
-        self._populate_domain_tree(domain_totals)
+        self._set_total_summary(
+            int(summary.get("total_files", 0)),
+            int(summary.get("total_size", 0)),
+            int(summary.get("duplicates", 0)),
+        )
+        self.data_first_timestamp = summary.get("first_timestamp")
+        self.data_last_timestamp = summary.get("last_timestamp")
+        self._populate_domain_tree()
 
         if self.custom_date_range:
             self._refresh_chart()
@@ -803,26 +1352,40 @@ class DownloadInsightsApp:
         self.total_size_var.set(self._format_bytes(total_size))
         self.total_duplicates_var.set(str(duplicates))
 
-    def _populate_domain_tree(self, domain_totals: dict[str, dict[str, int]]) -> None:
+    def _populate_domain_tree(self) -> None:
         for item in self.domain_tree.get_children():
             self.domain_tree.delete(item)
 
-        sorted_items = sorted(domain_totals.items(), key=lambda item: item[1]["count"], reverse=True)
+        dimension = self.breakdown_var.get()
+        folder = self._analytics_folder()
+        if folder is None:
+            return
+        try:
+            entries = aggregate_insights(folder, (dimension,))
+        except (OSError, sqlite3.DatabaseError) as exc:
+            self._queue_message(f"Unable to summarize insights data: {exc}")
+            return
 
-        for index, (domain, totals) in enumerate(sorted_items):
+        for index, entry in enumerate(entries):
             tag = "even" if index % 2 == 0 else "odd"
             self.domain_tree.insert(
                 "",
                 "end",
                 values=(
-                    domain,
-                    totals["count"],
-                    self._format_bytes(totals["size"]),
-                    totals["duplicates"],
+                    entry[dimension] or "Unknown",
+                    entry["Files"],
+                    self._format_bytes(int(entry["File Size"])),
+                    entry["Duplicates"],
                 ),
                 tags=(tag,),
             )
 
+    def _on_breakdown_changed(self, header: ttk.Label) -> None:
+        dimension = self.breakdown_var.get()
+        header.configure(text=f"Per {dimension.lower()} details")
+        self.domain_tree.heading("Domain", text=dimension)
+        self._populate_domain_tree()
+
     def _format_bytes(self, size: int) -> str:
         if size <= 0:
             return "0 B"
@@ -837,31 +1400,10 @@ class DownloadInsightsApp:
         return f"{value:.2f} {units[unit_index]}"
 
     def _set_default_date_range(self) -> None:
-        if not self.insights_data:
-            today = datetime.now().date()
-            self.start_date_var.set((today - timedelta(days=9)).isoformat())
-            self.end_date_var.set(today.isoformat())
-            self.range_error_var.set("")
-            self._refresh_chart()
-            return
-
-        dates: list[date] = []
-        for record in self.insights_data:
-            timestamp = record.get("Timestamp", "")
-            try:
-                parsed = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                continue
-            dates.append(parsed.date())
-
-        if not dates:
-            today = datetime.now().date()
-            start_date = today - timedelta(days=9)
-            end_date = today
-        else:
-            end_date = max(dates)
-            start_date = max(end_date - timedelta(days=9), min(dates))
-
+        start_date, end_date = recent_date_range(
+            self._parse_date((self.data_first_timestamp or "")[:10]),
+            self._parse_date((self.data_last_timestamp or "")[:10]),
+        )
         self.start_date_var.set(start_date.isoformat())
         self.end_date_var.set(end_date.isoformat())
         self.range_error_var.set("")
@@ -899,148 +1441,47 @@ class DownloadInsightsApp:
             return None
 
     def _refresh_chart(self) -> None:
-        if self.chart_canvas is None:
-            return
-
-        self.chart_canvas.delete("all")
+        if self.chart is not None:
+            self.chart.schedule()
 
+    def _build_chart_frame(self) -> ChartFrame:
         start_date = self._parse_date(self.start_date_var.get())
         end_date = self._parse_date(self.end_date_var.get())
 
         if start_date is None or end_date is None:
-            self._draw_chart_message("Enter start and end dates to view chart data.")
-            return
+            return ChartFrame(message="Enter start and end dates to view chart data.")
 
         if start_date > end_date:
-            self._draw_chart_message("Invalid date range selected.")
-            return
-
-        day_counts: dict[date, dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        all_domains: set[str] = set()
-
-        for record in self.insights_data:
-            timestamp = record.get("Timestamp", "")
-            try:
-                parsed = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                continue
-            day = parsed.date()
-            if day < start_date or day > end_date:
-                continue
-            domain = (record.get("Domain") or "Unknown").strip() or "Unknown"
-            day_counts[day][domain] += 1
-            all_domains.add(domain)
-
-        days: list[date] = []
-        current_day = start_date
-        while current_day <= end_date:
-            days.append(current_day)
-            current_day += timedelta(days=1)
-
-        total_per_day = [sum(day_counts[day].values()) for day in days]
-        max_total = max(total_per_day) if total_per_day else 0
-
-        if max_total == 0:
-            self._draw_chart_message("No downloads recorded in the selected range.")
-            self._update_legend(sorted(all_domains))
-            return
+            return ChartFrame(message="Invalid date range selected.")
 
-        width = max(self.chart_canvas.winfo_width(), 1)
-        height = max(self.chart_canvas.winfo_height(), 1)
-        margin_left = 60
-        margin_right = 24
-        margin_top = 24
-        margin_bottom = 48
-
-        chart_width = max(width - margin_left - margin_right, 1)
-        chart_height = max(height - margin_top - margin_bottom, 1)
-        bar_slot = chart_width / len(days)
-        bar_width = min(bar_slot * 0.6, 80)
-        baseline = height - margin_bottom
-
-        self.chart_canvas.create_line(
-            margin_left,
-            baseline,
-            width - margin_right,
-            baseline,
-            fill="#2e3148",
+        days, day_counts, sorted_domains = daily_domain_counts(
+            (), start_date, end_date, rollups=self._daily_totals(start_date, end_date)
         )
-
-        sorted_domains = sorted(all_domains)
         for domain in sorted_domains:
             self._get_color_for_domain(domain)
 
-        for index, day in enumerate(days):
-            counts = day_counts.get(day, {})
-            total_for_day = total_per_day[index]
-            x_center = margin_left + bar_slot * index + bar_slot / 2
-            x0 = x_center - bar_width / 2
-            x1 = x_center + bar_width / 2
-            cumulative_height = 0.0
-
-            for domain in sorted_domains:
-                count = counts.get(domain, 0)
-                if count <= 0:
-                    continue
-                height_ratio = count / max_total
-                bar_height = height_ratio * chart_height
-                y1 = baseline - cumulative_height
-                y0 = y1 - bar_height
-                color = self._get_color_for_domain(domain)
-                self.chart_canvas.create_rectangle(x0, y0, x1, y1, fill=color, outline="")
-                cumulative_height += bar_height
-
-            if total_for_day > 0:
-                self.chart_canvas.create_text(
-                    x_center,
-                    baseline - cumulative_height - 12,
-                    text=str(total_for_day),
-                    fill="#f4f6fb",
-                    font=("Segoe UI", 10, "bold"),
-                )
-
-            label = day.strftime("%b %d")
-            self.chart_canvas.create_text(
-                x_center,
-                height - margin_bottom / 2,
-                text=label,
-                fill="#cbd5f5",
-                font=("Segoe UI", 9),
+        if not any(day_counts.get(day) for day in days):
+            return ChartFrame(
+                domains=sorted_domains,
+                message="No downloads recorded in the selected range.",
             )
 
-        self._update_legend(sorted_domains)
-
-    def _draw_chart_message(self, message: str) -> None:
-        if self.chart_canvas is None:
-            return
-        width = max(self.chart_canvas.winfo_width(), 1)
-        height = max(self.chart_canvas.winfo_height(), 1)
-        self._update_legend([])
-        self.chart_canvas.create_text(
-            width / 2,
-            height / 2,
-            text=message,
-            fill="#cbd5f5",
-            font=("Segoe UI", 12),
-        )
-
-    def _update_legend(self, domains: list[str]) -> None:
-        for child in self.legend_frame.winfo_children():
-            child.destroy()
-
-        if not domains:
-            return
-
-        for domain in domains:
-            color = self._get_color_for_domain(domain)
-            item = ttk.Frame(self.legend_frame, style="Card.TFrame")
-            item.pack(side="left", padx=(0, 18))
-
-            swatch = tk.Label(item, background=color, width=2, height=1)
-            swatch.pack(side="left", padx=(0, 6))
-
-            label = ttk.Label(item, text=domain, style="TLabel")
-            label.pack(side="left")
+        return ChartFrame(days=days, day_counts=day_counts, domains=sorted_domains)
+
+    def _daily_totals(self, start_date: date, end_date: date) -> list[dict[str, object]]:
+        """Per day and domain totals for the chart, queried again only when the range or data changes."""
+        folder = self._analytics_folder()
+        key = (folder, start_date, end_date, self.last_entry_id, self.last_data_version)
+        if key != self._chart_totals_key:
+            totals: list[dict[str, object]] = []
+            if folder is not None:
+                try:
+                    totals = aggregate_insights(folder, ("Day", "Domain"), start_date, end_date)
+                except (OSError, sqlite3.DatabaseError) as exc:
+                    self._queue_message(f"Unable to read chart data: {exc}")
+            self._chart_totals_key = key
+            self._chart_totals = totals
+        return self._chart_totals
 
     def _get_color_for_domain(self, domain: str) -> str:
         if domain not in self.domain_colors:
@@ -1065,8 +1506,10 @@ class DownloadInsightsApp:
         folder = (self.path_var.get() or "").strip()
 
         if folder and os.path.isdir(folder):
+            data_version = self.last_data_version
             try:
                 latest_id = get_latest_entry_id(folder)
+                data_version = get_data_version(folder)
             except (OSError, sqlite3.DatabaseError) as exc:
                 if self.last_entry_id != 0:
                     self._queue_message(f"Unable to access insights data: {exc}")
@@ -1078,16 +1521,46 @@ class DownloadInsightsApp:
                     should_reload = True
             elif latest_id != self.last_entry_id:
                 should_reload = True
+                self.maintenance.touch()
+            elif data_version != self.last_data_version:
+                # Rows changed in place, e.g. a deferred download resolved to its domain.
+                should_reload = True
         else:
-            if self.last_entry_id != 0 or self.insights_data:
+            if self.last_entry_id != 0:
                 should_reload = True
             self.last_entry_id = 0
 
         if should_reload:
             self.load_insights_data()
 
+        self._refresh_diagnostics()
+        self._start_idle_maintenance(folder)
         self._schedule_refresh()
 
+    def _start_idle_maintenance(self, folder: str) -> None:
+        if not folder or not os.path.isdir(folder) or not self.maintenance.begin():
+            return
+        folders = [folder, *(extra for extra in self.additional_folders if os.path.isdir(extra))]
+        threading.Thread(target=self._run_maintenance, args=(folders,), daemon=True).start()
+
+    def _run_maintenance(self, folders: list[str]) -> None:
+        archived = 0
+        try:
+            for folder in folders:
+                result = run_maintenance(folder, self.retention_days, self.retention_max_rows)
+                archived += result.archived
+                if result.sealed:
+                    self._queue_message(f"Sealed {result.sealed} insights into monthly partitions")
+                if result.archived:
+                    self._queue_message(f"Archived {result.archived} insights to {result.archive_path}")
+        except (OSError, sqlite3.Error) as exc:
+            self._queue_message(f"Database maintenance failed: {exc}")
+        finally:
+            self.maintenance.finish()
+        if archived:
+            # Archiving does not change the latest id, so ask for the reload explicitly.
+            self.root.after(0, self.load_insights_data)
+
     # ------------------------------------------------------------------
     # Logging utilities
     # ------------------------------------------------------------------
@@ -1096,12 +1569,8 @@ class DownloadInsightsApp:
         self.log_queue.put(f"[{timestamp}] {message}")
 
     def _process_log_queue(self) -> None:
-        while not self.log_queue.empty():
-            message = self.log_queue.get_nowait()
-            self.log_text.configure(state="normal")
-            self.log_text.insert("end", message + "\n")
-            self.log_text.configure(state="disabled")
-            self.log_text.yview_moveto(1.0)
+        if self.log_sink is not None:
+            self.log_sink.drain()
         self.root.after(LOG_POLL_INTERVAL_MS, self._process_log_queue)
 
     # ------------------------------------------------------------------
@@ -1121,6 +1590,12 @@ class DownloadInsightsApp:
                 self.root.after_cancel(self.refresh_job)
             except tk.TclError:
                 pass
+        if self.chart is not None:
+            self.chart.cancel()
+        if self.log_sink is not None:
+            self.log_sink.drain()
+            self.log_sink.close()
+        close_all_pools()
         self.root.destroy()
 
 
@@ -1141,6 +1616,12 @@ class SettingsDialog(tk.Toplevel):
         self.auto_edge_var = tk.BooleanVar(value=app.edge_history_auto.get())
         self.auto_start_var = tk.BooleanVar(value=app.auto_start_var.get())
         self.refresh_interval_var = tk.IntVar(value=max(1, app.refresh_interval_ms // 1000))
+        self.log_max_lines_var = tk.IntVar(value=app.log_max_lines)
+        self.log_spill_var = tk.BooleanVar(value=app.log_spill_enabled)
+        self.backfill_var = tk.BooleanVar(value=app.backfill_on_start)
+        self.link_mode_var = tk.BooleanVar(value=app.organize_mode == "link")
+        self.retention_days_var = tk.IntVar(value=app.retention_days)
+        self.retention_rows_var = tk.IntVar(value=app.retention_max_rows)
 
         container = ttk.Frame(self, padding=24, style="TFrame")
         container.grid(row=0, column=0, sticky="nsew")
@@ -1231,8 +1712,104 @@ class SettingsDialog(tk.Toplevel):
         )
         self.refresh_spin.grid(row=12, column=0, sticky="w", pady=(6, 0))
 
+        log_lines_label = ttk.Label(container, text="Activity log lines kept on screen", style="TLabel")
+        log_lines_label.grid(row=13, column=0, sticky="w", pady=(18, 0))
+
+        self.log_lines_spin = ttk.Spinbox(
+            container,
+            from_=100,
+            to=100000,
+            increment=100,
+            textvariable=self.log_max_lines_var,
+            width=8,
+        )
+        self.log_lines_spin.grid(row=14, column=0, sticky="w", pady=(6, 0))
+
+        log_spill_toggle = ttk.Checkbutton(
+            container,
+            text="Keep the full activity log in a file",
+            variable=self.log_spill_var,
+        )
+        log_spill_toggle.grid(row=15, column=0, columnspan=2, sticky="w", pady=(12, 0))
+
+        backfill_toggle = ttk.Checkbutton(
+            container,
+            text="Organize files that arrived while monitoring was off",
+            variable=self.backfill_var,
+        )
+        backfill_toggle.grid(row=16, column=0, columnspan=2, sticky="w", pady=(6, 0))
+
+        link_mode_toggle = ttk.Checkbutton(
+            container,
+            text="Keep downloads in place and link them into DownloadInsights",
+            variable=self.link_mode_var,
+        )
+        link_mode_toggle.grid(row=17, column=0, columnspan=2, sticky="w", pady=(6, 0))
+
+        retention_label = ttk.Label(
+            container,
+            text="Archive insights older than (days) or beyond (rows); 0 keeps everything",
+            style="TLabel",
+        )
+        retention_label.grid(row=18, column=0, columnspan=2, sticky="w", pady=(18, 0))
+
+        retention_row = ttk.Frame(container, style="TFrame")
+        retention_row.grid(row=19, column=0, columnspan=2, sticky="w", pady=(6, 0))
+
+        self.retention_days_spin = ttk.Spinbox(
+            retention_row,
+            from_=0,
+            to=36500,
+            increment=30,
+            textvariable=self.retention_days_var,
+            width=8,
+        )
+        self.retention_days_spin.pack(side="left")
+
+        self.retention_rows_spin = ttk.Spinbox(
+            retention_row,
+            from_=0,
+            to=100000000,
+            increment=10000,
+            textvariable=self.retention_rows_var,
+            width=12,
+        )
+        self.retention_rows_spin.pack(side="left", padx=(12, 0))
+
+        extra_label = ttk.Label(container, text="Additional folders", style="Heading.TLabel")
+        extra_label.grid(row=20, column=0, columnspan=2, sticky="w", pady=(24, 0))
+
+        extra_sub = ttk.Label(
+            container,
+            text="Other folders to watch alongside the download folder. Each keeps its own insights.",
+            style="Subheading.TLabel",
+        )
+        extra_sub.grid(row=21, column=0, columnspan=2, sticky="w", pady=(4, 12))
+
+        self.extra_folders_list = tk.Listbox(
+            container,
+            height=4,
+            background="#1f2032",
+            foreground="#f4f6fb",
+            selectbackground="#6366f1",
+            borderwidth=0,
+            highlightthickness=0,
+        )
+        self.extra_folders_list.grid(row=22, column=0, sticky="ew")
+        for folder in app.additional_folders:
+            self.extra_folders_list.insert("end", folder)
+
+        extra_buttons = ttk.Frame(container, style="TFrame")
+        extra_buttons.grid(row=22, column=1, padx=(12, 0), sticky="n")
+
+        add_extra = ttk.Button(extra_buttons, text="Add", command=self._add_extra_folder)
+        add_extra.pack(fill="x")
+
+        remove_extra = ttk.Button(extra_buttons, text="Remove", command=self._remove_extra_folder)
+        remove_extra.pack(fill="x", pady=(6, 0))
+
         buttons = ttk.Frame(container, style="TFrame")
-        buttons.grid(row=13, column=0, columnspan=2, sticky="e", pady=(24, 0))
+        buttons.grid(row=23, column=0, columnspan=2, sticky="e", pady=(24, 0))
 
         cancel_button = ttk.Button(buttons, text="Cancel", command=self._on_cancel)
         cancel_button.pack(side="right")
@@ -1256,6 +1833,18 @@ class SettingsDialog(tk.Toplevel):
         if selected:
             self.download_var.set(selected)
 
+    def _add_extra_folder(self) -> None:
+        selected = filedialog.askdirectory(parent=self, title="Select an additional folder to monitor")
+        if not selected:
+            return
+        normalized = os.path.abspath(os.path.expanduser(selected))
+        if normalized not in self.extra_folders_list.get(0, "end"):
+            self.extra_folders_list.insert("end", normalized)
+
+    def _remove_extra_folder(self) -> None:
+        for index in reversed(self.extra_folders_list.curselection()):
+            self.extra_folders_list.delete(index)
+
     def _browse_for_edge_history(self) -> None:
         initial = self.edge_history_var.get()
         initial_dir = os.path.dirname(initial) if initial else None
@@ -1275,7 +1864,8 @@ class SettingsDialog(tk.Toplevel):
             self._on_auto_edge_toggle()
 
     def _use_auto_detected_edge_history(self) -> None:
-        detected = auto_detect_edge_history_path()
+        # An explicit request from the user bypasses the discovery cache.
+        detected = auto_detect_edge_history_path(refresh=True)
         if detected:
             self.edge_history_var.set(detected)
             self.auto_edge_var.set(True)
@@ -1363,12 +1953,40 @@ class SettingsDialog(tk.Toplevel):
             )
             return
 
+        try:
+            log_max_lines = int(self.log_max_lines_var.get())
+        except (TypeError, ValueError, tk.TclError):
+            messagebox.showerror(
+                "Download Insights",
+                "Enter a valid number of activity log lines.",
+                parent=self,
+            )
+            return
+
+        try:
+            retention_days = int(self.retention_days_var.get())
+            retention_max_rows = int(self.retention_rows_var.get())
+        except (TypeError, ValueError, tk.TclError):
+            messagebox.showerror(
+                "Download Insights",
+                "Enter whole numbers for the retention limits.",
+                parent=self,
+            )
+            return
+
         self.app.apply_settings(
             download_folder=download_folder,
             edge_history_path=edge_path if not use_auto_edge else None,
             use_auto_edge_history=use_auto_edge,
             auto_start_monitoring=self.auto_start_var.get(),
             refresh_interval_seconds=refresh_seconds,
+            log_max_lines=log_max_lines,
+            log_spill_to_file=self.log_spill_var.get(),
+            additional_folders=list(self.extra_folders_list.get(0, "end")),
+            backfill_on_start=self.backfill_var.get(),
+            organize_mode="link" if self.link_mode_var.get() else "move",
+            retention_days=retention_days,
+            retention_max_rows=retention_max_rows,
         )
 
         try:
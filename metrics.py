@@ -0,0 +1,138 @@
+"""Lightweight per-stage timers and counters for the download pipeline."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+STAGES = ("stabilize", "snapshot", "query", "move", "log", "total")
+COUNTERS = ("files", "deferred", "resolved", "unknown_domain", "errors")
+SAMPLE_WINDOW = 2048
+
+
+class _StageHistogram:
+    """Running count/total plus a window of recent samples used for percentiles."""
+
+    __slots__ = ("count", "total", "maximum", "samples")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.samples: deque[float] = deque(maxlen=SAMPLE_WINDOW)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+        self.samples.append(seconds)
+
+    def summary(self) -> dict[str, float | int]:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": (self.total / self.count * 1000) if self.count else 0.0,
+            "p50_ms": _percentile(ordered, 0.50) * 1000,
+            "p95_ms": _percentile(ordered, 0.95) * 1000,
+            "p99_ms": _percentile(ordered, 0.99) * 1000,
+            "max_ms": self.maximum * 1000,
+        }
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class PipelineMetrics:
+    """Thread-safe stage timers and counters.
+
+    When disabled, :meth:`timer` hands back a shared no-op context manager and
+    :meth:`increment` returns immediately, so instrumented code pays only an
+    attribute check.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages: dict[str, _StageHistogram] = {}
+        self._counters: dict[str, int] = {}
+        self._started = time.time()
+
+    @contextmanager
+    def _timed(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def timer(self, stage: str):
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timed(stage)
+
+    def record(self, stage: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = _StageHistogram()
+            histogram.add(seconds)
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._started = time.time()
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            stages = {name: histogram.summary() for name, histogram in self._stages.items()}
+            counters = dict(self._counters)
+            started = self._started
+        elapsed = max(time.time() - started, 1e-9)
+        return {
+            "enabled": self.enabled,
+            "since": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started)),
+            "elapsed_seconds": elapsed,
+            "files_per_minute": counters.get("files", 0) / elapsed * 60,
+            "stages": stages,
+            "counters": counters,
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def export_json(self, destination_path: str) -> None:
+        with open(destination_path, "w", encoding="utf-8") as handle:
+            handle.write(self.to_json())
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: object) -> bool:
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+PIPELINE_METRICS = PipelineMetrics()
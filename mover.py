@@ -0,0 +1,237 @@
+"""File moves that rename in place on one device and copy off-thread across devices.
+
+The engine can also place a file without moving it, as a hardlink or a
+reflink clone, for users who need the original left where it is.
+"""
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+PARTIAL_SUFFIX = ".dipartial"
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+LINK_METHODS = ("hardlink", "reflink")
+
+# Errors that mean "this kernel/filesystem pair cannot do that", not "the copy failed".
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    getattr(errno, "EOPNOTSUPP", errno.EINVAL),
+    getattr(errno, "ENOTSUP", errno.EINVAL),
+}
+
+Progress = Callable[[int, int], None]
+
+
+def same_device(source: str, destination_dir: str) -> bool:
+    try:
+        return os.stat(source).st_dev == os.stat(destination_dir).st_dev
+    except OSError:
+        return False
+
+
+def _copy_descriptors(source_fd: int, destination_fd: int, total: int, progress: Progress | None) -> int:
+    copy_file_range = getattr(os, "copy_file_range", None)
+    # sendfile only accepts regular files as the output on Linux.
+    sendfile = getattr(os, "sendfile", None) if sys.platform.startswith("linux") else None
+    copied = 0
+    while copied < total:
+        count = min(COPY_CHUNK_SIZE, total - copied)
+        if copy_file_range is not None:
+            try:
+                sent = copy_file_range(source_fd, destination_fd, count)
+            except OSError as exc:
+                if exc.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                copy_file_range = None
+                continue
+        elif sendfile is not None:
+            try:
+                sent = sendfile(destination_fd, source_fd, None, count)
+            except OSError as exc:
+                if exc.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                sendfile = None
+                continue
+        else:
+            data = os.read(source_fd, count)
+            view = memoryview(data)
+            while view:
+                written = os.write(destination_fd, view)
+                view = view[written:]
+            sent = len(data)
+        if not sent:
+            break
+        copied += sent
+        if progress is not None:
+            progress(copied, total)
+    return copied
+
+
+def _fsync_directory(path: str) -> None:
+    if os.name != "posix":
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def copy_then_remove(source: str, destination: str, progress: Progress | None = None) -> None:
+    """Copy ``source`` next to ``destination``, fsync it, swap it in, then delete the source.
+
+    The source is only removed once the complete copy is durable, so an
+    interrupted move leaves the original in place.
+    """
+    temp_path = f"{destination}{PARTIAL_SUFFIX}"
+    total = os.stat(source).st_size
+    try:
+        with open(source, "rb") as source_file, open(temp_path, "wb") as destination_file:
+            copied = _copy_descriptors(source_file.fileno(), destination_file.fileno(), total, progress)
+            destination_file.flush()
+            os.fsync(destination_file.fileno())
+        if copied != total:
+            raise OSError(f"Copied {copied} of {total} bytes from {source}")
+        shutil.copystat(source, temp_path)
+        os.replace(temp_path, destination)
+        _fsync_directory(os.path.dirname(destination))
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    os.remove(source)
+
+
+def link_file(source: str, destination: str) -> str:
+    """Place ``destination`` as a hardlink to ``source``, or a reflink clone where links fail.
+
+    Returns the method used. Raises :class:`OSError` when the filesystem
+    supports neither.
+    """
+    try:
+        os.link(source, destination)
+        return "hardlink"
+    except FileExistsError:
+        raise
+    except OSError as exc:
+        link_error = exc
+
+    if fcntl is None or not sys.platform.startswith("linux"):
+        raise link_error
+    try:
+        with open(source, "rb") as source_file, open(destination, "xb") as destination_file:
+            fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+        shutil.copystat(source, destination)
+    except FileExistsError:
+        raise
+    except OSError:
+        try:
+            os.remove(destination)
+        except OSError:
+            pass
+        raise link_error
+    return "reflink"
+
+
+class MoveEngine:
+    """Moves files with an atomic rename when possible and queues cross-device copies.
+
+    Cross-device moves run one at a time on a dedicated I/O thread so a large
+    copy never holds up the event pipeline. Destinations of queued moves are
+    reserved until they finish, letting callers pick unique names before the
+    file exists on disk.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Destination -> number of holders; a queued copy and its planner may overlap.
+        self._reserved: dict[str, int] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def is_reserved(self, destination: str) -> bool:
+        with self._lock:
+            return self._key(destination) in self._reserved
+
+    def reserve(self, destination: str) -> None:
+        """Mark ``destination`` as taken while a synchronous move or link is placed there."""
+        with self._lock:
+            key = self._key(destination)
+            self._reserved[key] = self._reserved.get(key, 0) + 1
+
+    def release(self, destination: str) -> None:
+        self._release(self._key(destination))
+
+    def move(self, source: str, destination: str, progress: Progress | None = None) -> str:
+        """Move ``source`` to ``destination`` and return ``"rename"`` or ``"copy"``."""
+        if same_device(source, os.path.dirname(destination)):
+            try:
+                os.rename(source, destination)
+                return "rename"
+            except OSError as exc:
+                if exc.errno != errno.EXDEV:
+                    raise
+        copy_then_remove(source, destination, progress)
+        return "copy"
+
+    def place(self, source: str, destination: str, mode: str = "move") -> str:
+        """Organize ``source`` at ``destination``; ``"link"`` mode keeps the original in place.
+
+        Link mode falls back to a move when neither a hardlink nor a reflink
+        is possible. Returns the method actually used.
+        """
+        if mode == "link":
+            try:
+                return link_file(source, destination)
+            except FileExistsError:
+                raise
+            except OSError:
+                pass
+        return self.move(source, destination)
+
+    def submit(self, source: str, destination: str, progress: Progress | None = None) -> "Future[str]":
+        key = self._key(destination)
+        with self._lock:
+            self._reserved[key] = self._reserved.get(key, 0) + 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="move-io")
+            executor = self._executor
+        future = executor.submit(self.move, source, destination, progress)
+        future.add_done_callback(lambda _future: self._release(key))
+        return future
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            holders = self._reserved.pop(key, 0) - 1
+            if holders > 0:
+                self._reserved[key] = holders
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,144 @@
+"""Monthly partitions of the insights database.
+
+New rows are always written to the live ``downloadInsightsAnalytics.db``.
+Maintenance later seals every finished month into its own
+``partitions/insights-YYYY-MM.db`` file, which readers open read-only and
+only when a query's date range needs it. Sealed files no longer change, so
+backups only copy the partitions that are new since the previous run.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import date
+
+from analytics import (
+    DATABASE_FILE_NAME,
+    PARTITIONS_SUBDIR,
+    create_insights_schema,
+    get_database_path,
+    get_partition_path,
+    list_partitions,
+)
+
+# Legacy CSV imports may carry timestamps that do not start with a month;
+# those rows stay in the live database.
+_MONTH_GLOB = "[0-9][0-9][0-9][0-9]-[0-1][0-9]*"
+
+
+@dataclass
+class BackupResult:
+    copied: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def _month_bounds(month: str) -> tuple[str, str]:
+    year, number = int(month[:4]), int(month[5:7])
+    following = f"{year + number // 12:04d}-{number % 12 + 1:02d}"
+    return f"{month}-01", f"{following}-01"
+
+
+def seal_partitions(download_folder: str, today: date | None = None) -> int:
+    """Move rows of finished months out of the live database; returns the rows moved.
+
+    Each month is copied and deleted in one transaction. Ids are preserved,
+    and a row that is already in its partition is skipped, so an interrupted
+    run can simply be repeated.
+    """
+    database_path = get_database_path(download_folder)
+    if not os.path.exists(database_path):
+        return 0
+
+    boundary = (today or date.today()).replace(day=1).isoformat()
+    with closing(sqlite3.connect(database_path, timeout=30)) as connection:
+        months = [
+            row[0]
+            for row in connection.execute(
+                "SELECT DISTINCT substr(timestamp, 1, 7) FROM insights WHERE timestamp < ? AND timestamp GLOB ?",
+                (boundary, _MONTH_GLOB),
+            )
+        ]
+
+    return sum(_seal_month(download_folder, database_path, month) for month in months)
+
+
+def _seal_month(download_folder: str, database_path: str, month: str) -> int:
+    first_day, next_month = _month_bounds(month)
+    partition_path = get_partition_path(download_folder, month)
+    with closing(sqlite3.connect(partition_path, timeout=30)) as connection:
+        create_insights_schema(connection, partition_path)
+        connection.execute("ATTACH DATABASE ? AS live", (database_path,))
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            moved = connection.execute(
+                """
+                INSERT OR IGNORE INTO insights (
+                    id, timestamp, event, file_path, domain, file_size, file_type, download_url, is_duplicate
+                )
+                SELECT id, timestamp, event, file_path, domain, file_size, file_type, download_url, is_duplicate
+                FROM live.insights
+                WHERE timestamp >= ? AND timestamp < ?
+                ORDER BY id
+                """,
+                (first_day, next_month),
+            ).rowcount
+            connection.execute(
+                "DELETE FROM live.insights WHERE timestamp >= ? AND timestamp < ?",
+                (first_day, next_month),
+            )
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.execute("DETACH DATABASE live")
+        try:
+            connection.execute("INSERT INTO insights_fts(insights_fts) VALUES ('optimize')")
+        except sqlite3.OperationalError:
+            pass
+        connection.execute("PRAGMA optimize")
+        connection.commit()
+    return moved
+
+
+def backup_insights(download_folder: str, destination_dir: str) -> BackupResult:
+    """Back up the live database and every partition that changed since the last backup.
+
+    The live database is copied through SQLite's backup API so the copy is
+    consistent while the monitor keeps writing. A partition is copied again
+    only when its size or modification time differs from the backed up file.
+    """
+    result = BackupResult()
+    database_path = get_database_path(download_folder)
+    partition_destination = os.path.join(destination_dir, PARTITIONS_SUBDIR)
+    os.makedirs(partition_destination, exist_ok=True)
+
+    if os.path.exists(database_path):
+        live_destination = os.path.join(destination_dir, DATABASE_FILE_NAME)
+        with closing(sqlite3.connect(database_path, timeout=30)) as source, closing(
+            sqlite3.connect(live_destination)
+        ) as target:
+            source.backup(target)
+        result.copied.append(live_destination)
+
+    for _month, path in list_partitions(download_folder):
+        target_path = os.path.join(partition_destination, os.path.basename(path))
+        source_stat = os.stat(path)
+        try:
+            target_stat = os.stat(target_path)
+        except FileNotFoundError:
+            target_stat = None
+        if (
+            target_stat is not None
+            and target_stat.st_size == source_stat.st_size
+            and int(target_stat.st_mtime) == int(source_stat.st_mtime)
+        ):
+            result.unchanged += 1
+            continue
+        temp_path = f"{target_path}.tmp"
+        shutil.copy2(path, temp_path)
+        os.replace(temp_path, target_path)
+        result.copied.append(target_path)
+    return result
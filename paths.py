@@ -36,6 +36,11 @@ def get_config_file_path() -> str:
     return os.path.join(get_app_documents_dir(), "config.json")
 
 
+def get_activity_log_path() -> str:
+    """Return the file that receives the full activity log when spilling is enabled."""
+    return os.path.join(get_app_documents_dir(), "activity.log")
+
+
 def _normalized_identifier(folder: str) -> str:
     """Generate a filesystem-safe identifier for a monitored folder."""
     normalized = os.path.abspath(os.path.expanduser(folder))
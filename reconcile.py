@@ -0,0 +1,163 @@
+"""Reconcile Edge's whole download history with the files on disk and the insights database."""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from analytics import initialize_log_file, log_events
+from fileHandler import organize_event
+
+RECONCILE_BATCH_SIZE = 500
+_WEBKIT_EPOCH_OFFSET_SECONDS = 11644473600
+_COMPLETE_STATE = 1
+
+# Completed downloads, newest first so a path that was downloaded twice is
+# attributed to its latest URL. Insights only record where files were
+# organized to, never Edge's target path, so there is nothing to join them on;
+# a file still at its target path is by definition not organized yet, or, in
+# link mode, recognised by the handler as already placed.
+_COMPLETED_DOWNLOADS_QUERY = """
+    SELECT target_path, site_url, tab_url, tab_referrer_url, received_bytes, end_time
+    FROM downloads
+    WHERE state = ? AND target_path != ''
+    ORDER BY id DESC
+"""
+
+
+@dataclass
+class ReconcileResult:
+    examined: int = 0
+    missing: int = 0
+    changed: int = 0
+    existing: int = 0
+    moved: int = 0
+    unknown: int = 0
+    failed: int = 0
+    batches: int = 0
+    cancelled: bool = False
+
+
+def _webkit_to_timestamp(value: object) -> str | None:
+    try:
+        seconds = int(value) / 1_000_000 - _WEBKIT_EPOCH_OFFSET_SECONDS
+        if seconds <= 0:
+            return None
+        return datetime.fromtimestamp(seconds).strftime("%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+
+def reconcile_history(
+    handler,
+    download_folder: str,
+    stop_event: threading.Event | None = None,
+    progress: Callable[[ReconcileResult], None] | None = None,
+    batch_size: int = RECONCILE_BATCH_SIZE,
+) -> ReconcileResult:
+    """Organize every file Edge downloaded into ``download_folder`` that is not yet recorded.
+
+    Completed downloads are read from one History snapshot taken through
+    ``handler`` (a :class:`fileHandler.FileHandler`). Rows whose file still
+    sits in the folder with the size Edge recorded are moved and
+    then logged ``batch_size`` at a time, one transaction per batch, using
+    the download's end time as the insight timestamp. Setting ``stop_event``
+    stops between batches.
+    """
+    result = ReconcileResult()
+    initialize_log_file(download_folder)
+    candidates = _collect_candidates(handler, download_folder, result)
+
+    batch_size = max(1, batch_size)
+    for start in range(0, len(candidates), batch_size):
+        if stop_event is not None and stop_event.is_set():
+            result.cancelled = True
+            break
+        _organize_batch(handler, download_folder, candidates[start:start + batch_size], result)
+        if progress is not None:
+            progress(result)
+
+    handler._emit(
+        f"Reconciliation of {download_folder} finished: {result.moved} organized "
+        f"({result.unknown} unknown domain), {result.missing} no longer on disk, "
+        f"{result.changed} changed since download, {result.existing} already organized, {result.failed} failed"
+        + (" (cancelled)" if result.cancelled else "")
+    )
+    return result
+
+
+def _collect_candidates(handler, download_folder: str, result: ReconcileResult) -> list[tuple[str, str, str | None]]:
+    """Read the completed downloads and keep the rows whose file is still in place."""
+    folder_key = os.path.normcase(os.path.abspath(download_folder))
+    seen: set[str] = set()
+    candidates: list[tuple[str, str, str | None]] = []
+    try:
+        with handler.history_snapshot() as connection:
+            rows = connection.execute(_COMPLETED_DOWNLOADS_QUERY, (_COMPLETE_STATE,))
+            for target_path, site_url, tab_url, tab_referrer_url, received_bytes, end_time in rows:
+                if target_path in seen:
+                    continue
+                seen.add(target_path)
+                if os.path.normcase(os.path.dirname(os.path.abspath(target_path))) != folder_key:
+                    continue
+                result.examined += 1
+                try:
+                    size = os.stat(target_path).st_size
+                except OSError:
+                    result.missing += 1
+                    continue
+                if received_bytes and size != received_bytes:
+                    # Another file has taken the name since Edge wrote it.
+                    result.changed += 1
+                    continue
+                website = site_url or tab_url or tab_referrer_url or "unknown_domain"
+                candidates.append((target_path, website, _webkit_to_timestamp(end_time)))
+    except FileNotFoundError:
+        return []
+    except sqlite3.Error as exc:
+        handler._emit(f"Error reading Edge history for reconciliation: {exc}")
+        return []
+    return candidates
+
+
+def _organize_batch(
+    handler,
+    download_folder: str,
+    batch: list[tuple[str, str, str | None]],
+    result: ReconcileResult,
+) -> None:
+    records = []
+    for file_path, website, timestamp in batch:
+        domain = handler.extract_domain_from_url(website)
+        try:
+            final_path, is_duplicate, method = handler.organize_to_website_folder(file_path, domain, download_folder)
+        except Exception:
+            result.failed += 1
+            continue
+        if method == "existing":
+            result.existing += 1
+            continue
+        try:
+            file_size = os.path.getsize(final_path)
+        except OSError:
+            file_size = ""
+        records.append(
+            {
+                "Timestamp": timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "Event": organize_event(method, is_duplicate, "reconciled"),
+                "File Path": final_path,
+                "Domain": domain,
+                "File Size": file_size,
+                "File Type": os.path.splitext(final_path)[1],
+                "Download URL": website,
+                "Is Duplicate": "Yes" if is_duplicate else "No",
+            }
+        )
+        result.moved += 1
+        if domain == "unknown_domain":
+            result.unknown += 1
+    log_events(download_folder, records)
+    result.batches += 1
@@ -0,0 +1,226 @@
+"""Precomputed "Download Analysis" export for the Excel workbook.
+
+``AnalyticsMacro.vba`` used to load the raw CSV cell by cell and then walk
+every cell again for its totals and counts. The same aggregates are computed
+here inside SQLite and written either as small CSV files the workbook loads
+directly, or as an XLSX file holding both the Data and the Download Analysis
+sheets.
+"""
+from __future__ import annotations
+
+import csv
+import os
+import re
+import zipfile
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+
+from analytics import EXPECTED_HEADER, aggregate_insights, iter_insights, summarize_insights
+
+SUMMARY_FILE_NAME = "download_analysis_summary.csv"
+DOMAINS_FILE_NAME = "download_analysis_domains.csv"
+EXTENSIONS_FILE_NAME = "download_analysis_extensions.csv"
+DATA_SHEET = "Data"
+ANALYSIS_SHEET = "Download Analysis"
+EXCEL_MAX_ROWS = 1_048_576
+
+SUMMARY_HEADER = ["Total Data Downloaded (Bytes)", "Total Files Downloaded", "Average Files Per Day"]
+DOMAINS_HEADER = ["Domain", "File Count"]
+EXTENSIONS_HEADER = ["File Extension", "File Count"]
+
+# Control characters XML 1.0 cannot carry, even escaped.
+_INVALID_XML_CHARACTERS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_SPREADSHEET_NAMESPACE = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_RELATIONSHIP_NAMESPACE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_CONTENT_TYPES_XML = (
+    _XML_DECLARATION
+    + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    + '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    + '<Default Extension="xml" ContentType="application/xml"/>'
+    + '<Override PartName="/xl/workbook.xml" '
+    + 'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    + "".join(
+        f'<Override PartName="/xl/worksheets/sheet{number}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for number in (1, 2)
+    )
+    + "</Types>"
+)
+
+_ROOT_RELS_XML = (
+    _XML_DECLARATION
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    + f'<Relationship Id="rId1" Type="{_RELATIONSHIP_NAMESPACE}/officeDocument" Target="xl/workbook.xml"/>'
+    + "</Relationships>"
+)
+
+_WORKBOOK_XML = (
+    _XML_DECLARATION
+    + f'<workbook xmlns="{_SPREADSHEET_NAMESPACE}" xmlns:r="{_RELATIONSHIP_NAMESPACE}"><sheets>'
+    + f'<sheet name="{DATA_SHEET}" sheetId="1" r:id="rId1"/>'
+    + f'<sheet name="{ANALYSIS_SHEET}" sheetId="2" r:id="rId2"/>'
+    + "</sheets></workbook>"
+)
+
+_WORKBOOK_RELS_XML = (
+    _XML_DECLARATION
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    + "".join(
+        f'<Relationship Id="rId{number}" Type="{_RELATIONSHIP_NAMESPACE}/worksheet" '
+        f'Target="worksheets/sheet{number}.xml"/>'
+        for number in (1, 2)
+    )
+    + "</Relationships>"
+)
+
+
+@dataclass
+class DownloadAnalysis:
+    total_size: int = 0
+    total_files: int = 0
+    average_files_per_day: float = 0.0
+    domains: list[tuple[str, int]] = field(default_factory=list)
+    extensions: list[tuple[str, int]] = field(default_factory=list)
+
+
+def build_download_analysis(download_folder: str, today: date | None = None) -> DownloadAnalysis:
+    """Compute the macro's totals, files per day and domain/extension counts in SQLite."""
+    summary = summarize_insights(download_folder, top_domains=0)
+    total_files = int(summary["total_files"])
+
+    # As in the macro: files divided by the days from the first download until today.
+    days = 0
+    first_timestamp = summary["first_timestamp"]
+    if first_timestamp:
+        try:
+            first_day = datetime.strptime(str(first_timestamp)[:10], "%Y-%m-%d").date()
+            days = ((today or date.today()) - first_day).days
+        except ValueError:
+            days = 0
+
+    return DownloadAnalysis(
+        total_size=int(summary["total_size"]),
+        total_files=total_files,
+        average_files_per_day=total_files / days if days > 0 else float(total_files),
+        domains=[(entry["Domain"], entry["Files"]) for entry in aggregate_insights(download_folder, ("Domain",))],
+        extensions=[
+            (entry["File Type"], entry["Files"]) for entry in aggregate_insights(download_folder, ("File Type",))
+        ],
+    )
+
+
+def export_download_analysis(download_folder: str, destination_dir: str) -> list[str]:
+    """Write the summary, domain and extension CSV files and return their paths."""
+    analysis = build_download_analysis(download_folder)
+    os.makedirs(destination_dir, exist_ok=True)
+    outputs = (
+        (SUMMARY_FILE_NAME, SUMMARY_HEADER, [_summary_row(analysis)]),
+        (DOMAINS_FILE_NAME, DOMAINS_HEADER, analysis.domains),
+        (EXTENSIONS_FILE_NAME, EXTENSIONS_HEADER, analysis.extensions),
+    )
+    paths = []
+    for name, header, rows in outputs:
+        path = os.path.join(destination_dir, name)
+        with open(path, "w", newline="", encoding="utf-8") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(header)
+            writer.writerows(rows)
+        paths.append(path)
+    return paths
+
+
+def _summary_row(analysis: DownloadAnalysis) -> list[object]:
+    return [analysis.total_size, analysis.total_files, round(analysis.average_files_per_day, 4)]
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def _cell(reference: str, value: object) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c r="{reference}"><v>{value}</v></c>'
+    text = escape(_INVALID_XML_CHARACTERS.sub("", str(value)))
+    return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _row_xml(number: int, cells: list[tuple[int, object]]) -> str:
+    body = "".join(_cell(f"{_column_letter(column)}{number}", value) for column, value in cells)
+    return f'<row r="{number}">{body}</row>'
+
+
+def _analysis_rows(analysis: DownloadAnalysis) -> list[str]:
+    """Lay the analysis out the way the macro did: totals in A-C, domains in E-F, extensions in H-I."""
+    rows: dict[int, list[tuple[int, object]]] = {
+        1: [(index, title) for index, title in enumerate(SUMMARY_HEADER)]
+        + [(4, DOMAINS_HEADER[0]), (5, DOMAINS_HEADER[1]), (7, EXTENSIONS_HEADER[0]), (8, EXTENSIONS_HEADER[1])],
+        2: list(enumerate(_summary_row(analysis))),
+    }
+    for first_column, entries in ((4, analysis.domains), (7, analysis.extensions)):
+        for offset, (key, files) in enumerate(entries[: EXCEL_MAX_ROWS - 1]):
+            rows.setdefault(offset + 2, []).extend(((first_column, key), (first_column + 1, files)))
+    return [_row_xml(number, rows[number]) for number in sorted(rows)]
+
+
+def export_download_analysis_xlsx(download_folder: str, destination_path: str) -> int:
+    """Write a workbook with the Data and Download Analysis sheets; returns the data rows written.
+
+    Data rows are streamed from the database straight into the compressed
+    sheet, so memory stays flat however long the log is. Rows beyond
+    Excel's sheet limit are left out of the Data sheet; the analysis still
+    counts them.
+    """
+    analysis = build_download_analysis(download_folder)
+    temp_path = f"{destination_path}.tmp"
+    written = 0
+    try:
+        with zipfile.ZipFile(temp_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("[Content_Types].xml", _CONTENT_TYPES_XML)
+            archive.writestr("_rels/.rels", _ROOT_RELS_XML)
+            archive.writestr("xl/workbook.xml", _WORKBOOK_XML)
+            archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS_XML)
+
+            with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+                sheet.write(f'{_XML_DECLARATION}<worksheet xmlns="{_SPREADSHEET_NAMESPACE}"><sheetData>'.encode())
+                sheet.write(_row_xml(1, list(enumerate(EXPECTED_HEADER))).encode())
+                buffer: list[str] = []
+                for record in iter_insights(download_folder):
+                    if written >= EXCEL_MAX_ROWS - 1:
+                        break
+                    written += 1
+                    cells: list[tuple[int, object]] = []
+                    for index, column in enumerate(EXPECTED_HEADER):
+                        value = record.get(column, "")
+                        if column == "File Size" and value.isdigit():
+                            value = int(value)
+                        cells.append((index, value))
+                    buffer.append(_row_xml(written + 1, cells))
+                    if len(buffer) >= 1000:
+                        sheet.write("".join(buffer).encode())
+                        buffer.clear()
+                sheet.write("".join(buffer).encode())
+                sheet.write(b"</sheetData></worksheet>")
+
+            archive.writestr(
+                "xl/worksheets/sheet2.xml",
+                f'{_XML_DECLARATION}<worksheet xmlns="{_SPREADSHEET_NAMESPACE}"><sheetData>'
+                + "".join(_analysis_rows(analysis))
+                + "</sheetData></worksheet>",
+            )
+        os.replace(temp_path, destination_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return written
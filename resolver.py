@@ -0,0 +1,153 @@
+"""Deferred re-resolution of downloads Edge's History did not know about yet.
+
+Edge sometimes finishes renaming a download before the ``downloads`` row is
+readable, or keeps History locked for a moment. Instead of sleeping on the
+pipeline thread, the file is organized into ``unknown_domain`` right away and
+queued here. A background thread looks the queued paths up again, in one
+batch against fresh History snapshots, after each of ``RESOLVE_DELAYS_SECONDS``.
+When Edge knows the path by then, the handler moves the file to its domain
+folder and corrects its insights row.
+
+A negative cache remembers the History state at a path's last miss. While
+History and its WAL are unchanged there is nothing new to find, so neither
+the pipeline nor the retries query it again.
+"""
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+RESOLVE_DELAYS_SECONDS = (5, 30, 120, 600, 1800)
+NEGATIVE_CACHE_SIZE = 2048
+
+
+@dataclass(order=True)
+class DeferredDownload:
+    due: float
+    file_path: str = field(compare=False)
+    placed_path: str = field(compare=False)
+    download_folder: str = field(compare=False)
+    method: str = field(compare=False)
+    attempt: int = field(default=0, compare=False)
+
+
+class DeferredResolver:
+    """Negative cache and retry queue for one :class:`fileHandler.FileHandler`.
+
+    ``handler`` provides ``history_state()``, ``lookup_urls(paths)``,
+    ``reclassify(download, url)`` and ``_emit(message)``.
+    """
+
+    def __init__(self, handler, delays: tuple[float, ...] = RESOLVE_DELAYS_SECONDS) -> None:
+        self.handler = handler
+        self.delays = tuple(delays)
+        self._missing: OrderedDict[str, tuple] = OrderedDict()
+        self._queue: list[DeferredDownload] = []
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def remember_missing(self, file_path: str, state: tuple | None = None) -> None:
+        """Record that History, as of ``state``, has no row for ``file_path``."""
+        if state is None:
+            state = self.handler.history_state()
+        with self._condition:
+            self._missing[file_path] = state
+            self._missing.move_to_end(file_path)
+            while len(self._missing) > NEGATIVE_CACHE_SIZE:
+                self._missing.popitem(last=False)
+
+    def is_known_missing(self, file_path: str) -> bool:
+        """True while History is unchanged since ``file_path`` was last looked up in vain."""
+        with self._condition:
+            state = self._missing.get(file_path)
+        return state is not None and state == self.handler.history_state()
+
+    def forget(self, file_path: str) -> None:
+        with self._condition:
+            self._missing.pop(file_path, None)
+
+    def defer(self, file_path: str, placed_path: str, download_folder: str, method: str) -> None:
+        """Queue ``file_path``, organized as unknown at ``placed_path``, for another lookup."""
+        if not self.delays:
+            return
+        download = DeferredDownload(time.monotonic() + self.delays[0], file_path, placed_path, download_folder, method)
+        with self._condition:
+            if self._closed:
+                return
+            heapq.heappush(self._queue, download)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="deferred-resolver", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._queue)
+
+    def close(self) -> None:
+        """Stop the retry thread; downloads still queued stay in ``unknown_domain``."""
+        with self._condition:
+            self._closed = True
+            left = len(self._queue)
+            self._queue.clear()
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=10)
+        if left:
+            self.handler._emit(f"{left} download(s) were still waiting for their Edge history entry")
+
+    def _take_due(self) -> list[DeferredDownload] | None:
+        with self._condition:
+            while not self._closed:
+                now = time.monotonic()
+                if self._queue and self._queue[0].due <= now:
+                    due = []
+                    while self._queue and self._queue[0].due <= now:
+                        due.append(heapq.heappop(self._queue))
+                    return due
+                self._condition.wait(self._queue[0].due - now if self._queue else None)
+            return None
+
+    def _run(self) -> None:
+        while True:
+            due = self._take_due()
+            if due is None:
+                return
+            try:
+                self._resolve(due)
+            except Exception as e:
+                self.handler._emit(f"Error re-resolving downloads: {e}")
+
+    def _resolve(self, due: list[DeferredDownload]) -> None:
+        state = self.handler.history_state()
+        with self._condition:
+            fresh = [download.file_path for download in due if self._missing.get(download.file_path) != state]
+        # Snapshots are only taken when some download may have appeared since its last miss.
+        urls = self.handler.lookup_urls(fresh) if fresh else {}
+
+        for download in due:
+            url = urls.get(download.file_path)
+            if url:
+                self.forget(download.file_path)
+                try:
+                    self.handler.reclassify(download, url)
+                except Exception as e:
+                    self.handler._emit(f"Error re-resolving {download.placed_path}: {e}")
+                continue
+            self.remember_missing(download.file_path, state)
+            self._reschedule(download)
+
+    def _reschedule(self, download: DeferredDownload) -> None:
+        download.attempt += 1
+        if download.attempt >= len(self.delays):
+            self.handler._emit(f"No Edge history entry for {download.file_path}; it stays in unknown_domain")
+            return
+        download.due = time.monotonic() + self.delays[download.attempt]
+        with self._condition:
+            if not self._closed:
+                heapq.heappush(self._queue, download)
@@ -0,0 +1,357 @@
+"""Retention, archival and idle-time maintenance for the insights database.
+
+Rows older than the configured age, or beyond the configured row limit, are
+written to gzip-compressed CSV archives in the analytics directory and folded
+into ``insights_rollup`` before they are deleted, so summaries and charts keep
+counting them. Sealed monthly partitions expire as a whole: the file is moved
+into the archive directory once its rows are rolled up. Maintenance also seals
+finished months, reclaims free pages and refreshes the query planner
+statistics.
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from analytics import EXPECTED_HEADER, get_database_path, list_partitions
+from partitions import seal_partitions
+from paths import get_analytics_dir
+
+ARCHIVE_SUBDIR = "archive"
+ARCHIVE_BATCH_LIMIT = 50_000
+VACUUM_PAGES_PER_RUN = 2_000
+MAINTENANCE_INTERVAL_SECONDS = 6 * 3600
+IDLE_SECONDS = 5 * 60
+
+PENDING_SUFFIX = ".pending"
+
+_EXPIRED_CONDITION = "(timestamp < ? OR id <= ?)"
+
+_ROLLUP_UPSERT = """
+    INSERT INTO insights_rollup (day, domain, file_type, files, total_size, duplicates)
+    SELECT substr(timestamp, 1, 10), domain, IFNULL(file_type, ''),
+           COUNT(*), IFNULL(SUM(file_size), 0), IFNULL(SUM(is_duplicate), 0)
+    FROM {source}
+    WHERE {condition}
+    GROUP BY 1, 2, 3
+    ON CONFLICT (day, domain, file_type) DO UPDATE SET
+        files = files + excluded.files,
+        total_size = total_size + excluded.total_size,
+        duplicates = duplicates + excluded.duplicates
+"""
+
+# Archived partition files whose rows are already in the rollup, so a run
+# interrupted between the rollup and the final rename never counts them twice.
+_CREATE_ARCHIVED_PARTITIONS_STATEMENT = """
+CREATE TABLE IF NOT EXISTS archived_partitions (
+    name TEXT PRIMARY KEY,
+    files INTEGER NOT NULL
+) WITHOUT ROWID
+"""
+
+
+@dataclass
+class RetentionResult:
+    archived: int = 0
+    archive_path: str | None = None
+    reclaimed_pages: int = 0
+    sealed: int = 0
+    partitions_archived: int = 0
+    partitions_busy: int = 0
+
+
+def _archive_dir(download_folder: str) -> str:
+    archive_dir = os.path.join(get_analytics_dir(download_folder), ARCHIVE_SUBDIR)
+    os.makedirs(archive_dir, exist_ok=True)
+    return archive_dir
+
+
+def _archive_path(download_folder: str, prefix: str = "insights", extension: str = ".csv.gz") -> str:
+    archive_dir = _archive_dir(download_folder)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(archive_dir, f"{prefix}-{stamp}{extension}")
+    counter = 1
+    while os.path.exists(path) or os.path.exists(f"{path}{PENDING_SUFFIX}"):
+        path = os.path.join(archive_dir, f"{prefix}-{stamp}-{counter}{extension}")
+        counter += 1
+    return path
+
+
+def _partition_rows(path: str) -> int:
+    with closing(sqlite3.connect(path, timeout=30)) as connection:
+        return connection.execute("SELECT COUNT(*) FROM insights").fetchone()[0]
+
+
+def _expired_partitions(
+    download_folder: str,
+    max_age_days: int,
+    max_rows: int,
+    live_rows: int,
+) -> tuple[list[tuple[str, str]], bool]:
+    """Pick the partitions to archive, oldest first, and whether any partition stays."""
+    partitions = list_partitions(download_folder)
+    expired: list[tuple[str, str]] = []
+    if max_age_days > 0:
+        # A month expires once its last day is older than the cutoff.
+        cutoff_month = (date.today() - timedelta(days=max_age_days)).strftime("%Y-%m")
+        while partitions and partitions[0][0] < cutoff_month:
+            expired.append(partitions.pop(0))
+    if max_rows > 0 and partitions:
+        counts = [_partition_rows(path) for _month, path in partitions]
+        remaining = live_rows + sum(counts)
+        while partitions and remaining - counts[0] >= max_rows:
+            remaining -= counts.pop(0)
+            expired.append(partitions.pop(0))
+    return expired, bool(partitions)
+
+
+def _roll_up_partition(database_path: str, archive_path: str) -> int:
+    """Add an archived partition's rows to the rollup exactly once; returns its row count."""
+    name = os.path.basename(archive_path)
+    with closing(sqlite3.connect(database_path, timeout=30)) as connection:
+        connection.execute(_CREATE_ARCHIVED_PARTITIONS_STATEMENT)
+        connection.commit()
+        connection.execute("ATTACH DATABASE ? AS expired", (f"{archive_path}{PENDING_SUFFIX}",))
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if connection.execute("SELECT 1 FROM archived_partitions WHERE name = ?", (name,)).fetchone():
+                connection.rollback()
+                return 0
+            files = connection.execute("SELECT COUNT(*) FROM expired.insights").fetchone()[0]
+            connection.execute(_ROLLUP_UPSERT.format(source="expired.insights", condition="1"))
+            connection.execute("INSERT INTO archived_partitions (name, files) VALUES (?, ?)", (name, files))
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+    return files
+
+
+def _archive_partitions(download_folder: str, partitions: list[tuple[str, str]], result: RetentionResult) -> None:
+    database_path = get_database_path(download_folder)
+    pending = [
+        os.path.join(_archive_dir(download_folder), name[: -len(PENDING_SUFFIX)])
+        for name in sorted(os.listdir(_archive_dir(download_folder)))
+        if name.endswith(PENDING_SUFFIX)
+    ]
+    for month, path in partitions:
+        archive_path = _archive_path(download_folder, f"insights-{month}", ".db")
+        # Readers stop seeing the partition the moment it leaves the partitions
+        # directory; one that opened it just before keeps its own connection.
+        try:
+            os.replace(path, f"{archive_path}{PENDING_SUFFIX}")
+        except OSError:
+            # Windows refuses to move a file that is still open; the partition
+            # stays in place and the next maintenance run tries again.
+            result.partitions_busy += 1
+            continue
+        pending.append(archive_path)
+
+    for archive_path in pending:
+        result.archived += _roll_up_partition(database_path, archive_path)
+        os.replace(f"{archive_path}{PENDING_SUFFIX}", archive_path)
+        result.partitions_archived += 1
+        result.archive_path = archive_path
+
+
+def _expiry_bounds(connection: sqlite3.Connection, max_age_days: int, max_rows: int) -> tuple[str, int]:
+    """Return the timestamp cutoff and the highest id to expire; either may select nothing."""
+    cutoff = ""
+    if max_age_days > 0:
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime("%Y-%m-%d %H:%M:%S")
+    boundary_id = 0
+    if max_rows > 0:
+        row = connection.execute(
+            "SELECT id FROM insights ORDER BY id DESC LIMIT 1 OFFSET ?", (max_rows,)
+        ).fetchone()
+        if row:
+            boundary_id = row[0]
+    return cutoff, boundary_id
+
+
+def apply_retention(
+    download_folder: str,
+    max_age_days: int = 0,
+    max_rows: int = 0,
+    batch_limit: int = ARCHIVE_BATCH_LIMIT,
+) -> RetentionResult:
+    """Archive and roll up rows beyond the age or row limit; ``0`` disables a limit.
+
+    At most ``batch_limit`` rows move per call so an idle run stays short;
+    later runs pick up the remainder. The archive is written and synced
+    before the rollup and delete commit, and removed again if they fail.
+    """
+    result = RetentionResult()
+    database_path = get_database_path(download_folder)
+    if (max_age_days <= 0 and max_rows <= 0) or not os.path.exists(database_path):
+        return result
+
+    expired, partitions_remain = _expired_partitions(
+        download_folder, max_age_days, max_rows, _live_rows(download_folder)
+    )
+    _archive_partitions(download_folder, expired, result)
+    if partitions_remain:
+        # The oldest rows live in partitions, which expire a whole month at a time.
+        max_rows = 0
+        if max_age_days <= 0:
+            return result
+
+    with sqlite3.connect(database_path, timeout=30) as connection:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            cutoff, boundary_id = _expiry_bounds(connection, max_age_days, max_rows)
+            expired = connection.execute(
+                f"""
+                SELECT id, timestamp, event, file_path, domain, file_size, file_type, download_url, is_duplicate
+                FROM insights
+                WHERE {_EXPIRED_CONDITION}
+                ORDER BY id
+                LIMIT ?
+                """,
+                (cutoff, boundary_id, batch_limit),
+            )
+            first_row = expired.fetchone()
+            if first_row is None:
+                connection.rollback()
+                return result
+
+            archive_path = _archive_path(download_folder)
+            last_id = first_row[0]
+            count = 0
+            try:
+                with gzip.open(archive_path, "wt", newline="", encoding="utf-8") as handle:
+                    writer = csv.writer(handle)
+                    writer.writerow(EXPECTED_HEADER)
+                    row = first_row
+                    while row is not None:
+                        last_id = row[0]
+                        *values, is_duplicate = row[1:]
+                        record = ["" if value is None else value for value in values]
+                        record.append("Yes" if is_duplicate else "No")
+                        writer.writerow(record)
+                        count += 1
+                        row = expired.fetchone()
+                    handle.flush()
+                    os.fsync(handle.fileno())
+            except BaseException:
+                if os.path.exists(archive_path):
+                    os.remove(archive_path)
+                raise
+
+            try:
+                connection.execute(
+                    _ROLLUP_UPSERT.format(source="insights", condition=f"{_EXPIRED_CONDITION} AND id <= ?"),
+                    (cutoff, boundary_id, last_id),
+                )
+                connection.execute(
+                    f"DELETE FROM insights WHERE {_EXPIRED_CONDITION} AND id <= ?",
+                    (cutoff, boundary_id, last_id),
+                )
+                connection.commit()
+            except BaseException:
+                if os.path.exists(archive_path):
+                    os.remove(archive_path)
+                raise
+        except BaseException:
+            connection.rollback()
+            raise
+
+    result.archived += count
+    result.archive_path = archive_path
+    return result
+
+
+def optimize_database(
+    download_folder: str,
+    vacuum_pages: int = VACUUM_PAGES_PER_RUN,
+    compact: bool = False,
+) -> int:
+    """Reclaim free pages and refresh planner statistics; returns the pages given back.
+
+    Free pages are released incrementally. ``compact`` runs a full ``VACUUM``
+    instead, which also repacks the half-empty pages a large delete leaves.
+    """
+    database_path = get_database_path(download_folder)
+    if not os.path.exists(database_path):
+        return 0
+
+    connection = sqlite3.connect(database_path, timeout=30, isolation_level=None)
+    try:
+        try:
+            connection.execute("INSERT INTO insights_fts(insights_fts) VALUES ('optimize')")
+        except sqlite3.OperationalError:
+            pass
+
+        pages_before = connection.execute("PRAGMA page_count").fetchone()[0]
+        if compact or connection.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            # Databases created before incremental vacuum need one full VACUUM to switch modes.
+            connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.execute("VACUUM")
+        elif connection.execute("PRAGMA freelist_count").fetchone()[0]:
+            # executescript steps the pragma to completion; execute() would free a single page.
+            connection.executescript(f"PRAGMA incremental_vacuum({int(vacuum_pages)});")
+        reclaimed = pages_before - connection.execute("PRAGMA page_count").fetchone()[0]
+
+        connection.execute("PRAGMA analysis_limit = 400")
+        connection.execute("PRAGMA optimize")
+    finally:
+        connection.close()
+    return max(0, reclaimed)
+
+
+def _live_rows(download_folder: str) -> int:
+    with sqlite3.connect(get_database_path(download_folder), timeout=30) as connection:
+        return connection.execute("SELECT COUNT(*) FROM insights").fetchone()[0]
+
+
+def run_maintenance(download_folder: str, max_age_days: int = 0, max_rows: int = 0) -> RetentionResult:
+    if not os.path.exists(get_database_path(download_folder)):
+        return RetentionResult()
+    live_before = _live_rows(download_folder)
+    sealed = seal_partitions(download_folder)
+    result = apply_retention(download_folder, max_age_days, max_rows)
+    result.sealed = sealed
+    # Once more rows left the live database than stayed, its pages are mostly empty.
+    live_after = _live_rows(download_folder)
+    compact = live_before > live_after and live_before - live_after >= live_after
+    result.reclaimed_pages = optimize_database(download_folder, compact=compact)
+    return result
+
+
+class IdleMaintenance:
+    """Decides when maintenance may run: after ``interval`` seconds and once activity has settled."""
+
+    def __init__(self, interval: float = MAINTENANCE_INTERVAL_SECONDS, idle: float = IDLE_SECONDS) -> None:
+        self.interval = interval
+        self.idle = idle
+        self._lock = threading.Lock()
+        self._last_activity = time.monotonic()
+        self._last_run: float | None = None
+        self._running = False
+
+    def touch(self) -> None:
+        with self._lock:
+            self._last_activity = time.monotonic()
+
+    def begin(self) -> bool:
+        """Claim the next run if one is due; pair every ``True`` with :meth:`finish`."""
+        now = time.monotonic()
+        with self._lock:
+            if self._running or now - self._last_activity < self.idle:
+                return False
+            if self._last_run is not None and now - self._last_run < self.interval:
+                return False
+            self._running = True
+            return True
+
+    def finish(self) -> None:
+        with self._lock:
+            self._running = False
+            self._last_run = time.monotonic()